@@ -0,0 +1,376 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from api.cache import applicant_cache
+from api.conditional import get_not_modified_response, make_etag, set_validators
+from api.changes import change_feed
+from api.counters import record_created, record_status_changes
+from api.deletion import delete_applicant
+from api.idempotency import idempotent
+from api.models import ApplicantChangeModel, ApplicantModel, NoteModel
+from api.outbox import queue_created, queue_note_created, queue_status_changes
+from api.pagination import ApplicantCursorPagination, NoteCursorPagination
+from api.parsers import ORJSONParser
+from api.permissions import ahas_cached_perm
+from api.renderers import ORJSONRenderer
+from api.serializers import (
+    APPLICANT_CREATE_FIELDS,
+    ApplicantFilterSerializer,
+    ApplicantSerializer,
+    ChangeFeedSerializer,
+    NoteSerializer,
+    SparseFieldsSerializer,
+    fast_applicant_serializer,
+    fast_note_serializer,
+)
+from api.timing import timed
+
+json_renderer = ORJSONRenderer()
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    """
+    Render data the way the DRF views do
+    """
+    with timed("render"):
+        content = json_renderer.render(data)
+    return HttpResponse(content, status=status, content_type="application/json")
+
+
+def not_found():
+    return json_response(
+        {"res": "Object with id does not exists"}, status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+class AsyncApiView(View):
+    """
+    Base class for native async views. DRF's APIView can not run async
+    handlers, so this wraps the request in a DRF Request for authentication
+    and parsing, and checks `required_permissions[method]` with the async
+    permission cache before dispatching to the handler. Handlers receive the
+    DRF Request and return a Django HttpResponse.
+    """
+
+    required_permissions = {}
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Session authentication enforces CSRF itself, as in APIView
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(
+            request,
+            parsers=[ORJSONParser()],
+            authenticators=[
+                authenticator()
+                for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+            ],
+        )
+        try:
+            await self.check_permissions(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(request, exc)
+
+    def handle_exception(self, request, exc):
+        """
+        Helper method to render an APIException like APIView does, including
+        its downgrade of 401 to 403 when no WWW-Authenticate header applies
+        """
+        response = json_response({"detail": exc.detail}, status=exc.status_code)
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            header = None
+            if request.authenticators:
+                header = request.authenticators[0].authenticate_header(request)
+            if header:
+                response["WWW-Authenticate"] = header
+            else:
+                response.status_code = status.HTTP_403_FORBIDDEN
+        return response
+
+    async def check_permissions(self, request):
+        """
+        Helper method to raise the same errors as IsAuthenticated and the
+        model permission classes of the sync views
+        """
+        # Resolving the user reads the session or checks a password
+        user = await sync_to_async(lambda: request.user)()
+        if not user or not user.is_authenticated:
+            raise exceptions.NotAuthenticated()
+        perm = self.required_permissions.get(request.method)
+        if perm is None or not await ahas_cached_perm(user, perm):
+            raise exceptions.PermissionDenied()
+
+
+class AsyncApplicantListView(AsyncApiView):
+    required_permissions = {
+        "GET": "api.view_applicant",
+        "POST": "api.create_applicant",
+    }
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Async variant of ApplicantListApiView.get
+        """
+        filters = ApplicantFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return json_response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+        sparse = SparseFieldsSerializer(
+            fast_applicant_serializer, data=request.query_params
+        )
+        if not sparse.is_valid():
+            return json_response(sparse.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = sparse.get_fast_serializer()
+        paginator = ApplicantCursorPagination()
+        applicants = await sync_to_async(paginator.paginate_queryset)(
+            filters.filter_queryset(ApplicantModel.objects.all()).values(
+                *serializer.columns_with("id")
+            ),
+            request,
+            view=self,
+        )
+        return json_response(
+            {
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "results": serializer.many(applicants),
+            }
+        )
+
+    @idempotent
+    async def post(self, request, *args, **kwargs):
+        """
+        Async variant of ApplicantListApiView.post
+        """
+        data = {field: request.data.get(field) for field in APPLICANT_CREATE_FIELDS}
+        serializer = ApplicantSerializer(data=data)
+        # Validation checks email uniqueness, and the counters must change in
+        # the same transaction as the insert
+        if await sync_to_async(self.create)(serializer):
+            return json_response(serializer.data, status=status.HTTP_201_CREATED)
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def create(self, serializer):
+        """
+        Helper method to validate and save an applicant, returns whether it
+        was saved
+        """
+        if not serializer.is_valid():
+            return False
+        with transaction.atomic():
+            applicant = serializer.save()
+            record_created([applicant])
+            queue_created([applicant])
+        return True
+
+
+class AsyncApplicantDetailView(AsyncApiView):
+    required_permissions = {
+        "GET": "api.view_applicant",
+        "PUT": "api.update_applicant",
+        "DELETE": "api.delete_applicant",
+    }
+
+    async def load_payload(self, id):
+        """
+        Helper method to serialize the object with id on a cache miss
+        """
+        applicant = (
+            await ApplicantModel.objects.filter(id=id)
+            .values(*fast_applicant_serializer.columns)
+            .afirst()
+        )
+        if not applicant:
+            return None
+        with timed("serialize"):
+            return fast_applicant_serializer.to_representation(applicant)
+
+    async def get(self, request, id: int, *args, **kwargs):
+        """
+        Async variant of ApplicantDetailApiView.get
+        """
+        sparse = SparseFieldsSerializer(
+            fast_applicant_serializer, data=request.query_params
+        )
+        if not sparse.is_valid():
+            return json_response(sparse.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer = sparse.get_fast_serializer()
+
+        payload = await applicant_cache.aget(id, self.load_payload)
+        if not payload:
+            return not_found()
+
+        updated_at = parse_datetime(payload["updated_at"])
+        etag = make_etag(id, updated_at, *serializer.etag_parts)
+        not_modified = get_not_modified_response(request, etag, updated_at)
+        if not_modified:
+            return not_modified
+        return set_validators(
+            json_response(serializer.project(payload)), etag, updated_at
+        )
+
+    async def put(self, request, id: int, *args, **kwargs):
+        """
+        Async variant of ApplicantDetailApiView.put
+        """
+        data = {"status": request.data.get("status")}
+        return await sync_to_async(self.update)(id, data)
+
+    def update(self, id, data):
+        """
+        Helper method to change the status of the locked object with id
+        """
+        with transaction.atomic():
+            applicant = ApplicantModel.objects.select_for_update().filter(id=id).first()
+            if not applicant:
+                return not_found()
+            previous_status = applicant.status
+            serializer = ApplicantSerializer(
+                instance=applicant, data=data, partial=True
+            )
+            if not serializer.is_valid():
+                return json_response(
+                    serializer.errors, status=status.HTTP_400_BAD_REQUEST
+                )
+            applicant = serializer.save()
+            if applicant.status != previous_status:
+                record_status_changes([previous_status], applicant.status)
+                queue_status_changes([(id, previous_status)], applicant.status)
+            applicant_cache.evict(id)
+        return json_response(serializer.data)
+
+    async def delete(self, request, id: int, *args, **kwargs):
+        """
+        Async variant of ApplicantDetailApiView.delete
+        """
+        deleted = await sync_to_async(self.destroy)(id)
+        if deleted is None:
+            return not_found()
+        if not deleted:
+            return json_response(
+                {"res": "Object scheduled for deletion"},
+                status=status.HTTP_202_ACCEPTED,
+            )
+        return json_response({"res": "Object deleted!"})
+
+    def destroy(self, id):
+        """
+        Helper method to delete the object with id, returns None when it
+        does not exist, otherwise whether it is gone or only hidden
+        """
+        with transaction.atomic():
+            applicant = ApplicantModel.objects.select_for_update().filter(id=id).first()
+            if not applicant:
+                return None
+            return delete_applicant(applicant)
+
+
+class AsyncApplicantNoteListView(AsyncApiView):
+    required_permissions = {
+        "GET": "api.view_note",
+        "POST": "api.create_note",
+    }
+
+    async def get(self, request, id: int, *args, **kwargs):
+        """
+        Async variant of ApplicantNoteListApiView.get, without conditional
+        request support
+        """
+        sparse = SparseFieldsSerializer(fast_note_serializer, data=request.query_params)
+        if not sparse.is_valid():
+            return json_response(sparse.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = sparse.get_fast_serializer()
+        paginator = NoteCursorPagination()
+        notes = await sync_to_async(paginator.paginate_queryset)(
+            NoteModel.objects.filter(
+                applicant__id=id, applicant__deleted_at=None
+            ).values(*serializer.columns_with("created_at")),
+            request,
+            view=self,
+        )
+        return json_response(
+            {
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "results": serializer.many(notes),
+            }
+        )
+
+    @idempotent
+    async def post(self, request, id: int, *args, **kwargs):
+        """
+        Async variant of ApplicantNoteListApiView.post
+        """
+        data = {
+            "applicant": id,
+            "title": request.data.get("title"),
+            "content": request.data.get("content"),
+        }
+        serializer = NoteSerializer(data=data)
+        # Validating the applicant field looks the applicant up
+        if not await sync_to_async(serializer.is_valid)():
+            return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        note = await sync_to_async(self.create)(serializer)
+        return json_response(NoteSerializer(note).data, status=status.HTTP_201_CREATED)
+
+    def create(self, serializer):
+        """
+        Helper method to save the note and queue its webhook event in one
+        transaction
+        """
+        with transaction.atomic():
+            note = serializer.save()
+            queue_note_created(note)
+        return note
+
+
+class AsyncApplicantChangeFeedView(AsyncApiView):
+    required_permissions = {"GET": "api.view_applicant"}
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Stream applicant changes as server-sent events, see
+        api.changes.ChangeFeed.stream. Note events are only sent to users
+        who may view notes
+        """
+        if not isinstance(request._request, ASGIRequest):
+            return json_response(
+                {"res": "The change feed is only served over ASGI"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        data = request.query_params.dict()
+        if "Last-Event-ID" in request.headers:
+            data["last_event_id"] = request.headers["Last-Event-ID"]
+        serializer = ChangeFeedSerializer(data=data)
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        kinds = serializer.validated_data.get(
+            "events", set(ApplicantChangeModel.Kind.values)
+        )
+        if not await ahas_cached_perm(request.user, "api.view_note"):
+            kinds = kinds - {ApplicantChangeModel.Kind.NOTE}
+        response = StreamingHttpResponse(
+            change_feed.stream(kinds, serializer.validated_data.get("last_event_id")),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # Stop nginx from buffering the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
@@ -0,0 +1,152 @@
+import threading
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+
+from api.metrics import APPLICANT_CACHE
+
+
+class ApplicantCache:
+    """
+    Read-through cache of serialized ApplicantModel payloads keyed by id.
+
+    The backend is whichever Django cache is configured under `alias`, so it
+    can be local memory or Redis without any change here. Every id has a
+    generation, a clock value that writers renew immediately and again once
+    the transaction commits. Payloads are stored along with the generation
+    read before they were loaded and only served while it is still current,
+    so a reader that loaded the pre-commit row and stores it after the
+    commit stores an entry no one will serve.
+    """
+
+    def __init__(self, alias="applicants"):
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, id):
+        return f"applicant:{id}"
+
+    def generation_key(self, id):
+        return f"applicant-generation:{id}"
+
+    def lookup(self, id):
+        """
+        Helper method to return the current generation of the applicant with
+        the given id and its cached payload, or None when the entry is
+        missing or stale, in one round trip
+        """
+        key, generation_key = self.key(id), self.generation_key(id)
+        found = self.cache.get_many([key, generation_key])
+        generation = found.get(generation_key)
+        if generation is None:
+            generation = self.seed(generation_key)
+        return generation, self.current(found.get(key), generation)
+
+    async def alookup(self, id):
+        """
+        Async variant of lookup()
+        """
+        key, generation_key = self.key(id), self.generation_key(id)
+        found = await self.cache.aget_many([key, generation_key])
+        generation = found.get(generation_key)
+        if generation is None:
+            generation = await self.aseed(generation_key)
+        return generation, self.current(found.get(key), generation)
+
+    def seed(self, generation_key):
+        # Missing generations are seeded from the clock too, so a generation
+        # lost to eviction never comes back equal to a value it had before
+        self.cache.add(generation_key, time.time_ns(), timeout=None)
+        return self.cache.get(generation_key)
+
+    async def aseed(self, generation_key):
+        await self.cache.aadd(generation_key, time.time_ns(), timeout=None)
+        return await self.cache.aget(generation_key)
+
+    def current(self, entry, generation):
+        if entry is None or entry[0] != generation:
+            return None
+        return entry[1]
+
+    def get(self, id, loader):
+        """
+        Return the cached payload for the applicant with the given id, calling
+        loader(id) and caching its result on a miss. Returns None when the
+        loader finds nothing.
+        """
+        generation, payload = self.lookup(id)
+        if payload is not None:
+            self.record(hit=True)
+            return payload
+
+        self.record(hit=False)
+        payload = loader(id)
+        if payload is not None:
+            self.cache.set(self.key(id), (generation, payload))
+        return payload
+
+    async def aget(self, id, loader):
+        """
+        Async variant of get() for async views, loader must be a coroutine
+        function
+        """
+        generation, payload = await self.alookup(id)
+        if payload is not None:
+            self.record(hit=True)
+            return payload
+
+        self.record(hit=False)
+        payload = await loader(id)
+        if payload is not None:
+            await self.cache.aset(self.key(id), (generation, payload))
+        return payload
+
+    def peek(self, id):
+        """
+        Return the cached payload for the applicant with the given id, or
+        None without loading anything on a miss
+        """
+        payload = self.lookup(id)[1]
+        if payload is not None:
+            self.record(hit=True)
+        return payload
+
+    def evict(self, *ids):
+        """
+        Supersede the entries of the given applicant ids now and after commit
+        """
+        keys = [self.generation_key(id) for id in ids]
+        if not keys:
+            return
+        self.bump(keys)
+        transaction.on_commit(lambda: self.bump(keys))
+
+    def bump(self, keys):
+        # Generations are clock values, so a bulk update takes one round trip
+        generation = time.time_ns()
+        self.cache.set_many({key: generation for key in keys}, timeout=None)
+
+    def record(self, hit):
+        APPLICANT_CACHE.labels("hit" if hit else "miss").inc()
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """
+        Return the hit/miss counters of this process
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+applicant_cache = ApplicantCache()
@@ -0,0 +1,384 @@
+import asyncio
+import logging
+import select
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import timezone
+
+import orjson
+from django.conf import settings
+from django.db import connections
+
+from api.models import ApplicantChangeModel
+from api.renderers import ORJSONRenderer
+
+logger = logging.getLogger("api.changes")
+
+# Notified by the triggers of migration 0009 whenever they write events
+CHANNEL = "api_applicant_changes"
+# Events a stream may fall behind by before it is ended, its client then
+# reconnects with Last-Event-ID and catches up from the table
+QUEUE_SIZE = 1000
+# Seconds between keepalive comments, below the idle timeouts of proxies
+HEARTBEAT_INTERVAL = 15
+# Milliseconds EventSource waits before reconnecting
+RETRY_INTERVAL = 3000
+# Seconds the listener waits for notifications before checking whether it
+# still has subscribers, and before reconnecting after losing its connection
+POLL_INTERVAL = 5
+# Seconds between checks whether the transactions that may still commit
+# a missing event id have ended
+GAP_POLL_INTERVAL = 0.05
+# Events read per query when catching up from Last-Event-ID
+CATCH_UP_BATCH_SIZE = 500
+# Events the listener reads per query
+FETCH_BATCH_SIZE = 1000
+
+EVENT_COLUMNS = ("id", "kind", "applicant_id", "data", "created_at")
+
+ChangeEvent = namedtuple("ChangeEvent", ["id", "kind", "message"])
+
+json_renderer = ORJSONRenderer()
+
+
+def render_event(id, kind, applicant_id, data, created_at):
+    """
+    A ChangeEvent with its server-sent event already rendered, so it is
+    rendered once however many streams send it
+    """
+    payload = {
+        "applicant": applicant_id,
+        **data,
+        "at": created_at.astimezone(timezone.utc),
+    }
+    message = b"id: %d\nevent: %s\ndata: %s\n\n" % (
+        id,
+        kind.encode(),
+        json_renderer.render(payload),
+    )
+    return ChangeEvent(id, kind, message)
+
+
+class Subscription:
+    """
+    Queue of the events for one stream, filled on the stream's event loop
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+        # Set once the feed is listening, events from then on are delivered
+        self.ready = asyncio.Event()
+        self.overflowed = False
+
+    def push(self, events):
+        for event in events:
+            try:
+                self.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.overflowed = True
+                return
+
+
+class ChangeFeed:
+    """
+    Fans the events of ApplicantChangeModel out to the streams of a process.
+
+    A single thread per process LISTENs on CHANNEL with its own connection,
+    reads the new events on every notification and hands them to the event
+    loop of every subscribed stream. It is started by the first subscriber
+    and stops once none are left.
+
+    Event ids are taken when a transaction writes its events but become
+    visible when it commits, so a transaction may commit event 10 after
+    another committed event 11. Events are therefore only published in id
+    order up to settled_id, below which every id is visible or was rolled
+    back. Events after a missing id wait until every transaction that was
+    running when the gap was seen has ended, the ids still missing then
+    will never be committed. A resumed stream never misses an event below
+    its Last-Event-ID this way.
+    """
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+        self.lock = threading.Lock()
+        self.subscriptions = set()
+        self.listener = None
+        self.listening = False
+        # Highest id below which no event can appear anymore
+        self.settled_id = None
+        # (snapshot xmax, highest id seen) of the gap events are waiting on
+        self.gap = None
+
+    def subscribe(self):
+        """
+        Subscribe the running event loop, returns its Subscription
+        """
+        subscription = Subscription(asyncio.get_running_loop())
+        with self.lock:
+            self.subscriptions.add(subscription)
+            if self.listening:
+                subscription.ready.set()
+            if self.listener is None:
+                self.listener = threading.Thread(
+                    target=self.run, name="api-change-feed", daemon=True
+                )
+                self.listener.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+    def publish(self, events):
+        """
+        Hand events to every subscription. Called from the listener thread
+        """
+        if not events:
+            return
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription.push, events)
+
+    def set_listening(self, listening):
+        with self.lock:
+            self.listening = listening
+            subscriptions = list(self.subscriptions) if listening else []
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription.ready.set)
+
+    def run(self):
+        """
+        Body of the listener thread, reconnects until no subscriber is left.
+        settled_id is kept across connections, so the events committed
+        while reconnecting are read on the next connection.
+        """
+        while True:
+            with self.lock:
+                if not self.subscriptions:
+                    self.listener = None
+                    self.settled_id = self.gap = None
+                    return
+            try:
+                with self.connect() as cursor:
+                    while self.listening and self.subscriptions:
+                        self.poll(cursor)
+            except Exception:
+                logger.exception("Change feed listener failed, reconnecting")
+                time.sleep(POLL_INTERVAL)
+
+    @contextmanager
+    def connect(self):
+        """
+        Helper method to LISTEN on a new connection of its own, set up like
+        Django's connections, for as long as the block runs
+        """
+        wrapper = connections[self.alias]
+        connection = wrapper.get_new_connection(wrapper.get_connection_params())
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+                if self.settled_id is None:
+                    self.settle_existing(cursor)
+                else:
+                    self.fetch(cursor)
+                if self.settled_id is not None:
+                    self.set_listening(True)
+                yield cursor
+        finally:
+            self.set_listening(False)
+            connection.close()
+
+    def settle_existing(self, cursor):
+        """
+        Helper method to start settled_id at the highest event id, once the
+        transactions that may still commit an event below it have ended
+        """
+        cursor.execute(
+            f"SELECT coalesce(max(id), 0) "
+            f"FROM {ApplicantChangeModel._meta.db_table}"
+        )
+        highest = cursor.fetchone()[0]
+        xmax = self.snapshot_xmax(cursor)
+        while not self.has_ended(cursor, xmax):
+            if not self.subscriptions:
+                return
+            time.sleep(GAP_POLL_INTERVAL)
+        self.settled_id = highest
+
+    def poll(self, cursor):
+        """
+        Helper method to wait for notifications and publish the new events.
+        While events wait on a gap it checks every GAP_POLL_INTERVAL whether
+        the gap has ended, but only reads the events again once it has or
+        once new ones were notified.
+        """
+        connection = cursor.connection
+        timeout = POLL_INTERVAL if self.gap is None else GAP_POLL_INTERVAL
+        notified = False
+        if select.select([connection], [], [], timeout)[0]:
+            connection.poll()
+            notified = bool(connection.notifies)
+            connection.notifies.clear()
+        if notified or (self.gap is not None and self.has_ended(cursor, self.gap[0])):
+            self.fetch(cursor)
+
+    def fetch(self, cursor):
+        """
+        Helper method to publish the events after settled_id that are
+        settled, in id order, reading FETCH_BATCH_SIZE of them at a time
+        """
+        # Checked before reading, so every event the gap was waiting on is
+        # visible to the read
+        bound = None
+        if self.gap is not None and self.has_ended(cursor, self.gap[0]):
+            bound, self.gap = self.gap[1], None
+        while True:
+            cursor.execute(
+                f"SELECT {', '.join(EVENT_COLUMNS)} "
+                f"FROM {ApplicantChangeModel._meta.db_table} "
+                f"WHERE id > %s ORDER BY id LIMIT %s",
+                [self.settled_id, FETCH_BATCH_SIZE],
+            )
+            rows = cursor.fetchall()
+            settled = []
+            for row in rows:
+                if bound is not None and row[0] > bound:
+                    # Every event up to the bound was read, the ids still
+                    # missing below it were rolled back
+                    self.settled_id, bound = max(self.settled_id, bound), None
+                if bound is None and row[0] != self.settled_id + 1:
+                    break
+                settled.append(row)
+                self.settled_id = row[0]
+            if bound is not None and len(rows) < FETCH_BATCH_SIZE:
+                self.settled_id, bound = max(self.settled_id, bound), None
+            if len(settled) < len(rows) and self.gap is None:
+                self.gap = (self.snapshot_xmax(cursor), rows[-1][0])
+            # Django's connections leave jsonb undecoded for JSONField
+            self.publish(
+                [
+                    render_event(id, kind, applicant_id, orjson.loads(data), created_at)
+                    for id, kind, applicant_id, data, created_at in settled
+                ]
+            )
+            if len(rows) < FETCH_BATCH_SIZE or len(settled) < len(rows):
+                return
+
+    def snapshot_xmax(self, cursor):
+        """
+        Helper method returning the first transaction id not yet started
+        """
+        cursor.execute("SELECT pg_snapshot_xmax(pg_current_snapshot())::text")
+        return cursor.fetchone()[0]
+
+    def has_ended(self, cursor, xmax):
+        """
+        Helper method telling whether every transaction started before xmax
+        has committed or rolled back
+        """
+        cursor.execute(
+            "SELECT pg_snapshot_xmin(pg_current_snapshot()) >= %s::xid8", [xmax]
+        )
+        return cursor.fetchone()[0]
+
+    async def stream(self, kinds, last_event_id=None):
+        """
+        Server-sent events of the given kinds, starting after
+        `last_event_id` when it is given and otherwise with the next change.
+        Ends after CHANGE_FEED_MAX_SECONDS or when the client falls
+        QUEUE_SIZE events behind, EventSource then reconnects on its own.
+        """
+        subscription = self.subscribe()
+        try:
+            try:
+                await asyncio.wait_for(subscription.ready.wait(), POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                return
+            # Sent once listening, every change committed after it arrives
+            yield b"retry: %d\n\n" % RETRY_INTERVAL
+
+            # Subscribed before catching up, so nothing committed in between
+            # is lost. Events read from both are only sent once.
+            sent = set()
+            after = -1
+            if last_event_id is not None:
+                # Another process may have settled less than the one the
+                # client was streaming from, it must not send those again
+                after = last_event_id
+                async for event in self.catch_up(last_event_id, self.settled_id):
+                    sent.add(event.id)
+                    if event.kind in kinds:
+                        yield event.message
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + settings.CHANGE_FEED_MAX_SECONDS
+            while not (subscription.overflowed and subscription.queue.empty()):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), min(HEARTBEAT_INTERVAL, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                # Send whatever else is queued with it, as one chunk
+                events = [event]
+                while not subscription.queue.empty():
+                    events.append(subscription.queue.get_nowait())
+                chunk = b"".join(
+                    event.message
+                    for event in events
+                    if event.kind in kinds and event.id not in sent and event.id > after
+                )
+                if chunk:
+                    yield chunk
+        finally:
+            self.unsubscribe(subscription)
+
+    async def catch_up(self, last_event_id, settled_id):
+        """
+        Helper method to read the settled events after `last_event_id` from
+        the table in batches, later ones reach the stream once published
+        """
+        while True:
+            rows = [
+                row
+                async for row in ApplicantChangeModel.objects.filter(
+                    id__gt=last_event_id, id__lte=settled_id
+                )
+                .order_by("id")
+                .values_list(*EVENT_COLUMNS)[:CATCH_UP_BATCH_SIZE]
+            ]
+            for row in rows:
+                yield render_event(*row)
+            if len(rows) < CATCH_UP_BATCH_SIZE:
+                return
+            last_event_id = rows[-1][0]
+
+
+change_feed = ChangeFeed()
+
+
+def prune_changes(before, batch_size):
+    """
+    Delete the events created before `before` in batches of batch_size,
+    returns how many were deleted
+    """
+    total = 0
+    while True:
+        batch = ApplicantChangeModel.objects.filter(created_at__lt=before).order_by(
+            "id"
+        )[:batch_size]
+        deleted, _ = ApplicantChangeModel.objects.filter(
+            id__in=batch.values("id")
+        ).delete()
+        total += deleted
+        if deleted < batch_size:
+            return total
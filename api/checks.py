@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.core import checks
+from django.db.models.signals import post_delete, pre_delete
+
+# Cache backends whose entries only the process that wrote them can read
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@checks.register(checks.Tags.caches)
+def check_token_cache(app_configs, **kwargs):
+    """
+    SignedTokenAuthentication compares tokens with the permission versions
+    and deny list in the default cache. With a process-local cache every
+    worker seeds its own versions, so a token is only accepted by the
+    worker that issued it and revocations reach no other worker.
+    """
+    classes = settings.REST_FRAMEWORK.get("DEFAULT_AUTHENTICATION_CLASSES", [])
+    if "api.tokens.SignedTokenAuthentication" not in classes:
+        return []
+    if settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        checks.Warning(
+            "Bearer tokens only work on the process that issued them, the "
+            "default cache is not shared between processes.",
+            hint="Set REDIS_URL, or serve the API from a single process.",
+            id="api.W001",
+        )
+    ]
+
+
+# Cache aliases that must be shared between processes, by what goes wrong
+# when they are not
+SHARED_CACHES = {
+    "idempotency": (
+        "Retries with an Idempotency-Key that reach another process run the "
+        "request again, the idempotency cache is not shared between processes."
+    ),
+    "applicants": (
+        "Applicant writes only evict the cached copy of the process that made "
+        "them, the applicants cache is not shared between processes."
+    ),
+}
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """
+    Report the aliases of SHARED_CACHES configured with a process-local
+    backend
+    """
+    return [
+        checks.Warning(
+            message,
+            hint="Set REDIS_URL, or serve the API from a single process.",
+            id="api.W001",
+        )
+        for alias, message in SHARED_CACHES.items()
+        if alias in settings.CACHES
+        and settings.CACHES[alias]["BACKEND"] in PROCESS_LOCAL_CACHES
+    ]
+
+
+@checks.register(checks.Tags.models)
+def check_note_delete_receivers(app_configs, **kwargs):
+    """
+    Notes are deleted by the ON DELETE CASCADE of their foreign key, see
+    migration 0008, so Django never sends their delete signals. Receivers
+    of those signals would silently never run.
+    """
+    from api.models import NoteModel
+
+    if not (
+        pre_delete.has_listeners(NoteModel) or post_delete.has_listeners(NoteModel)
+    ):
+        return []
+    return [
+        checks.Error(
+            "NoteModel has pre_delete or post_delete receivers, but notes "
+            "deleted with their applicant are removed by the database "
+            "without sending them.",
+            hint="Set NoteModel.applicant back to on_delete=models.CASCADE, "
+            "or do the receiver's work in api.deletion.",
+            id="api.E001",
+        )
+    ]
@@ -0,0 +1,52 @@
+import calendar
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(id, updated_at, *parts):
+    """
+    Build a strong ETag from an object id, its last modification time and
+    any other parts that identify the representation
+    """
+    version = 0
+    if updated_at is not None:
+        version = (
+            calendar.timegm(updated_at.utctimetuple()) * 1_000_000
+            + updated_at.microsecond
+        )
+    return quote_etag(".".join(str(part) for part in (id, version, *parts)))
+
+
+def has_preconditions(request):
+    """
+    True when the request carries If-None-Match or If-Modified-Since
+    """
+    return (
+        "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META
+    )
+
+
+def set_validators(response, etag, updated_at):
+    """
+    Set the ETag and Last-Modified headers on a response
+    """
+    response["ETag"] = etag
+    if updated_at is not None:
+        response["Last-Modified"] = http_date(updated_at.timestamp())
+    return response
+
+
+def get_not_modified_response(request, etag, updated_at):
+    """
+    Return a 304 (or 412) response when the request's preconditions show
+    the client's copy is current, otherwise None
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(updated_at.timestamp()) if updated_at else None,
+    )
+    if response is not None:
+        set_validators(response, etag, updated_at)
+    return response
@@ -0,0 +1,63 @@
+import threading
+import weakref
+
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+
+class ConnectionStats:
+    """
+    Counters for the persistent database connections of this process.
+
+    Django has no connection pool, each thread keeps its own connection for
+    up to CONN_MAX_AGE seconds, so these report how often a request found a
+    connection it could reuse rather than the state of a shared pool.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.reused = 0
+        self._connections = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def record_created(self, connection):
+        with self._lock:
+            self.created += 1
+            self._connections.add(connection)
+
+    def record_request(self, connection):
+        """
+        Count a request that starts with the given connection wrapper
+        already connected. Runs after Django has closed connections that
+        are too old or failed their health check.
+        """
+        if connection.connection is not None:
+            with self._lock:
+                self.reused += 1
+
+    def stats(self):
+        """
+        Return the counters of this process along with the number of
+        connections currently open and how many of them are running a query
+        or holding a transaction open
+        """
+        with self._lock:
+            wrappers = list(self._connections)
+            created, reused = self.created, self.reused
+        open_connections = [
+            wrapper.connection
+            for wrapper in wrappers
+            if wrapper.connection is not None and not wrapper.connection.closed
+        ]
+        return {
+            "created": created,
+            "reused": reused,
+            "open": len(open_connections),
+            "in_use": sum(
+                1
+                for connection in open_connections
+                if connection.info.transaction_status != TRANSACTION_STATUS_IDLE
+            ),
+        }
+
+
+connection_stats = ConnectionStats()
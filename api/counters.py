@@ -0,0 +1,142 @@
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count
+
+from api.models import ApplicantCounterModel, ApplicantModel
+
+STATUS = ApplicantCounterModel.Dimension.STATUS
+STATE = ApplicantCounterModel.Dimension.STATE
+
+UPSERT_SQL = """
+INSERT INTO api_applicantcountermodel (dimension, value, count)
+VALUES {values}
+ON CONFLICT (dimension, value)
+DO UPDATE SET count = api_applicantcountermodel.count + EXCLUDED.count
+"""
+
+
+def apply_deltas(deltas):
+    """
+    Add a Counter of {(dimension, value): delta} to the counter table with a
+    single upsert. Buckets are written in a fixed order so that concurrent
+    transactions lock them in the same order. Must be called inside the
+    transaction that made the counted change.
+    """
+    buckets = sorted(bucket for bucket, delta in deltas.items() if delta)
+    if not buckets:
+        return
+    params = []
+    for dimension, value in buckets:
+        params.extend([dimension, value, deltas[(dimension, value)]])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            UPSERT_SQL.format(values=", ".join(["(%s, %s, %s)"] * len(buckets))),
+            params,
+        )
+
+
+def record_created(applicants, sign=1):
+    deltas = Counter()
+    for applicant in applicants:
+        deltas[(STATUS, applicant.status)] += sign
+        deltas[(STATE, applicant.state)] += sign
+    apply_deltas(deltas)
+
+
+def record_deleted(applicants):
+    record_created(applicants, sign=-1)
+
+
+def record_status_changes(previous_statuses, status):
+    """
+    Move one applicant per entry of previous_statuses into status
+    """
+    deltas = Counter()
+    for previous in previous_statuses:
+        deltas[(STATUS, previous)] -= 1
+        deltas[(STATUS, status)] += 1
+    apply_deltas(deltas)
+
+
+def get_counts():
+    """
+    Return {dimension: {value: count}} read from the counter table, with
+    every status present even when no applicant has it
+    """
+    counts = {
+        STATUS: {value: 0 for value in ApplicantModel.ApplicantStatus.values},
+        STATE: {},
+    }
+    buckets = ApplicantCounterModel.objects.filter(count__gt=0).order_by(
+        "dimension", "value"
+    )
+    for dimension, value, count in buckets.values_list("dimension", "value", "count"):
+        counts[dimension][value] = count
+    return counts
+
+
+def count_applicants():
+    """
+    Count applicants per bucket from scratch with GROUP BY scans of the
+    applicant table
+    """
+    counts = Counter()
+    for dimension in (STATUS, STATE):
+        grouped = (
+            ApplicantModel.objects.order_by()
+            .values_list(dimension)
+            .annotate(count=Count("id"))
+        )
+        for value, count in grouped:
+            counts[(dimension, value)] = count
+    return counts
+
+
+def stored_counts():
+    """
+    Return the counter table as a Counter of {(dimension, value): count}
+    """
+    return Counter(
+        {
+            (dimension, value): count
+            for dimension, value, count in ApplicantCounterModel.objects.values_list(
+                "dimension", "value", "count"
+            )
+            if count
+        }
+    )
+
+
+def find_drift():
+    """
+    Return {(dimension, value): (stored, actual)} for every bucket whose
+    stored count differs from the applicant table
+    """
+    stored = stored_counts()
+    actual = count_applicants()
+    return {
+        bucket: (stored[bucket], actual[bucket])
+        for bucket in sorted(stored.keys() | actual.keys())
+        if stored[bucket] != actual[bucket]
+    }
+
+
+def rebuild_counters():
+    """
+    Replace the counter table with fresh counts. Writes to the applicant
+    table are blocked until the surrounding transaction ends, so no change
+    can slip in between counting and storing.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'LOCK TABLE "{ApplicantModel._meta.db_table}" IN SHARE MODE'
+            )
+        counts = count_applicants()
+        ApplicantCounterModel.objects.all().delete()
+        ApplicantCounterModel.objects.bulk_create(
+            ApplicantCounterModel(dimension=dimension, value=value, count=count)
+            for (dimension, value), count in sorted(counts.items())
+        )
+    return counts
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.utils import timezone
+
+from api.cache import applicant_cache
+from api.counters import record_deleted
+from api.models import ApplicantModel
+from api.outbox import queue_deleted
+
+
+def delete_applicant(applicant):
+    """
+    Delete an applicant locked by the caller's transaction, returns whether
+    it is gone or only hidden. Its notes are removed by the ON DELETE
+    CASCADE of their foreign key, so they are never loaded. With
+    APPLICANT_SOFT_DELETE the applicant is only marked deleted and left for
+    purge_deleted_applicants. Either way it leaves the counters and cache
+    at once.
+    """
+    soft = settings.APPLICANT_SOFT_DELETE
+    if soft:
+        applicant.deleted_at = timezone.now()
+        applicant.save(update_fields=["deleted_at", "updated_at"])
+    else:
+        applicant.delete()
+    record_deleted([applicant])
+    queue_deleted([applicant])
+    applicant_cache.evict(applicant.id)
+    return not soft
+
+
+def purge_deleted_applicants(batch_size):
+    """
+    Delete one batch of soft-deleted applicants and their notes, returns the
+    number deleted. They were already taken out of the counters and cache
+    when they were hidden.
+    """
+    return len(ApplicantModel.all_objects.purge_deleted(batch_size))
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils import encoders
+
+from api.renderers import ORJSONRenderer
+
+HEADER = "Idempotency-Key"
+# Set on responses replayed from the store
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# Seconds the lock of a key outlives the last refresh of the request holding
+# it, bounds how long a crashed worker blocks retries with the same key
+LOCK_TIMEOUT = 60
+# Seconds between refreshes of the lock while the request runs, so requests
+# slower than LOCK_TIMEOUT keep their key
+LOCK_REFRESH_INTERVAL = LOCK_TIMEOUT / 3
+
+
+class IdempotencyStore:
+    """
+    Responses of create requests sent with an Idempotency-Key header, kept
+    in the Django cache under `alias` for its TIMEOUT.
+
+    Keys are scoped to the user. The first request with a key holds a lock
+    while it runs and stores its response, so retries are answered from the
+    cache without validating or writing anything. The lock is refreshed
+    for as long as the request runs. A retry that arrives while the first
+    request is still running gets a 409, and reusing a key for a different
+    request gets a 422.
+    """
+
+    def __init__(self, alias="idempotency"):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, user_id, key):
+        return f"idempotency:{user_id}:{key}"
+
+    def fingerprint(self, request):
+        """
+        Hash of the method, path and parsed body of the request
+        """
+        body = json.dumps(
+            [request.method, request.path, request.data],
+            cls=encoders.JSONEncoder,
+            sort_keys=True,
+        )
+        return hashlib.sha256(body.encode()).hexdigest()
+
+    def begin(self, request, key):
+        """
+        Take the key for the request. Returns the response to answer with
+        instead of running the view, or None once the key is held and the
+        view should run
+        """
+        if not 0 < len(key) <= MAX_KEY_LENGTH:
+            return Response(
+                {"res": f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        fingerprint = self.fingerprint(request)
+        entry_key = self.key(request.user.pk, key)
+
+        entry = self.cache.get(entry_key)
+        if entry is None:
+            if not self.cache.add(f"{entry_key}:lock", fingerprint, LOCK_TIMEOUT):
+                return Response(
+                    {"res": f"A request with this {HEADER} is still in progress"},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            # The request holding the lock may have finished in between
+            entry = self.cache.get(entry_key)
+            if entry is None:
+                return None
+            self.cache.delete(f"{entry_key}:lock")
+        return self.replay(entry, fingerprint)
+
+    @contextmanager
+    def holding(self, request, key):
+        """
+        Keep the lock of the key taken by begin() while the block runs. The
+        refresh runs on a thread of its own, so a view blocking its thread
+        or event loop cannot let the lock lapse.
+        """
+        lock_key = f"{self.key(request.user.pk, key)}:lock"
+        done = threading.Event()
+
+        def refresh():
+            while not done.wait(LOCK_REFRESH_INTERVAL):
+                self.cache.touch(lock_key, LOCK_TIMEOUT)
+
+        threading.Thread(target=refresh, daemon=True).start()
+        try:
+            yield
+        finally:
+            done.set()
+
+    def finish(self, request, key, response):
+        """
+        Store the response of the request that held the key and release it.
+        Server errors and conflicts are not stored so the client can retry
+        """
+        entry_key = self.key(request.user.pk, key)
+        try:
+            if response is not None and (
+                response.status_code < 500
+                and response.status_code != status.HTTP_409_CONFLICT
+            ):
+                self.cache.set(entry_key, self.entry(request, response))
+        finally:
+            self.cache.delete(f"{entry_key}:lock")
+
+    def entry(self, request, response):
+        """
+        Helper method to build the stored form of a response. DRF responses
+        keep their data, rendered again on replay for the negotiated format,
+        JSON round-tripped so the cache never pickles serializer objects
+        """
+        entry = {
+            "fingerprint": self.fingerprint(request),
+            "status": response.status_code,
+        }
+        if isinstance(response, Response):
+            entry["data"] = json.loads(
+                json.dumps(response.data, cls=encoders.JSONEncoder)
+            )
+        else:
+            entry["content"] = response.content
+            entry["content_type"] = response["Content-Type"]
+        return entry
+
+    def replay(self, entry, fingerprint):
+        """
+        Helper method to rebuild a stored response
+        """
+        if entry["fingerprint"] != fingerprint:
+            return Response(
+                {"res": f"{HEADER} was already used for a different request"},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        if "data" in entry:
+            response = Response(entry["data"], status=entry["status"])
+        else:
+            response = HttpResponse(
+                entry["content"],
+                status=entry["status"],
+                content_type=entry["content_type"],
+            )
+        response[REPLAYED_HEADER] = "true"
+        return response
+
+
+idempotency_store = IdempotencyStore()
+
+
+def plain_response(response):
+    """
+    JSON HttpResponse of a DRF response, for async views which do not run
+    DRF's rendering
+    """
+    if not isinstance(response, Response):
+        return response
+    plain = HttpResponse(
+        ORJSONRenderer().render(response.data),
+        status=response.status_code,
+        content_type="application/json",
+    )
+    for name, value in response.items():
+        if name != "Content-Type":
+            plain[name] = value
+    return plain
+
+
+def idempotent(handler):
+    """
+    Decorate the post handler of an APIView or AsyncApiView so that requests
+    with an Idempotency-Key header go through idempotency_store. Requests
+    without the header are handled as before.
+    """
+    if iscoroutinefunction(handler):
+
+        @wraps(handler)
+        async def async_wrapper(view, request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if key is None:
+                return await handler(view, request, *args, **kwargs)
+            early = await sync_to_async(idempotency_store.begin)(request, key)
+            if early is not None:
+                return plain_response(early)
+            response = None
+            try:
+                with idempotency_store.holding(request, key):
+                    response = await handler(view, request, *args, **kwargs)
+            finally:
+                await sync_to_async(idempotency_store.finish)(request, key, response)
+            return response
+
+        return async_wrapper
+
+    @wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return handler(view, request, *args, **kwargs)
+        early = idempotency_store.begin(request, key)
+        if early is not None:
+            return early
+        response = None
+        try:
+            with idempotency_store.holding(request, key):
+                response = handler(view, request, *args, **kwargs)
+        finally:
+            idempotency_store.finish(request, key, response)
+        return response
+
+    return wrapper
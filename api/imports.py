@@ -0,0 +1,220 @@
+import codecs
+import csv
+import json
+
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from api.counters import STATE, STATUS, apply_deltas
+from api.models import ApplicantImportErrorModel, ApplicantImportModel, ApplicantModel
+from api.serializers import APPLICANT_CREATE_FIELDS, ApplicantBulkSerializer
+from api.streams import Echo, GeneratorReader
+
+STAGING_TABLE = "applicant_import_staging"
+
+# Rejected rows are staged too, with their errors and the values as sent
+STAGING_SQL = f"""
+CREATE TEMPORARY TABLE {STAGING_TABLE} (
+    line integer NOT NULL,
+    {", ".join(f"{field} text" for field in APPLICANT_CREATE_FIELDS)},
+    errors jsonb,
+    imported boolean NOT NULL DEFAULT false
+) ON COMMIT DROP
+"""
+
+# Rejects every valid row repeating the email of an earlier line
+DUPLICATES_SQL = f"""
+UPDATE {STAGING_TABLE} AS staging
+SET errors = %s
+FROM (
+    SELECT line, row_number() OVER (PARTITION BY email ORDER BY line) AS seen
+    FROM {STAGING_TABLE}
+    WHERE errors IS NULL
+) AS emails
+WHERE staging.line = emails.line AND emails.seen > 1
+"""
+
+# Inserts every valid staged row whose email is not taken yet and flags the
+# ones that made it in, in a single statement
+MERGE_SQL = f"""
+WITH inserted AS (
+    INSERT INTO api_applicantmodel (
+        uuid, {", ".join(APPLICANT_CREATE_FIELDS)}, status, updated_at
+    )
+    SELECT gen_random_uuid(), {", ".join(APPLICANT_CREATE_FIELDS)}, %s, %s
+    FROM {STAGING_TABLE}
+    WHERE errors IS NULL
+    ORDER BY line
+    ON CONFLICT (email) DO NOTHING
+    RETURNING email
+)
+UPDATE {STAGING_TABLE} AS staging
+SET imported = true
+FROM inserted
+WHERE staging.email = inserted.email AND staging.errors IS NULL
+"""
+
+# Rejects the valid rows whose email already belonged to an applicant
+TAKEN_SQL = f"""
+UPDATE {STAGING_TABLE} SET errors = %s WHERE errors IS NULL AND NOT imported
+"""
+
+# Arguments of jsonb_build_object() rebuilding a staged row as sent
+ERROR_ROW_ARGUMENTS = ", ".join(
+    f"'{field}', {field}" for field in APPLICANT_CREATE_FIELDS
+)
+
+# Copies every rejected row into the error report of the import
+ERRORS_SQL = f"""
+INSERT INTO {ApplicantImportErrorModel._meta.db_table}
+    (applicant_import_id, line, row, errors)
+SELECT
+    %s,
+    line,
+    jsonb_build_object({ERROR_ROW_ARGUMENTS}),
+    errors
+FROM {STAGING_TABLE}
+WHERE errors IS NOT NULL
+"""
+
+ERROR_REPORT_FIELDS = ["line", *APPLICANT_CREATE_FIELDS, "errors"]
+
+# Rejected rows are read for the error report in batches of this size
+ERROR_BATCH_SIZE = 1000
+
+
+def unique_email_message():
+    """
+    The message the UniqueValidator on ApplicantSerializer.email reports
+    """
+    field = ApplicantModel._meta.get_field("email")
+    return field.error_messages["unique"] % {
+        "model_name": ApplicantModel._meta.verbose_name,
+        "field_label": field.verbose_name,
+    }
+
+
+class ApplicantImporter:
+    """
+    Imports applicants from a CSV file with a header row naming at least
+    APPLICANT_CREATE_FIELDS.
+
+    Rows are read, validated with ApplicantBulkSerializer and fed to a COPY
+    into a temporary staging table as the file is read, the rejected ones
+    along with their errors, so neither the file nor its errors are held in
+    memory. Emails repeated within the file are then rejected in SQL, the
+    staging table is merged into the applicant table with INSERT ... ON
+    CONFLICT (email) DO NOTHING and the rows that were rejected or whose
+    email was taken are copied into ApplicantImportErrorModels of the
+    import.
+    """
+
+    def __init__(self, user=None):
+        self.applicant_import = ApplicantImportModel(created_by=user)
+        # A single serializer is reused to skip the per-row field setup
+        self.serializer = ApplicantBulkSerializer()
+
+    def run(self, stream):
+        """
+        Import the binary UTF-8 stream, with or without the byte order mark
+        spreadsheet programs add, and return the saved ApplicantImportModel.
+        The stream only needs a read() method.
+        """
+        reader = csv.DictReader(codecs.getreader("utf-8-sig")(stream))
+        missing = [
+            field
+            for field in APPLICANT_CREATE_FIELDS
+            if field not in (reader.fieldnames or ())
+        ]
+        if missing:
+            raise serializers.ValidationError(
+                {"file": [f"Missing CSV columns: {', '.join(missing)}"]}
+            )
+
+        taken = json.dumps({"email": [unique_email_message()]})
+        with transaction.atomic():
+            self.applicant_import.save()
+            with connection.cursor() as cursor:
+                cursor.execute(STAGING_SQL)
+                cursor.copy_expert(
+                    f"COPY {STAGING_TABLE} "
+                    f"(line, {', '.join(APPLICANT_CREATE_FIELDS)}, errors) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    GeneratorReader(self.staging_lines(reader)),
+                )
+                cursor.execute(DUPLICATES_SQL, [taken])
+                cursor.execute(
+                    MERGE_SQL, [ApplicantModel.ApplicantStatus.PENDING, timezone.now()]
+                )
+                self.record_counters(cursor)
+                cursor.execute(TAKEN_SQL, [taken])
+                cursor.execute(ERRORS_SQL, [self.applicant_import.pk])
+                self.applicant_import.rejected = cursor.rowcount
+            self.applicant_import.save(update_fields=["rows", "imported", "rejected"])
+        return self.applicant_import
+
+    def staging_lines(self, reader):
+        """
+        Helper method to yield a CSV line for COPY for every row of the
+        file, with the validated values of a valid row and the values as
+        sent and the errors of a rejected one
+        """
+        writer = csv.writer(Echo())
+        for row in reader:
+            self.applicant_import.rows += 1
+            row = {field: row.get(field) for field in APPLICANT_CREATE_FIELDS}
+            try:
+                data = self.serializer.run_validation(row)
+            except serializers.ValidationError as exc:
+                yield writer.writerow(
+                    [reader.line_num, *row.values(), json.dumps(exc.detail)]
+                )
+                continue
+            yield writer.writerow(
+                [reader.line_num]
+                + [data[field] for field in APPLICANT_CREATE_FIELDS]
+                + [None]
+            )
+
+    def record_counters(self, cursor):
+        """
+        Helper method to count the imported applicants into the status and
+        state counters
+        """
+        cursor.execute(
+            f"SELECT state, count(*) FROM {STAGING_TABLE} "
+            "WHERE imported GROUP BY state"
+        )
+        deltas = {(STATE, state): count for state, count in cursor.fetchall()}
+        self.applicant_import.imported = sum(deltas.values())
+        deltas[(STATUS, ApplicantModel.ApplicantStatus.PENDING)] = (
+            self.applicant_import.imported
+        )
+        apply_deltas(deltas)
+
+
+def import_applicants(stream, user=None):
+    """
+    Import applicants from a binary CSV stream, see ApplicantImporter
+    """
+    return ApplicantImporter(user).run(stream)
+
+
+def error_report_rows(applicant_import):
+    """
+    Yield one row per rejected line of an import for the CSV error report
+    """
+    errors = applicant_import.errors.order_by("line").values_list(
+        "line", "row", "errors"
+    )
+    for line, row, row_errors in errors.iterator(chunk_size=ERROR_BATCH_SIZE):
+        yield {
+            "line": line,
+            **{field: row.get(field) for field in APPLICANT_CREATE_FIELDS},
+            "errors": "; ".join(
+                f"{field}: {message}"
+                for field, messages in row_errors.items()
+                for message in messages
+            ),
+        }
@@ -0,0 +1,22 @@
+from django.db import models
+
+
+@models.IntegerField.register_lookup
+class Any(models.Lookup):
+    """
+    `field__any=[...]` compiles to `field = ANY(%s)` with the whole list bound
+    as a single array parameter, instead of the one placeholder per value
+    that `__in` produces. This keeps the statement small and its plan cached
+    however many ids are passed.
+    """
+
+    lookup_name = "any"
+    prepare_rhs = False
+
+    def get_db_prep_lookup(self, value, connection):
+        return "%s", [[int(item) for item in value]]
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} = ANY({rhs})", lhs_params + rhs_params
@@ -0,0 +1,147 @@
+import asyncio
+from statistics import quantiles
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of the sync WSGI views against the async ASGI "
+        "views under concurrent clients. Both servers must already be running "
+        "against the same database, e.g. the web and asgi compose services."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sync-url", default="http://localhost:8000/api/")
+        parser.add_argument("--async-url", default="http://localhost:8001/api/async/")
+        parser.add_argument(
+            "--path",
+            default="applicant/?page_size=20",
+            help="Path requested relative to both base urls",
+        )
+        parser.add_argument(
+            "--username",
+            default="allperms",
+            help="User the requests are authenticated as, see createtestusers",
+        )
+        parser.add_argument("--clients", nargs="+", type=int, default=[10, 100, 1000])
+        parser.add_argument("--requests-per-client", type=int, default=20)
+
+    def handle(self, sync_url, async_url, path, username, **options):
+        cookie = f"{settings.SESSION_COOKIE_NAME}={self.create_session(username)}"
+        self.stdout.write(
+            f"{'server':>6} {'clients':>8} {'requests':>9} {'errors':>7} "
+            f"{'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}"
+        )
+        for clients in options["clients"]:
+            for name, base_url in (("sync", sync_url), ("async", async_url)):
+                latencies, errors, seconds = asyncio.run(
+                    self.run(
+                        base_url + path,
+                        cookie,
+                        clients,
+                        options["requests_per_client"],
+                    )
+                )
+                self.report(name, clients, latencies, errors, seconds)
+
+    def create_session(self, username):
+        """
+        Helper method to log the benchmark user in without going through a
+        login form, returns the session key
+        """
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"User {username!r} does not exist")
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        return session.session_key
+
+    async def run(self, url, cookie, clients, requests_per_client):
+        """
+        Helper method to run `clients` concurrent keep-alive connections that
+        each send `requests_per_client` GETs back to back
+        """
+        parts = urlsplit(url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        request = (
+            f"GET {target} HTTP/1.1\r\n"
+            f"Host: {parts.netloc}\r\n"
+            f"Cookie: {cookie}\r\n"
+            "Accept: application/json\r\n"
+            "\r\n"
+        ).encode()
+        latencies = []
+        errors = 0
+
+        async def client():
+            nonlocal errors
+            connection = None
+            for _ in range(requests_per_client):
+                started = perf_counter()
+                try:
+                    if connection is None:
+                        connection = await asyncio.open_connection(
+                            parts.hostname, parts.port or 80
+                        )
+                    status, keep_alive = await self.fetch(*connection, request)
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    errors += 1
+                    connection = None
+                    continue
+                if status == 200:
+                    latencies.append(perf_counter() - started)
+                else:
+                    errors += 1
+                if not keep_alive:
+                    connection[1].close()
+                    connection = None
+            if connection is not None:
+                connection[1].close()
+
+        started = perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        return latencies, errors, perf_counter() - started
+
+    async def fetch(self, reader, writer, request):
+        """
+        Helper method to send one request and read its response, returns the
+        status code and whether the connection can be reused
+        """
+        writer.write(request)
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        headers = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        if "content-length" in headers:
+            await reader.readexactly(int(headers["content-length"]))
+            keep_alive = headers.get("connection", "").lower() != "close"
+        else:
+            await reader.read()
+            keep_alive = False
+        return int(status_line.split()[1]), keep_alive
+
+    def report(self, name, clients, latencies, errors, seconds):
+        if len(latencies) >= 2:
+            cuts = quantiles(latencies, n=100)
+            p50, p99 = cuts[49] * 1000, cuts[98] * 1000
+        else:
+            p50 = p99 = float("nan")
+        self.stdout.write(
+            f"{name:>6} {clients:>8} {len(latencies) + errors:>9} {errors:>7} "
+            f"{len(latencies) / seconds:>9,.0f} {p50:>8.1f} {p99:>8.1f}"
+        )
@@ -0,0 +1,87 @@
+from datetime import datetime
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from api.compression import COMPRESSORS, compress
+from api.management.commands.seedapplicants import APPLICANT_COLUMNS, applicant_rows
+from api.renderers import ORJSONRenderer
+from api.serializers import SparseFieldsSerializer, fast_applicant_serializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare render time and response size of DRF's JSONRenderer and "
+        "ORJSONRenderer for applicant lists, and the time and bytes on the "
+        "wire of each supported compression. Rows come from the "
+        "seedapplicants generator so they compress like real data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", nargs="+", type=int, default=[10_000, 100_000])
+        parser.add_argument(
+            "--fields",
+            help="Comma separated fields to render, as in ?fields=, default all",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per measurement, the fastest is reported",
+        )
+
+    def handle(self, rows, repeat, fields, **options):
+        serializer = fast_applicant_serializer
+        if fields:
+            sparse = SparseFieldsSerializer(serializer, data={"fields": fields})
+            if not sparse.is_valid():
+                raise CommandError(sparse.errors["fields"][0])
+            serializer = sparse.get_fast_serializer()
+        self.stdout.write(
+            f"{'rows':>8} {'renderer':>9} {'encoding':>9} {'ms':>9} "
+            f"{'bytes':>12} {'ratio':>6}"
+        )
+        for count in rows:
+            data = serializer.many(self.make_rows(count))
+            for name, renderer in (
+                ("json", JSONRenderer()),
+                ("orjson", ORJSONRenderer()),
+            ):
+                seconds, body = self.measure(repeat, renderer.render, data)
+                self.report(count, name, "identity", seconds, len(body), len(body))
+            for coding in COMPRESSORS:
+                seconds, compressed = self.measure(repeat, compress, coding, body)
+                self.report(
+                    count, "orjson", coding, seconds, len(compressed), len(body)
+                )
+
+    def make_rows(self, count):
+        """
+        Helper method to build `count` applicant rows as `.values()` returns
+        them
+        """
+        rows = []
+        for line in applicant_rows(0, 1, count):
+            row = dict(zip(APPLICANT_COLUMNS, line.rstrip("\n").split("\t")))
+            row["id"] = int(row["id"])
+            row["updated_at"] = datetime.fromisoformat(row["updated_at"])
+            rows.append(row)
+        return rows
+
+    def measure(self, repeat, function, *args):
+        """
+        Helper method to return the fastest of `repeat` calls and the result
+        """
+        best = float("inf")
+        for _ in range(repeat):
+            started = perf_counter()
+            result = function(*args)
+            best = min(best, perf_counter() - started)
+        return best, result
+
+    def report(self, count, renderer, encoding, seconds, size, uncompressed):
+        self.stdout.write(
+            f"{count:>8} {renderer:>9} {encoding:>9} {seconds * 1000:>9.1f} "
+            f"{size:>12,} {uncompressed / size:>5.1f}x"
+        )
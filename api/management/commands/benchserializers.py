@@ -0,0 +1,64 @@
+from time import perf_counter
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import ApplicantModel
+from api.serializers import ApplicantSerializer, fast_applicant_serializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/sec of ApplicantSerializer against the fast read path. "
+        "Rows are generated in memory so only serialization is measured."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", nargs="+", type=int, default=[10_000, 100_000, 1_000_000]
+        )
+        parser.add_argument("--chunk-size", type=int, default=10_000)
+
+    def handle(self, rows, chunk_size, **options):
+        self.stdout.write(
+            f"{'rows':>10} {'serializer rows/s':>18} {'fast rows/s':>12} "
+            f"{'speedup':>8}"
+        )
+        for count in rows:
+            serializer_seconds = fast_seconds = 0.0
+            for start in range(0, count, chunk_size):
+                chunk = [
+                    self.make_row(id)
+                    for id in range(start + 1, min(count, start + chunk_size) + 1)
+                ]
+                instances = [ApplicantModel(**row) for row in chunk]
+
+                started = perf_counter()
+                ApplicantSerializer(instances, many=True).data
+                serializer_seconds += perf_counter() - started
+
+                started = perf_counter()
+                fast_applicant_serializer.many(chunk)
+                fast_seconds += perf_counter() - started
+
+            self.stdout.write(
+                f"{count:>10} {count / serializer_seconds:>18,.0f} "
+                f"{count / fast_seconds:>12,.0f} "
+                f"{serializer_seconds / fast_seconds:>7.1f}x"
+            )
+
+    def make_row(self, id):
+        return {
+            "id": id,
+            "uuid": uuid4(),
+            "first_name": "Spike",
+            "last_name": "Spiegel",
+            "email": f"applicant{id}@bebop.com",
+            "phone_number": "123-456-7890",
+            "address": "123 Cowboy Pl",
+            "zip_code": "10000",
+            "state": "New York",
+            "status": ApplicantModel.ApplicantStatus.PENDING,
+            "updated_at": timezone.now(),
+        }
@@ -0,0 +1,79 @@
+from time import sleep
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.outbox import OutboxDispatcher, requeue_failed
+
+
+class Command(BaseCommand):
+    help = (
+        "Post queued applicant and note events to the WEBHOOK_URLS endpoints "
+        "in batches, retrying failed deliveries with backoff. Several "
+        "dispatchers can run at once, they skip each other's rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="Events per request"
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Endpoints posted to at once",
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=10, help="Seconds to wait per request"
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=10,
+            help="Attempts before an event is given up on",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, checking for new events",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="Seconds to wait with --loop once nothing is due",
+        )
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Queue the events that were given up on again first",
+        )
+
+    def handle(
+        self,
+        batch_size,
+        concurrency,
+        timeout,
+        max_attempts,
+        loop,
+        interval,
+        retry_failed,
+        **options,
+    ):
+        if min(batch_size, concurrency, max_attempts) < 1:
+            raise CommandError(
+                "--batch-size, --concurrency and --max-attempts must be positive"
+            )
+        if retry_failed:
+            self.stdout.write(f"Queued {requeue_failed():,} failed event(s) again")
+        dispatcher = OutboxDispatcher(batch_size, concurrency, timeout, max_attempts)
+        while True:
+            delivered, failed = dispatcher.dispatch()
+            if delivered or failed:
+                self.stdout.write(
+                    f"Delivered {delivered:,} event(s), {failed:,} failed",
+                    self.style.ERROR if failed else self.style.SUCCESS,
+                )
+                continue
+            if not loop:
+                return
+            sleep(interval)
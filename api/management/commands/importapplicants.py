@@ -0,0 +1,56 @@
+import csv
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from api.imports import ERROR_REPORT_FIELDS, error_report_rows, import_applicants
+
+
+class Command(BaseCommand):
+    help = (
+        "Import applicants from a CSV file with the same validation and "
+        "error report as POST /api/applicant/import/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file with a header row")
+        parser.add_argument(
+            "--errors", help="Write the rejected rows as CSV to this path"
+        )
+        parser.add_argument(
+            "--username", help="User the import is recorded as created by"
+        )
+
+    def handle(self, path, errors, username, **options):
+        user = None
+        if username:
+            user = User.objects.filter(username=username).first()
+            if user is None:
+                raise CommandError(f"User {username!r} does not exist")
+
+        started = perf_counter()
+        try:
+            with open(path, "rb") as stream:
+                applicant_import = import_applicants(stream, user=user)
+        except (OSError, UnicodeDecodeError) as exc:
+            raise CommandError(f"Could not read {path}: {exc}")
+        except serializers.ValidationError as exc:
+            raise CommandError(f"Could not import {path}: {exc.detail}")
+        seconds = perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Import {applicant_import.uuid}: {applicant_import.imported:,} of "
+                f"{applicant_import.rows:,} rows imported, "
+                f"{applicant_import.rejected:,} rejected in {seconds:.1f}s "
+                f"({applicant_import.rows / max(seconds, 1e-9):,.0f} rows/s)"
+            )
+        )
+        if errors and applicant_import.rejected:
+            with open(errors, "w", newline="") as report:
+                writer = csv.DictWriter(report, ERROR_REPORT_FIELDS)
+                writer.writeheader()
+                writer.writerows(error_report_rows(applicant_import))
+            self.stdout.write(f"Rejected rows written to {errors}")
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.changes import prune_changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete change feed events older than CHANGE_FEED_RETENTION_DAYS in "
+        "batches. Clients can only resume from events that are still kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.CHANGE_FEED_RETENTION_DAYS,
+            help="Keep events of the last DAYS days",
+        )
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, days, batch_size, **options):
+        if days < 0 or batch_size < 1:
+            raise CommandError("--days must not be negative, --batch-size positive")
+        pruned = prune_changes(timezone.now() - timedelta(days=days), batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned:,} event(s)"))
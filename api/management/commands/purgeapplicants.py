@@ -0,0 +1,58 @@
+from time import perf_counter, sleep
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.deletion import purge_deleted_applicants
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete soft-deleted applicants and their notes in small batches, "
+        "each in its own transaction so locks are held briefly. Several "
+        "purgers can run at once, they skip each other's rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, checking for newly deleted applicants",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait with --loop once nothing is left to purge",
+        )
+
+    def handle(self, batch_size, loop, interval, **options):
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive")
+        while True:
+            purged = self.purge(batch_size)
+            if purged:
+                self.stdout.write(self.style.SUCCESS(f"Purged {purged:,} applicant(s)"))
+            if not loop:
+                return
+            sleep(interval)
+
+    def purge(self, batch_size):
+        """
+        Helper method to purge batches until none is left, returns the number
+        of applicants purged
+        """
+        started = perf_counter()
+        purged = 0
+        while True:
+            with transaction.atomic():
+                deleted = purge_deleted_applicants(batch_size)
+            if not deleted:
+                return purged
+            purged += deleted
+            seconds = perf_counter() - started
+            self.stdout.write(
+                f"{purged:,} applicants, {purged / seconds:,.0f} applicants/s",
+                ending="\r",
+            )
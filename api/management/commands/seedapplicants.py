@@ -0,0 +1,266 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+
+from api.counters import rebuild_counters
+from api.models import ApplicantModel, NoteModel
+from api.streams import GeneratorReader
+
+FIRST_NAMES = (
+    "Spike Jet Faye Ed Vicious Julia Gren Annie Punch Judy Andy Rocco Meifa "
+    "Doohan Lin Shin"
+).split()
+LAST_NAMES = (
+    "Spiegel Black Valentine Wong Hau Tivrusky Grencia Smith Garcia Johnson "
+    "Lee Nguyen Brown Miller Davis"
+).split()
+STREETS = ("Cowboy Pl", "Bebop Ave", "Ganymede Rd", "Mars Blvd", "Callisto St")
+STATES = (
+    "Alabama,Alaska,Arizona,California,Colorado,Florida,Georgia,Illinois,"
+    "Massachusetts,Michigan,New Jersey,New York,North Carolina,Ohio,Oregon,"
+    "Pennsylvania,Texas,Virginia,Washington,Wisconsin"
+).split(",")
+# Most applicants are still waiting on a decision
+STATUS_WEIGHTS = (
+    (ApplicantModel.ApplicantStatus.PENDING, 70),
+    (ApplicantModel.ApplicantStatus.APPROVED, 10),
+    (ApplicantModel.ApplicantStatus.REJECTED, 20),
+)
+WORDS = (
+    "bounty interview follow up references checked salary offer relocation "
+    "available start date skills strong communication team fit second round "
+    "scheduled remote experience portfolio reviewed background pending call"
+).split()
+# Notes are spread over the year before this date so reruns are identical
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+APPLICANT_COLUMNS = (
+    "id",
+    "uuid",
+    "first_name",
+    "last_name",
+    "email",
+    "phone_number",
+    "address",
+    "zip_code",
+    "state",
+    "status",
+    "updated_at",
+)
+NOTE_COLUMNS = (
+    "uuid",
+    "applicant_id",
+    "title",
+    "content",
+    "created_at",
+    "updated_at",
+)
+
+
+def random_uuid(rng):
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def applicant_rows(seed, first_id, count):
+    """
+    Yield COPY text lines for `count` applicants with consecutive ids. The
+    generated values never contain tabs, newlines or backslashes, so they
+    need no escaping.
+    """
+    rng = random.Random(f"{seed}:applicants:{first_id}")
+    statuses = [status for status, _ in STATUS_WEIGHTS]
+    weights = [weight for _, weight in STATUS_WEIGHTS]
+    for id in range(first_id, first_id + count):
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        values = (
+            id,
+            random_uuid(rng),
+            first_name,
+            last_name,
+            f"{first_name}.{last_name}.{id}@example.com".lower(),
+            f"{rng.randrange(200, 1000)}-{rng.randrange(1000):03}-"
+            f"{rng.randrange(10000):04}",
+            f"{rng.randrange(1, 10000)} {rng.choice(STREETS)}",
+            f"{rng.randrange(100000):05}",
+            rng.choice(STATES),
+            rng.choices(statuses, weights)[0],
+            EPOCH.isoformat(),
+        )
+        yield "\t".join(map(str, values)) + "\n"
+
+
+def note_rows(seed, first_applicant_id, applicants, notes_per_applicant):
+    """
+    Yield COPY text lines for `notes_per_applicant` notes on each of
+    `applicants` applicants with consecutive ids
+    """
+    rng = random.Random(f"{seed}:notes:{first_applicant_id}")
+    for applicant_id in range(first_applicant_id, first_applicant_id + applicants):
+        for _ in range(notes_per_applicant):
+            created_at = EPOCH - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+            values = (
+                random_uuid(rng),
+                applicant_id,
+                " ".join(rng.choices(WORDS, k=3)).capitalize(),
+                " ".join(rng.choices(WORDS, k=rng.randrange(10, 60))).capitalize()
+                + ".",
+                created_at.isoformat(),
+                created_at.isoformat(),
+            )
+            yield "\t".join(map(str, values)) + "\n"
+
+
+def copy_rows(model, columns, rows):
+    """
+    Stream rows into the table of model with a single COPY, returns the
+    number of rows copied
+    """
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f'COPY "{model._meta.db_table}" ({", ".join(columns)}) FROM STDIN',
+            GeneratorReader(rows),
+        )
+        return cursor.rowcount
+
+
+def copy_applicants(seed, first_id, count):
+    return copy_rows(
+        ApplicantModel, APPLICANT_COLUMNS, applicant_rows(seed, first_id, count)
+    )
+
+
+def copy_notes(seed, first_applicant_id, applicants, notes_per_applicant):
+    return copy_rows(
+        NoteModel,
+        NOTE_COLUMNS,
+        note_rows(seed, first_applicant_id, applicants, notes_per_applicant),
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed applicants and their notes with deterministic synthetic data, "
+        "streamed into Postgres with COPY from several worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--applicants", type=int, default=100_000)
+        parser.add_argument("--notes-per-applicant", type=int, default=10)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help=(
+                "Runs with the same seed and chunk size into an empty "
+                "database generate the same rows, whatever the worker count"
+            ),
+        )
+        parser.add_argument("--workers", type=int, default=os.cpu_count())
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=50_000,
+            help="Rows per COPY statement",
+        )
+
+    def handle(self, applicants, notes_per_applicant, seed, workers, **options):
+        if applicants < 1 or notes_per_applicant < 0 or workers < 1:
+            raise CommandError(
+                "--applicants and --workers must be positive and "
+                "--notes-per-applicant must not be negative"
+            )
+        chunk_size = max(1, options["chunk_size"])
+        first_id = self.reserve_ids(applicants)
+
+        self.run(
+            "applicants",
+            copy_applicants,
+            [
+                (seed, start, min(chunk_size, first_id + applicants - start))
+                for start in range(first_id, first_id + applicants, chunk_size)
+            ],
+            workers,
+        )
+        if notes_per_applicant:
+            per_chunk = max(1, chunk_size // notes_per_applicant)
+            self.run(
+                "notes",
+                copy_notes,
+                [
+                    (
+                        seed,
+                        start,
+                        min(per_chunk, first_id + applicants - start),
+                        notes_per_applicant,
+                    )
+                    for start in range(first_id, first_id + applicants, per_chunk)
+                ],
+                workers,
+            )
+
+        # COPY bypasses the views that maintain the counters
+        rebuild_counters()
+        with connection.cursor() as cursor:
+            for model in (ApplicantModel, NoteModel):
+                cursor.execute(f'ANALYZE "{model._meta.db_table}"')
+
+    def reserve_ids(self, count):
+        """
+        Helper method to take `count` consecutive applicant ids from the id
+        sequence, returns the first one. The table lock keeps concurrent
+        inserts from drawing ids in between.
+        """
+        table = ApplicantModel._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE "{table}" IN SHARE ROW EXCLUSIVE MODE')
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+                "nextval(pg_get_serial_sequence(%s, 'id')) + %s - 1)",
+                [table, table, count],
+            )
+            return cursor.fetchone()[0] - count + 1
+
+    def run(self, name, copy, tasks, workers):
+        """
+        Helper method to run one copy per task, in parallel when there is
+        more than one worker, reporting progress and rows/sec
+        """
+        started = perf_counter()
+        copied = 0
+
+        def progress(rows):
+            nonlocal copied
+            copied += rows
+            seconds = perf_counter() - started
+            self.stdout.write(
+                f"{name}: {copied:,} rows, {copied / seconds:,.0f} rows/s",
+                ending="\r",
+            )
+
+        if workers == 1 or len(tasks) == 1:
+            for task in tasks:
+                progress(copy(*task))
+        else:
+            # Children must open their own connections instead of sharing
+            # the parent's socket
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for future in as_completed(
+                    [executor.submit(copy, *task) for task in tasks]
+                ):
+                    progress(future.result())
+
+        seconds = perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{name}: {copied:,} rows in {seconds:.1f}s, "
+                f"{copied / seconds:,.0f} rows/s"
+            )
+        )
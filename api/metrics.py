@@ -0,0 +1,210 @@
+import hmac
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+# Requests that did not resolve to a view, e.g. 404s
+UNRESOLVED_VIEW = "unresolved"
+
+# Methods labelled as sent, any other method is labelled OTHER_METHOD so
+# clients cannot create series at will
+KNOWN_METHODS = frozenset(["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])
+OTHER_METHOD = "other"
+
+REQUESTS = Counter(
+    "api_requests_total",
+    "Requests handled, by view class, method and status code",
+    ["view", "method", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "api_request_duration_seconds",
+    "Time to produce a response, by view class and method",
+    ["view", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+RESPONSE_SIZE = Histogram(
+    "api_response_size_bytes",
+    "Size of the response body, by view class and method",
+    ["view", "method"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+)
+DB_QUERIES = Counter(
+    "api_db_queries_total",
+    "SQL queries run while handling requests, by view class and method",
+    ["view", "method"],
+)
+DB_CONNECTIONS = Counter(
+    "api_db_connections_created_total",
+    "Database connections opened",
+)
+APPLICANT_CACHE = Counter(
+    "api_applicant_cache_requests_total",
+    "Applicant cache lookups by result, hit ratio is hits over all lookups",
+    ["result"],
+)
+
+
+def view_name(view_func):
+    """
+    Class name of a class-based view, APIView and View record the class on
+    the function returned by as_view()
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    return view_class.__name__ if view_class else view_func.__name__
+
+
+def method_label(method):
+    return method if method in KNOWN_METHODS else OTHER_METHOD
+
+
+class QueryCounter:
+    def __init__(self):
+        self.queries = 0
+
+
+# QueryCounter of the request being handled
+current_query_counter = ContextVar("current_query_counter", default=None)
+
+
+def count_query(execute, sql, params, many, context):
+    """
+    connection.execute_wrapper hook installed on every connection, see
+    api.signals, counting queries for the request that runs them
+    """
+    counter = current_query_counter.get()
+    if counter is not None:
+        counter.queries += 1
+    return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """
+    Records the request count, latency, response size and query count of
+    every request, labelled by the class of the view that handled it.
+    Works in both sync and async chains.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = perf_counter()
+        counter = QueryCounter()
+        with self.count_queries(counter):
+            response = self.get_response(request)
+        return self.observe(request, response, started, counter)
+
+    async def __acall__(self, request):
+        started = perf_counter()
+        counter = QueryCounter()
+        with self.count_queries(counter):
+            response = await self.get_response(request)
+        return self.observe(request, response, started, counter)
+
+    @contextmanager
+    def count_queries(self, counter):
+        """
+        Helper method to make counter the current one while the block runs
+        """
+        token = current_query_counter.set(counter)
+        try:
+            yield
+        finally:
+            current_query_counter.reset(token)
+
+    def observe(self, request, response, started, counter):
+        """
+        Helper method to record the metrics of a response
+        """
+        view = getattr(request, "metrics_view", UNRESOLVED_VIEW)
+        method = method_label(request.method)
+        REQUESTS.labels(view, method, response.status_code).inc()
+        REQUEST_LATENCY.labels(view, method).observe(perf_counter() - started)
+        DB_QUERIES.labels(view, method).inc(counter.queries)
+        size = RESPONSE_SIZE.labels(view, method)
+        if response.streaming and response.is_async:
+            response.streaming_content = self.ameasure(response.streaming_content, size)
+        elif response.streaming:
+            response.streaming_content = self.measure(response.streaming_content, size)
+        else:
+            size.observe(len(response.content))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_view = view_name(view_func)
+
+    def measure(self, chunks, size):
+        """
+        Helper method to pass a streamed body through, observing its size
+        once it has been sent
+        """
+        total = 0
+        for chunk in chunks:
+            total += len(chunk)
+            yield chunk
+        size.observe(total)
+
+    async def ameasure(self, chunks, size):
+        """
+        Helper method to measure an async streamed body, like measure
+        """
+        total = 0
+        async for chunk in chunks:
+            total += len(chunk)
+            yield chunk
+        size.observe(total)
+
+
+def get_registry():
+    """
+    The registry to expose. With PROMETHEUS_MULTIPROC_DIR set every worker
+    process writes its samples to that directory and they are aggregated on
+    each scrape, so any worker can answer for all of them.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition of the metrics of every worker. When
+    METRICS_TOKEN is set the scraper must send it as a bearer token. Without
+    it the metrics are only served with DEBUG on.
+    """
+    token = settings.METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        return HttpResponseForbidden()
+    if token:
+        expected = f"Bearer {token}"
+        received = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(received.encode(), expected.encode()):
+            return HttpResponseForbidden()
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:19
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notemodel",
+            name="created_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notemodel",
+            index=models.Index(
+                fields=["applicant", "-created_at", "-id"],
+                name="note_applicant_timeline_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:21
+
+from django.db import migrations
+
+# The search_vector columns are maintained by triggers and only read by
+# api.search, so they are deliberately left off the models: that keeps them
+# out of every other SELECT and out of the serializers.
+
+APPLICANT_SEARCH_VECTOR = """
+    setweight(to_tsvector('english', {row}.first_name || ' ' || {row}.last_name), 'A')
+    || setweight(to_tsvector('simple', {row}.email), 'A')
+    || setweight(
+        to_tsvector(
+            'english',
+            {row}.address || ' ' || {row}.zip_code || ' ' || {row}.state
+        ),
+        'C'
+    )
+"""
+
+NOTE_SEARCH_VECTOR = """
+    setweight(to_tsvector('english', {row}.title), 'A')
+    || setweight(to_tsvector('english', {row}.content), 'B')
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_note_created_at"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=f"""
+            ALTER TABLE api_applicantmodel ADD COLUMN search_vector tsvector;
+
+            CREATE FUNCTION api_applicantmodel_search_vector_update()
+            RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {APPLICANT_SEARCH_VECTOR.format(row="NEW")};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER api_applicantmodel_search_vector
+            BEFORE INSERT OR UPDATE OF
+                first_name, last_name, email, address, zip_code, state
+            ON api_applicantmodel
+            FOR EACH ROW EXECUTE FUNCTION api_applicantmodel_search_vector_update();
+
+            UPDATE api_applicantmodel
+            SET search_vector = {APPLICANT_SEARCH_VECTOR.format(row="api_applicantmodel")};
+
+            CREATE INDEX api_applicantmodel_search_vector_idx
+            ON api_applicantmodel USING gin (search_vector);
+            """,
+            reverse_sql="""
+            DROP TRIGGER api_applicantmodel_search_vector ON api_applicantmodel;
+            DROP FUNCTION api_applicantmodel_search_vector_update();
+            ALTER TABLE api_applicantmodel DROP COLUMN search_vector;
+            """,
+        ),
+        migrations.RunSQL(
+            sql=f"""
+            ALTER TABLE api_notemodel ADD COLUMN search_vector tsvector;
+
+            CREATE FUNCTION api_notemodel_search_vector_update()
+            RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {NOTE_SEARCH_VECTOR.format(row="NEW")};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER api_notemodel_search_vector
+            BEFORE INSERT OR UPDATE OF title, content
+            ON api_notemodel
+            FOR EACH ROW EXECUTE FUNCTION api_notemodel_search_vector_update();
+
+            UPDATE api_notemodel
+            SET search_vector = {NOTE_SEARCH_VECTOR.format(row="api_notemodel")};
+
+            CREATE INDEX api_notemodel_search_vector_idx
+            ON api_notemodel USING gin (search_vector);
+            """,
+            reverse_sql="""
+            DROP TRIGGER api_notemodel_search_vector ON api_notemodel;
+            DROP FUNCTION api_notemodel_search_vector_update();
+            ALTER TABLE api_notemodel DROP COLUMN search_vector;
+            """,
+        ),
+    ]
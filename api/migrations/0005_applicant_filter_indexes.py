@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:23
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("api", "0004_search_vector"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="applicantmodel",
+            index=models.Index(fields=["status", "id"], name="applicant_status_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="applicantmodel",
+            index=models.Index(
+                fields=["state", "status", "id"], name="applicant_state_status_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="applicantmodel",
+            index=models.Index(
+                fields=["zip_code", "id"], name="applicant_zip_code_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="applicantmodel",
+            index=models.Index(
+                condition=models.Q(("status", "PENDING")),
+                fields=["state", "id"],
+                name="applicant_pending_state_idx",
+            ),
+        ),
+    ]
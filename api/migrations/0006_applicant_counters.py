@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_applicant_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApplicantCounterModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[("status", "Status"), ("state", "State")],
+                        max_length=16,
+                    ),
+                ),
+                ("value", models.CharField(max_length=50)),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="applicantcountermodel",
+            constraint=models.UniqueConstraint(
+                fields=("dimension", "value"), name="applicant_counter_bucket"
+            ),
+        ),
+        migrations.RunSQL(
+            sql="""
+            INSERT INTO api_applicantcountermodel (dimension, value, count)
+            SELECT 'status', status, count(*)
+            FROM api_applicantmodel GROUP BY status
+            UNION ALL
+            SELECT 'state', state, count(*)
+            FROM api_applicantmodel GROUP BY state
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
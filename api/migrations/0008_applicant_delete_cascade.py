@@ -0,0 +1,89 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:46
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.manager
+
+# Django 4.2 can not declare ON DELETE at the database level, so the foreign
+# key Django created is swapped for one with the clause. It is added NOT
+# VALID and validated separately, so existing notes are checked without
+# blocking writes to the table.
+REPLACE_NOTE_APPLICANT_FK = """
+DO $$
+DECLARE
+    name text;
+BEGIN
+    FOR name IN
+        SELECT conname FROM pg_constraint
+        WHERE conrelid = 'api_notemodel'::regclass
+        AND confrelid = 'api_applicantmodel'::regclass
+        AND contype = 'f'
+    LOOP
+        EXECUTE format('ALTER TABLE api_notemodel DROP CONSTRAINT %I', name);
+    END LOOP;
+END
+$$;
+ALTER TABLE api_notemodel ADD CONSTRAINT api_notemodel_applicant_id_fk
+    FOREIGN KEY (applicant_id) REFERENCES api_applicantmodel (id)
+    {on_delete} DEFERRABLE INITIALLY DEFERRED NOT VALID;
+"""
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("api", "0007_applicant_imports"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="applicantmodel",
+            options={
+                "default_manager_name": "all_objects",
+                "permissions": [
+                    ("view_applicant", "Can view one or many applicants"),
+                    ("create_applicant", "Can create applicants"),
+                    ("update_applicant", "Can update applicants"),
+                    ("delete_applicant", "Can delete applicants"),
+                ],
+            },
+        ),
+        migrations.AlterModelManagers(
+            name="applicantmodel",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="applicantmodel",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name="notemodel",
+            name="applicant",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING, to="api.applicantmodel"
+            ),
+        ),
+        migrations.RunSQL(
+            sql=REPLACE_NOTE_APPLICANT_FK.format(on_delete="ON DELETE CASCADE"),
+            reverse_sql=REPLACE_NOTE_APPLICANT_FK.format(on_delete=""),
+        ),
+        migrations.RunSQL(
+            sql="ALTER TABLE api_notemodel "
+            "VALIDATE CONSTRAINT api_notemodel_applicant_id_fk",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        AddIndexConcurrently(
+            model_name="applicantmodel",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", False)),
+                fields=["id"],
+                name="applicant_deleted_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,153 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:11
+
+from django.db import migrations, models
+import django.utils.timezone
+
+# Statement level triggers record the changes of a whole statement with one
+# INSERT ... SELECT from its transition tables, so bulk writes, imports and
+# purges cost one extra statement rather than one per row. Each trigger
+# then notifies api.changes.CHANNEL with the range of event ids it wrote.
+# Notifications are delivered on commit, so every id in the range that
+# belongs to the transaction is visible by the time a listener reads it.
+# Applicants that were soft-deleted already had their deleted event when
+# deleted_at was set, so purging them records nothing.
+RECORD_APPLICANT_CHANGES = """
+CREATE FUNCTION api_applicantchange_record() RETURNS trigger AS $$
+DECLARE
+    first_id bigint;
+    last_id bigint;
+BEGIN
+    IF TG_TABLE_NAME = 'api_notemodel' THEN
+        WITH recorded AS (
+            INSERT INTO api_applicantchangemodel (kind, applicant_id, data, created_at)
+            SELECT 'note', applicant_id,
+                jsonb_build_object('note', id, 'title', title), now()
+            FROM new_rows ORDER BY id
+            RETURNING id
+        )
+        SELECT min(id), max(id) INTO first_id, last_id FROM recorded;
+    ELSIF TG_OP = 'INSERT' THEN
+        WITH recorded AS (
+            INSERT INTO api_applicantchangemodel (kind, applicant_id, data, created_at)
+            SELECT 'created', id, jsonb_build_object('status', status), now()
+            FROM new_rows ORDER BY id
+            RETURNING id
+        )
+        SELECT min(id), max(id) INTO first_id, last_id FROM recorded;
+    ELSIF TG_OP = 'UPDATE' THEN
+        WITH recorded AS (
+            INSERT INTO api_applicantchangemodel (kind, applicant_id, data, created_at)
+            SELECT
+                CASE WHEN changed.deleted_at IS NULL THEN 'status' ELSE 'deleted' END,
+                changed.id,
+                CASE WHEN changed.deleted_at IS NULL
+                    THEN jsonb_build_object('status', changed.status, 'previous', previous.status)
+                    ELSE '{}'::jsonb
+                END,
+                now()
+            FROM new_rows changed JOIN old_rows previous ON previous.id = changed.id
+            WHERE previous.deleted_at IS NULL AND (
+                changed.deleted_at IS NOT NULL OR changed.status <> previous.status
+            )
+            ORDER BY changed.id
+            RETURNING id
+        )
+        SELECT min(id), max(id) INTO first_id, last_id FROM recorded;
+    ELSE
+        WITH recorded AS (
+            INSERT INTO api_applicantchangemodel (kind, applicant_id, data, created_at)
+            SELECT 'deleted', id, '{}'::jsonb, now()
+            FROM old_rows WHERE deleted_at IS NULL ORDER BY id
+            RETURNING id
+        )
+        SELECT min(id), max(id) INTO first_id, last_id FROM recorded;
+    END IF;
+    IF first_id IS NOT NULL THEN
+        PERFORM pg_notify('api_applicant_changes', first_id || ':' || last_id);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER api_applicantmodel_changes_insert
+AFTER INSERT ON api_applicantmodel
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION api_applicantchange_record();
+
+CREATE TRIGGER api_applicantmodel_changes_update
+AFTER UPDATE ON api_applicantmodel
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION api_applicantchange_record();
+
+CREATE TRIGGER api_applicantmodel_changes_delete
+AFTER DELETE ON api_applicantmodel
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION api_applicantchange_record();
+
+CREATE TRIGGER api_notemodel_changes_insert
+AFTER INSERT ON api_notemodel
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION api_applicantchange_record();
+"""
+
+DROP_APPLICANT_CHANGES = """
+DROP TRIGGER api_notemodel_changes_insert ON api_notemodel;
+DROP TRIGGER api_applicantmodel_changes_delete ON api_applicantmodel;
+DROP TRIGGER api_applicantmodel_changes_update ON api_applicantmodel;
+DROP TRIGGER api_applicantmodel_changes_insert ON api_applicantmodel;
+DROP FUNCTION api_applicantchange_record();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0008_applicant_delete_cascade"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApplicantChangeModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("status", "Status"),
+                            ("deleted", "Deleted"),
+                            ("note", "Note"),
+                        ],
+                        max_length=8,
+                    ),
+                ),
+                ("applicant_id", models.BigIntegerField()),
+                ("data", models.JSONField(default=dict)),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["created_at"], name="applicant_change_created_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql=RECORD_APPLICANT_CHANGES, reverse_sql=DROP_APPLICANT_CHANGES
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0010_outbox"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="outboxmodel",
+            index=models.Index(
+                condition=models.Q(("failed_at__isnull", True)),
+                fields=["endpoint", "id"],
+                name="outbox_endpoint_idx",
+            ),
+        ),
+    ]
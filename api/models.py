@@ -1,6 +1,66 @@
-from django.db import models
+from django.conf import settings
+from django.db import connections, models
+from django.utils import timezone
 from uuid import uuid4
 
+import api.lookups  # noqa: F401
+
+
+class ApplicantQuerySet(models.QuerySet):
+    def update_status(self, status):
+        """
+        Set the status of every applicant in the queryset that does not
+        already have it, using a single UPDATE ... RETURNING statement.
+        Returns the id and previous status of each changed row
+        """
+        table = self.model._meta.db_table
+        previous, params = (
+            self.exclude(status=status)
+            .select_for_update()
+            .values("id", "status")
+            .query.sql_with_params()
+        )
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f'UPDATE "{table}" SET "status" = %s, "updated_at" = %s '
+                f'FROM ({previous}) AS "previous" '
+                f'WHERE "{table}"."id" = "previous"."id" '
+                f'RETURNING "{table}"."id", "previous"."status"',
+                [status, timezone.now(), *params],
+            )
+            return cursor.fetchall()
+
+    def purge_deleted(self, batch_size):
+        """
+        Delete up to batch_size soft-deleted applicants in the queryset with
+        a single DELETE, skipping rows other purges hold. Their notes are
+        removed by the database through ON DELETE CASCADE. Returns the ids
+        of the deleted applicants
+        """
+        table = self.model._meta.db_table
+        deleted, params = (
+            self.filter(deleted_at__isnull=False)
+            .order_by("id")
+            .select_for_update(skip_locked=True)
+            .values("id")[:batch_size]
+            .query.sql_with_params()
+        )
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM "{table}" WHERE "id" IN ({deleted}) RETURNING "id"',
+                params,
+            )
+            return [id for id, in cursor.fetchall()]
+
+
+class ApplicantManager(models.Manager.from_queryset(ApplicantQuerySet)):
+    """
+    Hides soft-deleted applicants, which are waiting to be purged
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at=None)
+
 
 class ApplicantModel(models.Model):
     class Meta:
@@ -10,6 +70,30 @@ class ApplicantModel(models.Model):
             ("update_applicant", "Can update applicants"),
             ("delete_applicant", "Can delete applicants"),
         ]
+        # Filters of the applicant list, each ending in id so that cursor
+        # pages can be read straight off the index. Email prefix lookups use
+        # the varchar_pattern_ops index Django creates for the unique email.
+        indexes = [
+            models.Index(fields=["status", "id"], name="applicant_status_idx"),
+            models.Index(
+                fields=["state", "status", "id"], name="applicant_state_status_idx"
+            ),
+            models.Index(fields=["zip_code", "id"], name="applicant_zip_code_idx"),
+            models.Index(
+                fields=["state", "id"],
+                condition=models.Q(status="PENDING"),
+                name="applicant_pending_state_idx",
+            ),
+            # Soft-deleted applicants waiting for purgeapplicants
+            models.Index(
+                fields=["id"],
+                condition=models.Q(deleted_at__isnull=False),
+                name="applicant_deleted_idx",
+            ),
+        ]
+        # Uniqueness checks and relations must still see soft-deleted rows,
+        # their emails stay taken until they are purged
+        default_manager_name = "all_objects"
 
     class ApplicantStatus(models.TextChoices):
         PENDING = "PENDING"
@@ -35,6 +119,12 @@ class ApplicantModel(models.Model):
         choices=ApplicantStatus.choices,
         default=ApplicantStatus.PENDING,
     )
+    updated_at = models.DateTimeField(auto_now=True)
+    # Set by a soft delete, see APPLICANT_SOFT_DELETE
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = ApplicantManager()
+    all_objects = ApplicantQuerySet.as_manager()
 
     def __str__(self):
         return f"({self.uuid}) {self.first_name} {self.last_name}"
@@ -49,6 +139,13 @@ class NoteModel(models.Model):
             ("view_note", "Can view one or many applicants"),
             ("create_note", "Can create applicants"),
         ]
+        indexes = [
+            # Newest-first timeline of an applicant's notes
+            models.Index(
+                fields=["applicant", "-created_at", "-id"],
+                name="note_applicant_timeline_idx",
+            ),
+        ]
 
     uuid = models.UUIDField(
         db_index=True,
@@ -57,9 +154,150 @@ class NoteModel(models.Model):
         unique=True,
     )
 
-    applicant = models.ForeignKey(ApplicantModel, on_delete=models.CASCADE)
+    # Notes are deleted by the ON DELETE CASCADE of the foreign key (see
+    # migration 0008), so deleting an applicant never loads its notes. No
+    # note signals are sent for those deletes, the api.E001 check fails
+    # once NoteModel has delete receivers.
+    applicant = models.ForeignKey(ApplicantModel, on_delete=models.DO_NOTHING)
     title = models.CharField(max_length=64)
     content = models.TextField()
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.applicant.full_name} - {self.title}"
+
+
+class ApplicantCounterModel(models.Model):
+    """
+    Number of applicants per status and per state, kept up to date by
+    api.counters in the same transaction as the change being counted
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dimension", "value"], name="applicant_counter_bucket"
+            ),
+        ]
+
+    class Dimension(models.TextChoices):
+        STATUS = "status"
+        STATE = "state"
+
+    dimension = models.CharField(max_length=16, choices=Dimension.choices)
+    value = models.CharField(max_length=50)
+    count = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.dimension}={self.value}: {self.count}"
+
+
+class ApplicantImportModel(models.Model):
+    """
+    Outcome of a CSV import of applicants. Rejected rows are kept as
+    ApplicantImportErrorModels for the error report.
+    """
+
+    uuid = models.UUIDField(
+        db_index=True,
+        default=uuid4,
+        editable=False,
+        unique=True,
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, on_delete=models.SET_NULL
+    )
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    rows = models.PositiveIntegerField(default=0)
+    imported = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"({self.uuid}) {self.imported}/{self.rows} imported"
+
+
+class ApplicantImportErrorModel(models.Model):
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["applicant_import", "line"], name="applicant_import_line_idx"
+            ),
+        ]
+
+    applicant_import = models.ForeignKey(
+        ApplicantImportModel, related_name="errors", on_delete=models.CASCADE
+    )
+    # Line of the CSV file the row ended on, the header is line 1
+    line = models.PositiveIntegerField()
+    row = models.JSONField()
+    errors = models.JSONField()
+
+    def __str__(self):
+        return f"{self.applicant_import} - line {self.line}"
+
+
+class ApplicantChangeModel(models.Model):
+    """
+    Change feed of applicants, written by database triggers (see migration
+    0009) whenever an applicant is created, changes status or is deleted,
+    or gets a note. The id is the event id of the stream in api.changes.
+    """
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="applicant_change_created_idx"),
+        ]
+
+    class Kind(models.TextChoices):
+        CREATED = "created"
+        STATUS = "status"
+        DELETED = "deleted"
+        NOTE = "note"
+
+    kind = models.CharField(max_length=8, choices=Kind.choices)
+    # Not a foreign key, deleted applicants keep their events
+    applicant_id = models.BigIntegerField()
+    data = models.JSONField(default=dict)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    def __str__(self):
+        return f"{self.id} {self.kind} {self.applicant_id}"
+
+
+class OutboxModel(models.Model):
+    """
+    Webhook event waiting to be sent to one endpoint, written by api.outbox
+    in the transaction of the change it announces and deleted once the
+    dispatchoutbox command delivered it
+    """
+
+    class Meta:
+        indexes = [
+            # Rows the dispatcher claims, in the order it claims them
+            models.Index(
+                fields=["next_attempt_at", "id"],
+                condition=models.Q(failed_at__isnull=True),
+                name="outbox_due_idx",
+            ),
+            # Older rows of an endpoint that hold back its newer ones
+            models.Index(
+                fields=["endpoint", "id"],
+                condition=models.Q(failed_at__isnull=True),
+                name="outbox_endpoint_idx",
+            ),
+        ]
+
+    endpoint = models.URLField(max_length=2048)
+    event = models.CharField(max_length=64)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    # Set once delivery was given up, see dispatchoutbox --retry-failed
+    failed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.id} {self.event} -> {self.endpoint}"
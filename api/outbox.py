@@ -0,0 +1,277 @@
+import random
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, Min, OuterRef
+from django.utils import timezone
+
+from api.models import OutboxModel
+from api.renderers import ORJSONRenderer
+from api.serializers import ApplicantSerializer
+
+APPLICANT_CREATED = "applicant.created"
+APPLICANT_STATUS_CHANGED = "applicant.status_changed"
+APPLICANT_DELETED = "applicant.deleted"
+NOTE_CREATED = "note.created"
+
+# Seconds before the first retry of a failed delivery, doubled for every
+# further attempt up to RETRY_MAX_DELAY
+RETRY_BASE_DELAY = 5
+RETRY_MAX_DELAY = 60 * 60
+# Seconds a round may overrun timeout * concurrency before its rows are
+# due again and another dispatcher may send them a second time
+LEASE_MARGIN = 60
+# Characters of a delivery error kept in last_error
+MAX_ERROR_LENGTH = 1000
+
+json_renderer = ORJSONRenderer()
+
+
+def queue_events(events):
+    """
+    Queue (event, payload) pairs for every endpoint of WEBHOOK_ENDPOINTS
+    with a single INSERT. Must be called inside the transaction that made
+    the change, so events are sent if and only if it commits.
+    """
+    endpoints = settings.WEBHOOK_ENDPOINTS
+    if not endpoints or not events:
+        return
+    now = timezone.now()
+    OutboxModel.objects.bulk_create(
+        [
+            OutboxModel(
+                endpoint=endpoint,
+                event=event,
+                payload=payload,
+                created_at=now,
+                next_attempt_at=now,
+            )
+            for endpoint in endpoints
+            for event, payload in events
+        ]
+    )
+
+
+def queue_created(applicants):
+    queue_events(
+        [
+            (APPLICANT_CREATED, ApplicantSerializer(applicant).data)
+            for applicant in applicants
+        ]
+    )
+
+
+def queue_status_changes(changes, status):
+    """
+    Queue a status change for every (id, previous status) of changes
+    """
+    queue_events(
+        [
+            (
+                APPLICANT_STATUS_CHANGED,
+                {"applicant": id, "status": status, "previous": previous},
+            )
+            for id, previous in changes
+        ]
+    )
+
+
+def queue_deleted(applicants):
+    queue_events(
+        [(APPLICANT_DELETED, {"applicant": applicant.id}) for applicant in applicants]
+    )
+
+
+def queue_note_created(note):
+    queue_events(
+        [
+            (
+                NOTE_CREATED,
+                {"applicant": note.applicant_id, "note": note.id, "title": note.title},
+            )
+        ]
+    )
+
+
+def post_events(endpoint, rows, timeout):
+    """
+    POST rows to endpoint as `{"events": [...]}`, raising on any error or
+    non-2xx response
+    """
+    body = json_renderer.render(
+        {
+            "events": [
+                {
+                    "id": row.id,
+                    "event": row.event,
+                    "created_at": row.created_at,
+                    "data": row.payload,
+                }
+                for row in rows
+            ]
+        }
+    )
+    request = urllib.request.Request(
+        endpoint,
+        data=body,
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+
+
+def retry_delay(attempts):
+    """
+    Seconds to wait after the given number of failed attempts, with jitter
+    so endpoints that recover are not hit by every retry at once
+    """
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1)
+
+
+class OutboxDispatcher:
+    """
+    Sends the due rows of OutboxModel to their endpoints.
+
+    Each round claims up to batch_size * concurrency rows with SELECT ...
+    FOR UPDATE SKIP LOCKED, so several dispatchers can run side by side,
+    and leases them in that short transaction. No transaction is open while
+    posting, a second one saves the outcome. The rows of an endpoint
+    are posted in batches of batch_size, one batch after the other, and up
+    to `concurrency` endpoints are posted to at once. Delivered rows are
+    deleted. A failed batch is retried with exponential backoff until
+    max_attempts, and the rows of the endpoint after it wait for that retry
+    without using up attempts of their own. An endpoint gets its rows in
+    id order: rows are only claimed while no older row of their endpoint is
+    waiting or leased. Rows given up on no longer hold the others back.
+    """
+
+    def __init__(self, batch_size=100, concurrency=4, timeout=10, max_attempts=10):
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+
+    def dispatch(self):
+        """
+        Run one round, returns the number of rows delivered and failed
+        """
+        rows = self.claim()
+        if not rows:
+            return 0, 0
+        rows.sort(key=lambda row: (row.endpoint, row.id))
+        endpoints = [
+            (endpoint, list(group))
+            for endpoint, group in groupby(rows, key=lambda row: row.endpoint)
+        ]
+        with ThreadPoolExecutor(self.concurrency) as pool:
+            outcomes = list(pool.map(lambda args: self.send(*args), endpoints))
+
+        delivered = [row.id for sent, _, _, _ in outcomes for row in sent]
+        failed = [outcome[1:] for outcome in outcomes if outcome[3]]
+        with transaction.atomic():
+            OutboxModel.objects.filter(id__in=delivered).delete()
+            self.record_failures(failed)
+        return len(delivered), sum(len(batch) + len(held) for batch, held, _ in failed)
+
+    def claim(self):
+        """
+        Helper method to lease the due rows of a round to this dispatcher.
+        Pushing next_attempt_at past the longest the round can take hides
+        them from other dispatchers without holding locks while posting.
+        Rows of a dispatcher that died are due again once the lease ends.
+        """
+        now = timezone.now()
+        lease = self.timeout * self.concurrency + LEASE_MARGIN
+        pending = OutboxModel.objects.filter(
+            failed_at=None, endpoint=OuterRef("endpoint"), id__lt=OuterRef("id")
+        )
+        with transaction.atomic():
+            rows = list(
+                OutboxModel.objects.filter(failed_at=None, next_attempt_at__lte=now)
+                .exclude(Exists(pending.filter(next_attempt_at__gt=now)))
+                .order_by("next_attempt_at", "id")
+                .select_for_update(skip_locked=True)[
+                    : self.batch_size * self.concurrency
+                ]
+            )
+            rows = self.in_order(rows)
+            OutboxModel.objects.filter(id__in=[row.id for row in rows]).update(
+                next_attempt_at=now + timedelta(seconds=lease)
+            )
+        return rows
+
+    def in_order(self, rows):
+        """
+        Helper method to drop the claimed rows that have an older row of
+        their endpoint left out of the claim, such as one another dispatcher
+        just locked or one past the claim limit
+        """
+        older = dict(
+            OutboxModel.objects.filter(
+                failed_at=None, endpoint__in={row.endpoint for row in rows}
+            )
+            .exclude(id__in=[row.id for row in rows])
+            .values("endpoint")
+            .annotate(first=Min("id"))
+            .values_list("endpoint", "first")
+        )
+        return [row for row in rows if row.id < older.get(row.endpoint, row.id + 1)]
+
+    def send(self, endpoint, rows):
+        """
+        Helper method to post the rows of one endpoint in batches, stopping
+        at the first failure. Returns the rows sent, the batch that failed,
+        the rows held back after it and the error. Runs on a pool thread,
+        so it does not use the database
+        """
+        for start in range(0, len(rows), self.batch_size):
+            end = start + self.batch_size
+            try:
+                post_events(endpoint, rows[start:end], self.timeout)
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                return rows[:start], rows[start:end], rows[end:], error
+        return rows, [], [], None
+
+    def record_failures(self, failed):
+        """
+        Helper method to schedule the retry of each (batch, held back rows,
+        error) of failed, or give up on the rows of the batch that reached
+        max_attempts. Held back rows were not posted, so they keep their
+        attempts and are due together with the retry of their batch.
+        """
+        now = timezone.now()
+        changed = []
+        for batch, held, error in failed:
+            retry_at = now
+            for row in batch:
+                row.attempts += 1
+                row.last_error = error[:MAX_ERROR_LENGTH]
+                if row.attempts >= self.max_attempts:
+                    row.failed_at = now
+                else:
+                    row.next_attempt_at = now + timedelta(
+                        seconds=retry_delay(row.attempts)
+                    )
+                    retry_at = max(retry_at, row.next_attempt_at)
+            for row in held:
+                row.next_attempt_at = retry_at
+            changed += batch + held
+        OutboxModel.objects.bulk_update(
+            changed, ["attempts", "last_error", "failed_at", "next_attempt_at"]
+        )
+
+
+def requeue_failed():
+    """
+    Queue the rows that were given up on again, returns how many
+    """
+    return OutboxModel.objects.exclude(failed_at=None).update(
+        failed_at=None, attempts=0, next_attempt_at=timezone.now()
+    )
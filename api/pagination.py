@@ -0,0 +1,50 @@
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+class ApplicantCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the ApplicantModel primary key. Pages are fetched
+    with `WHERE id > <cursor> ORDER BY id LIMIT <page_size + 1>`, so neither a
+    COUNT(*) nor an OFFSET scan is needed and every page costs the same.
+    """
+
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def decode_cursor(self, request):
+        """
+        Reject cursors whose position is not a valid primary key instead of
+        letting the lookup fail in the database layer
+        """
+        cursor = super().decode_cursor(request)
+        if cursor is not None and cursor.position is not None:
+            if not cursor.position.isdigit():
+                raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+
+class NoteCursorPagination(CursorPagination):
+    """
+    Newest-first pagination of an applicant's notes, served by a range scan
+    of the (applicant, -created_at, -id) index. Notes sharing a created_at
+    are told apart by the cursor offset.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def decode_cursor(self, request):
+        """
+        Reject cursors whose position is not a valid timestamp
+        """
+        cursor = super().decode_cursor(request)
+        if cursor is not None and cursor.position is not None:
+            if parse_datetime(cursor.position) is None:
+                raise NotFound(self.invalid_cursor_message)
+        return cursor
@@ -1,17 +1,147 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
 from rest_framework import permissions
 
+# Seconds a resolved permission set stays cached. Entries are keyed by
+# version, so this only bounds how long superseded entries linger.
+PERMISSION_CACHE_TIMEOUT = 60 * 60
+
+GLOBAL_PERMISSION_VERSION_KEY = "api:perm-version"
+
+
+def user_permission_version_key(user_id):
+    return f"api:perm-version:{user_id}"
+
+
+def seeded_versions(keys):
+    """
+    Return the versions stored under `keys`, in order
+    """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seed missing versions from the clock so a version lost to
+            # eviction never comes back equal to a value it had before
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def join_versions(global_version, user_version):
+    return f"{global_version}.{user_version}"
+
+
+def get_permission_version(user_id):
+    """
+    Return the permission version of the user with the given id. It combines
+    a global version, bumped when group permissions change, with a per-user
+    version, bumped when the user or their memberships change.
+    """
+    keys = [GLOBAL_PERMISSION_VERSION_KEY, user_permission_version_key(user_id)]
+    return join_versions(*seeded_versions(keys))
+
+
+def get_user_permission_version(user_id):
+    """
+    Return only the per-user part of the permission version
+    """
+    return seeded_versions([user_permission_version_key(user_id)])[0]
+
+
+def permission_cache_key(user_id, version=None):
+    if version is None:
+        version = get_permission_version(user_id)
+    return f"api:perms:{user_id}:{version}"
+
+
+def increment_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # No version was ever handed out, so nothing is cached under it
+        pass
+
+
+def bump_permission_version(user_id=None):
+    """
+    Invalidate the cached permissions of one user, or of every user when no
+    id is given. The version is bumped at once, so the writing transaction
+    reads its own change, and again on commit: until then a concurrent
+    request still loads the committed permissions and may cache them under
+    the first new version.
+    """
+    if user_id is None:
+        key = GLOBAL_PERMISSION_VERSION_KEY
+    else:
+        key = user_permission_version_key(user_id)
+    increment_version(key)
+    transaction.on_commit(lambda: increment_version(key))
+
+
+def get_cached_permissions(user, key=None):
+    """
+    Return the active/staff/superuser flags and the full permission set of the
+    user, loading them from the database only when the cache has no entry
+    for the user's current permission version. Users built by
+    SignedTokenAuthentication carry the entry it already read.
+    """
+    entry = getattr(user, "permission_entry", None)
+    if entry is not None:
+        return entry
+    key = key or permission_cache_key(user.pk)
+    entry = cache.get(key)
+    if entry is None:
+        # ModelBackend memoizes permissions on the user object, which may
+        # predate the change that produced the new version
+        for attr in ("_perm_cache", "_user_perm_cache", "_group_perm_cache"):
+            user.__dict__.pop(attr, None)
+        entry = {
+            "is_active": user.is_active,
+            "is_staff": user.is_staff,
+            "is_superuser": user.is_superuser,
+            "permissions": frozenset(user.get_all_permissions()),
+        }
+        cache.set(key, entry, PERMISSION_CACHE_TIMEOUT)
+    return entry
+
+
+def has_cached_perm(user, perm):
+    """
+    Cached equivalent of User.has_perm for the ModelBackend
+    """
+    if not user or not user.is_authenticated:
+        return False
+    entry = get_cached_permissions(user)
+    if not entry["is_active"]:
+        return False
+    return entry["is_superuser"] or perm in entry["permissions"]
+
+
+async def ahas_cached_perm(user, perm):
+    """
+    Async variant of has_cached_perm. A cache miss loads the permissions
+    from the database, so the check runs in the request's sync thread unless
+    the user already carries its permission entry.
+    """
+    if getattr(user, "permission_entry", None) is not None:
+        return has_cached_perm(user, perm)
+    return await sync_to_async(has_cached_perm)(user, perm)
+
 
 class ApplicantPermissions(permissions.BasePermission):
     def has_permission(self, request, _):
         match request.method:
             case "GET":
-                return request.user.has_perm("api.view_applicant")
+                return has_cached_perm(request.user, "api.view_applicant")
             case "POST":
-                return request.user.has_perm("api.create_applicant")
+                return has_cached_perm(request.user, "api.create_applicant")
             case "PUT":
-                return request.user.has_perm("api.update_applicant")
+                return has_cached_perm(request.user, "api.update_applicant")
             case "DELETE":
-                return request.user.has_perm("api.delete_applicant")
+                return has_cached_perm(request.user, "api.delete_applicant")
             case _:
                 return False
 
@@ -20,8 +150,8 @@ class NotePermissions(permissions.BasePermission):
     def has_permission(self, request, _):
         match request.method:
             case "GET":
-                return request.user.has_perm("api.view_note")
+                return has_cached_perm(request.user, "api.view_note")
             case "POST":
-                return request.user.has_perm("api.create_note")
+                return has_cached_perm(request.user, "api.create_note")
             case _:
                 return False
@@ -0,0 +1,101 @@
+import csv
+import json
+
+import orjson
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+from api.streams import Echo
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer backed by orjson, several times faster than the stdlib json
+    module. UUIDs and datetimes are serialized natively, anything else orjson
+    does not support goes through DRF's JSONEncoder. Output is always compact
+    UTF-8, or indented by two spaces whenever an indent is requested.
+    """
+
+    default = encoders.JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=self.default, option=option)
+
+
+class StreamingRenderer(renderers.BaseRenderer):
+    """
+    Base class for renderers that can emit an iterable of rows incrementally.
+    Rows are buffered into chunks of `rows_per_chunk` before being yielded so
+    the WSGI server is not handed one tiny write per row.
+    """
+
+    rows_per_chunk = 500
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows else []
+        return b"".join(self.stream(rows, fields))
+
+    def stream(self, rows, fields):
+        """
+        Yield the encoded representation of `rows` in chunks
+        """
+        chunk = [self.render_header(fields)]
+        for row in rows:
+            chunk.append(self.render_row(row, fields))
+            if len(chunk) >= self.rows_per_chunk:
+                yield "".join(chunk).encode(self.charset)
+                chunk = []
+        if chunk:
+            yield "".join(chunk).encode(self.charset)
+
+    def render_header(self, fields):
+        return ""
+
+    def render_row(self, row, fields):
+        raise NotImplementedError("StreamingRenderer requires .render_row()")
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """
+    Renders one compact JSON document per line
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render_row(self, row, fields):
+        return (
+            json.dumps(
+                row,
+                cls=encoders.JSONEncoder,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            + "\n"
+        )
+
+
+class CSVRenderer(StreamingRenderer):
+    """
+    Renders rows as CSV with a header line built from the field names
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+
+    def __init__(self):
+        self.writer = csv.writer(Echo())
+
+    def render_header(self, fields):
+        return self.writer.writerow(fields)
+
+    def render_row(self, row, fields):
+        return self.writer.writerow([row.get(field) for field in fields])
@@ -0,0 +1,88 @@
+from django.db import connection
+
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=20, MinWords=5"
+
+APPLICANT_MATCHES = """
+    SELECT a.id AS applicant_id,
+           ts_rank(a.search_vector, query.q) AS rank,
+           NULL::bigint AS note_id
+    FROM api_applicantmodel a, query
+    WHERE a.search_vector @@ query.q
+"""
+
+NOTE_MATCHES = """
+    SELECT n.applicant_id,
+           ts_rank(n.search_vector, query.q) AS rank,
+           n.id AS note_id
+    FROM api_notemodel n, query
+    WHERE n.search_vector @@ query.q
+"""
+
+SEARCH_SQL = """
+WITH query AS (SELECT websearch_to_tsquery('english', %(query)s) AS q),
+matches AS ({matches}),
+best AS (
+    SELECT DISTINCT ON (applicant_id) applicant_id, rank, note_id
+    FROM matches
+    WHERE NOT EXISTS (
+        SELECT 1 FROM api_applicantmodel d
+        WHERE d.id = matches.applicant_id AND d.deleted_at IS NOT NULL
+    )
+    ORDER BY applicant_id, rank DESC
+),
+top AS (
+    SELECT * FROM best ORDER BY rank DESC, applicant_id LIMIT %(limit)s
+)
+SELECT top.applicant_id,
+       top.rank,
+       top.note_id,
+       CASE
+           WHEN top.note_id IS NULL THEN ts_headline(
+               'english',
+               concat_ws(
+                   ' ', a.first_name, a.last_name, a.email,
+                   a.address, a.zip_code, a.state
+               ),
+               query.q,
+               %(options)s
+           )
+           ELSE ts_headline(
+               'english', concat_ws(' ', n.title, n.content), query.q, %(options)s
+           )
+       END AS snippet
+FROM top
+CROSS JOIN query
+JOIN api_applicantmodel a ON a.id = top.applicant_id
+LEFT JOIN api_notemodel n ON n.id = top.note_id
+ORDER BY top.rank DESC, top.applicant_id
+"""
+
+
+def search_applicants(query, limit=20, include_notes=True):
+    """
+    Full-text search applicants, and optionally their notes, through the
+    trigger-maintained search_vector columns and their GIN indexes.
+
+    Returns one result per matching applicant, best match first, with the
+    rank and a highlighted snippet of its best matching record. `note` is
+    the id of that note, or None when the applicant itself matched best.
+    Snippets are only built for the rows that make the limit.
+    """
+    matches = APPLICANT_MATCHES
+    if include_notes:
+        matches += " UNION ALL " + NOTE_MATCHES
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            SEARCH_SQL.format(matches=matches),
+            {"query": query, "limit": limit, "options": HEADLINE_OPTIONS},
+        )
+        return [
+            {
+                "applicant": applicant_id,
+                "rank": rank,
+                "note": note_id,
+                "snippet": snippet,
+            }
+            for applicant_id, rank, note_id, snippet in cursor.fetchall()
+        ]
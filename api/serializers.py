@@ -1,15 +1,406 @@
-from rest_framework import serializers
+from functools import partial
 
-from api.models import ApplicantModel, NoteModel
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
+from api.models import ApplicantChangeModel, ApplicantModel, NoteModel
+from api.timing import timed
 
-class ApplicantSerializer(serializers.ModelSerializer):
+# Fields a client may set when creating an applicant
+APPLICANT_CREATE_FIELDS = (
+    "first_name",
+    "last_name",
+    "email",
+    "phone_number",
+    "address",
+    "zip_code",
+    "state",
+)
+
+
+class TimedSerializerMixin:
+    """
+    Adds the validation and representation of a serializer to the serialize
+    phase of sampled requests, see api.timing
+    """
+
+    def is_valid(self, *args, **kwargs):
+        with timed("serialize"):
+            return super().is_valid(*args, **kwargs)
+
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
+
+
+class ApplicantSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ApplicantModel
-        fields = "__all__"
+        # deleted_at is internal to soft deletes, hidden applicants are never
+        # serialized
+        exclude = ["deleted_at"]
+
 
+class ApplicantBulkSerializer(ApplicantSerializer):
+    """
+    ApplicantSerializer without the per-row UniqueValidator on email, the
+    bulk create view checks uniqueness for the whole batch in one query
+    """
+
+    class Meta(ApplicantSerializer.Meta):
+        extra_kwargs = {"email": {"validators": []}}
+
+
+class NoteSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    # Soft-deleted applicants can not be given new notes
+    applicant = serializers.PrimaryKeyRelatedField(
+        queryset=ApplicantModel.objects.all()
+    )
 
-class NoteSerializer(serializers.ModelSerializer):
     class Meta:
         model = NoteModel
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+
+
+class ApplicantStatusFilterSerializer(serializers.Serializer):
+    state = serializers.CharField(max_length=50, required=False)
+    status = serializers.ChoiceField(
+        choices=ApplicantModel.ApplicantStatus.choices, required=False
+    )
+
+
+class ApplicantStatusTransitionSerializer(TimedSerializerMixin, serializers.Serializer):
+    """
+    Target status for a set of applicants selected by id, by filter or by
+    both. At least one selector is required so a request cannot update the
+    whole table by accident
+    """
+
+    status = serializers.ChoiceField(choices=ApplicantModel.ApplicantStatus.choices)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=10000,
+        required=False,
+    )
+    filter = ApplicantStatusFilterSerializer(required=False)
+
+    def validate(self, attrs):
+        if not attrs.get("ids") and not attrs.get("filter"):
+            raise serializers.ValidationError("Either ids or filter is required")
+        return attrs
+
+
+class ApplicantFilterSerializer(serializers.Serializer):
+    """
+    Query parameters accepted by the applicant list and export. Each filter
+    is backed by an index, see ApplicantModel.Meta.indexes
+    """
+
+    status = serializers.ChoiceField(
+        choices=ApplicantModel.ApplicantStatus.choices, required=False
+    )
+    state = serializers.CharField(max_length=50, required=False)
+    zip_code = serializers.CharField(max_length=20, required=False)
+    email = serializers.CharField(max_length=256, required=False)
+
+    def filter_queryset(self, queryset):
+        filters = dict(self.validated_data)
+        if "email" in filters:
+            filters["email__startswith"] = filters.pop("email")
+        return queryset.filter(**filters)
+
+
+class ApplicantSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=256)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class ChangeFeedSerializer(serializers.Serializer):
+    """
+    Query parameters of the change feed. `last_event_id` is also read from
+    the Last-Event-ID header EventSource sends when it reconnects
+    """
+
+    events = serializers.CharField(max_length=64, required=False)
+    last_event_id = serializers.IntegerField(min_value=0, required=False)
+
+    def validate_events(self, value):
+        kinds = {kind.strip() for kind in value.split(",") if kind.strip()}
+        unknown = kinds - set(ApplicantChangeModel.Kind.values)
+        if not kinds or unknown:
+            raise serializers.ValidationError(
+                f"Choose from: {', '.join(ApplicantChangeModel.Kind.values)}"
+            )
+        return kinds
+
+
+class TokenObtainSerializer(serializers.Serializer):
+    """
+    Credentials exchanged for a signed API token. The authenticated user is
+    in validated_data["user"]
+    """
+
+    username = serializers.CharField(max_length=150)
+    password = serializers.CharField(max_length=128, trim_whitespace=False)
+
+    def validate(self, attrs):
+        user = authenticate(
+            self.context.get("request"),
+            username=attrs["username"],
+            password=attrs["password"],
+        )
+        if user is None:
+            raise serializers.ValidationError(
+                "Unable to log in with provided credentials"
+            )
+        return {"user": user}
+
+
+class SparseFieldsSerializer(serializers.Serializer):
+    """
+    The `fields` query parameter, a comma separated list of the fields a
+    response should carry. Only the fields a FastReadSerializer exposes can
+    be named, so no other column can be read through it
+    """
+
+    fields = serializers.CharField(max_length=1024, required=False)
+
+    def __init__(self, fast_serializer, **kwargs):
+        super().__init__(**kwargs)
+        self.fast_serializer = fast_serializer
+
+    def validate_fields(self, value):
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        if not names:
+            raise serializers.ValidationError("Name at least one field")
+        available = self.fast_serializer.available_fields
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown fields: {', '.join(unknown)}. "
+                f"Available fields: {', '.join(available)}"
+            )
+        return names
+
+    def get_fast_serializer(self):
+        """
+        The fast serializer narrowed to the requested fields, if any
+        """
+        names = self.validated_data.get("fields")
+        if names is None:
+            return self.fast_serializer
+        return self.fast_serializer.only(names)
+
+
+class FastReadSerializer:
+    """
+    Read-only counterpart of a ModelSerializer that builds its output from
+    `.values()` rows instead of model instances. Only the fields that need
+    formatting (datetimes) get a converter, everything else is copied as is,
+    UUIDs included since the renderers write them natively. This produces
+    the same JSON without the per-field attribute lookups of
+    Serializer.to_representation.
+    """
+
+    # Field types whose representation of a database value is the value
+    passthrough_fields = (
+        serializers.BooleanField,
+        serializers.CharField,
+        serializers.ChoiceField,
+        serializers.IntegerField,
+        serializers.PrimaryKeyRelatedField,
+    )
+
+    def __init__(self, serializer_class, virtual_fields=None, selected=None):
+        self.serializer_class = serializer_class
+        # {name: (columns, function)} of fields computed from other columns,
+        # only produced when selected with only(). The functions may only
+        # read columns of passthrough fields named like the column, so they
+        # work the same on `.values()` rows and on serialized payloads.
+        self.virtual_fields = virtual_fields or {}
+        # Names of the fields produced, None for every serializer field
+        self.selected = selected
+        self.projections = {}
+
+    @cached_property
+    def all_fields(self):
+        """
+        (name, column, field) for every serializer field
+        """
+        serializer = self.serializer_class()
+        model = serializer.Meta.model
+        return [
+            (name, model._meta.get_field(field.source).attname, field)
+            for name, field in serializer.fields.items()
+        ]
+
+    @cached_property
+    def fields(self):
+        """
+        (name, column, field) for every serializer field produced
+        """
+        if self.selected is None:
+            return self.all_fields
+        return [field for field in self.all_fields if field[0] in self.selected]
+
+    @cached_property
+    def computed(self):
+        """
+        (name, function) for every virtual field produced
+        """
+        if self.selected is None:
+            return []
+        return [
+            (name, function)
+            for name, (_, function) in self.virtual_fields.items()
+            if name in self.selected
+        ]
+
+    @cached_property
+    def available_fields(self):
+        """
+        Names that can be selected with only()
+        """
+        return [name for name, _, _ in self.all_fields] + list(self.virtual_fields)
+
+    @cached_property
+    def field_names(self):
+        return [name for name, _, _ in self.fields] + [
+            name for name, _ in self.computed
+        ]
+
+    @cached_property
+    def columns(self):
+        """
+        Column names to pass to `.values()`
+        """
+        columns = [column for _, column, _ in self.fields]
+        for name, _ in self.computed:
+            columns += [
+                column
+                for column in self.virtual_fields[name][0]
+                if column not in columns
+            ]
+        return columns
+
+    def columns_with(self, *extra):
+        """
+        columns plus any of the `extra` columns the caller also needs, such
+        as the ordering column of a paginator
+        """
+        return self.columns + [column for column in extra if column not in self.columns]
+
+    @cached_property
+    def etag_parts(self):
+        """
+        Parts of an ETag telling the representations of this projection
+        apart from the full ones
+        """
+        if self.selected is None:
+            return ()
+        # If-None-Match lists ETags separated by commas
+        return ("fields:" + ":".join(self.field_names),)
+
+    def only(self, names):
+        """
+        A FastReadSerializer producing only the fields in `names`, all of
+        which must be in available_fields, that reads only the columns they
+        need. Projections are built once per set of names.
+        """
+        key = frozenset(names)
+        projection = self.projections.get(key)
+        if projection is None:
+            projection = self.projections[key] = FastReadSerializer(
+                self.serializer_class, self.virtual_fields, key
+            )
+        return projection
+
+    def converters(self):
+        """
+        (name, column, converter) for every field, where the converter is
+        None for passthrough fields. The current timezone is resolved here,
+        once per batch, rather than for every datetime value
+        """
+        current_timezone = timezone.get_current_timezone()
+        converters = []
+        for name, column, field in self.fields:
+            if isinstance(field, serializers.UUIDField):
+                # The renderers write UUID objects in the hex_verbose format
+                converter = None if field.uuid_format == "hex_verbose" else str
+            elif isinstance(field, self.passthrough_fields):
+                converter = None
+            elif self.is_iso_datetime(field):
+                converter = partial(iso_datetime, current_timezone)
+            else:
+                converter = field.to_representation
+            converters.append((name, column, converter))
+        return converters
+
+    def is_iso_datetime(self, field):
+        return (
+            isinstance(field, serializers.DateTimeField)
+            and settings.USE_TZ
+            and not hasattr(field, "timezone")
+            and getattr(field, "format", api_settings.DATETIME_FORMAT) == ISO_8601
+        )
+
+    def to_representation(self, row, converters=None):
+        data = {}
+        for name, column, converter in converters or self.converters():
+            value = row[column]
+            if converter is not None and value is not None:
+                value = converter(value)
+            data[name] = value
+        for name, function in self.computed:
+            data[name] = function(row)
+        return data
+
+    def project(self, payload):
+        """
+        Narrow a payload serialized with every field to the fields produced
+        """
+        if self.selected is None:
+            return payload
+        data = {name: payload[name] for name, _, _ in self.fields}
+        for name, function in self.computed:
+            data[name] = function(payload)
+        return data
+
+    def iterate(self, rows):
+        """
+        Lazily serialize an iterable of rows
+        """
+        converters = self.converters()
+        for row in rows:
+            yield self.to_representation(row, converters)
+
+    def many(self, rows):
+        with timed("serialize"):
+            return list(self.iterate(rows))
+
+
+def iso_datetime(current_timezone, value):
+    """
+    DRF's ISO 8601 DateTimeField representation of an aware datetime
+    """
+    value = value.astimezone(current_timezone).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def full_name(row):
+    return f"{row['first_name']} {row['last_name']}"
+
+
+fast_applicant_serializer = FastReadSerializer(
+    ApplicantSerializer,
+    virtual_fields={"full_name": (("first_name", "last_name"), full_name)},
+)
+fast_note_serializer = FastReadSerializer(NoteSerializer)
@@ -0,0 +1,100 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.cache import applicant_cache
+from api.connections import connection_stats
+from api.metrics import DB_CONNECTIONS, count_query
+from api.models import ApplicantModel
+from api.permissions import bump_permission_version
+from api.timing import record_query
+
+M2M_CHANGES = ("post_add", "post_remove", "post_clear")
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_m2m_permissions(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Invalidate cached permissions when a user's permissions or groups change.
+    From the reverse side (permission.user_set, group.user_set) the affected
+    users are in pk_set, except on clear where they are unknown.
+    """
+    if action not in M2M_CHANGES:
+        return
+    if not reverse:
+        bump_permission_version(instance.pk)
+    elif pk_set:
+        for user_id in pk_set:
+            bump_permission_version(user_id)
+    else:
+        bump_permission_version()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(sender, action, **kwargs):
+    """
+    A group permission change can affect any number of users
+    """
+    if action in M2M_CHANGES:
+        bump_permission_version()
+
+
+@receiver(post_save, sender=User)
+def invalidate_saved_user_permissions(sender, instance, update_fields, **kwargs):
+    """
+    is_active and is_superuser are cached along with the permission set.
+    Logins only touch last_login and do not need an invalidation.
+    """
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    bump_permission_version(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user_permissions(sender, instance, **kwargs):
+    bump_permission_version(instance.pk)
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Permission)
+def invalidate_deleted_permissions(sender, **kwargs):
+    bump_permission_version()
+
+
+@receiver(post_save, sender=ApplicantModel)
+@receiver(post_delete, sender=ApplicantModel)
+def evict_cached_applicant(sender, instance, **kwargs):
+    applicant_cache.evict(instance.pk)
+
+
+@receiver(connection_created)
+def count_created_connection(sender, connection, **kwargs):
+    connection_stats.record_created(connection)
+    DB_CONNECTIONS.inc()
+
+
+@receiver(connection_created)
+def install_query_hooks(sender, connection, **kwargs):
+    """
+    Let the middlewares see the queries of every connection, in whichever
+    thread a request runs them. Fired again when a connection reconnects.
+    """
+    for hook in (count_query, record_query):
+        if hook not in connection.execute_wrappers:
+            connection.execute_wrappers.append(hook)
+
+
+@receiver(request_started)
+def count_reused_connections(sender, **kwargs):
+    """
+    Connected after Django's own request_started receiver, so connections
+    past CONN_MAX_AGE or failing their health check are already closed
+    """
+    for connection in connections.all(initialized_only=True):
+        connection_stats.record_request(connection)
@@ -0,0 +1,34 @@
+class Echo:
+    """
+    File-like object whose write() hands the value straight back, so that
+    csv.writer can be used to format a single row at a time
+    """
+
+    def write(self, value):
+        return value
+
+
+class GeneratorReader:
+    """
+    Read-only file-like object over an iterator of text lines, so that
+    cursor.copy_expert can stream rows into COPY without building the whole
+    payload in memory
+    """
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.buffer = b""
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            line = next(self.lines, None)
+            if line is None:
+                break
+            self.buffer += line.encode()
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def readline(self, size=-1):
+        return self.read(size)
@@ -0,0 +1,195 @@
+from unittest import mock
+
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.cache import applicant_cache
+from api.checks import check_token_cache
+from api.models import ApplicantModel
+
+
+class ApiTokenTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        applicant_cache.cache.clear()
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            Permission.objects.filter(codename__in=["view_applicant", "create_note"])
+        )
+        self.applicant = ApplicantModel.objects.create(
+            first_name="Spike",
+            last_name="Spiegel",
+            email="spike.spiegel@bebop.com",
+            phone_number="123-456-7890",
+            address="123 Cowboy Pl",
+            zip_code="10000",
+            state="New York",
+        )
+        self.url = f"/api/applicant/{self.applicant.id}/"
+
+    def obtain(self, username="test_user", password="password"):
+        return self.client.post(
+            "/api/token/", {"username": username, "password": password}, format="json"
+        )
+
+    def authorize(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_obtain_token(self):
+        response = self.obtain()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn("token", response.json())
+        self.assertIn("expires_at", response.json())
+
+    def test_obtain_token_with_wrong_password(self):
+        response = self.obtain(password="wrong")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_token_authenticates_without_database_reads(self):
+        self.authorize(self.obtain().json()["token"])
+        # Warm the permission and applicant caches
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 0)
+
+    def test_token_authentication_costs_two_cache_round_trips(self):
+        self.authorize(self.obtain().json()["token"])
+        self.client.get(self.url)
+        calls = []
+
+        def record(name):
+            method = getattr(cache, name)
+
+            def call(*args, **kwargs):
+                # LocMemCache.get_many calls get, only count the outer call
+                calls.append(name)
+                nested = len(calls)
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    del calls[nested:]
+
+            return call
+
+        with mock.patch.multiple(
+            cache, **{name: record(name) for name in ("get", "get_many", "add")}
+        ):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(calls, ["get_many", "get"])
+
+    def test_token_authenticates_async_views(self):
+        self.authorize(self.obtain().json()["token"])
+
+        response = self.client.get(f"/api/async/applicant/{self.applicant.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_token_user_can_create_notes(self):
+        self.authorize(self.obtain().json()["token"])
+
+        response = self.client.post(
+            f"{self.url}note/", {"title": "Bounty", "content": "Woolong"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_token_checks_permissions(self):
+        self.user.user_permissions.set(Permission.objects.none())
+        self.authorize(self.obtain().json()["token"])
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_token_is_rejected(self):
+        token = self.obtain().json()["token"]
+        self.authorize(token[:-1] + ("A" if token[-1] != "A" else "B"))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["WWW-Authenticate"], 'Bearer realm="api"')
+
+    @override_settings(API_TOKEN_MAX_AGE=60)
+    def test_expired_token_is_rejected(self):
+        token = self.obtain().json()["token"]
+        self.authorize(token)
+
+        with mock.patch("api.tokens.time.time", return_value=10**11):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoked_token_is_rejected(self):
+        token = self.obtain().json()["token"]
+        other = self.obtain().json()["token"]
+        self.authorize(token)
+
+        revoked = self.client.post("/api/token/revoke/")
+        response = self.client.get(self.url)
+        self.authorize(other)
+        still_valid = self.client.get(self.url)
+
+        self.assertEqual(revoked.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(still_valid.status_code, status.HTTP_200_OK)
+
+    def test_revoke_all_tokens(self):
+        token = self.obtain().json()["token"]
+        other = self.obtain().json()["token"]
+        self.authorize(token)
+
+        self.client.post("/api/token/revoke/", {"all": True}, format="json")
+        self.authorize(other)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_token_is_rejected(self):
+        self.authorize(self.obtain().json()["token"])
+        self.client.get(self.url)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoke_requires_token(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post("/api/token/revoke/")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_request_without_credentials_is_forbidden(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_process_local_cache_is_reported(self):
+        local = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        redis = {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://localhost:6379/0",
+        }
+
+        with override_settings(CACHES={"default": local}):
+            self.assertEqual(
+                [warning.id for warning in check_token_cache(None)], ["api.W001"]
+            )
+        with override_settings(CACHES={"default": redis}):
+            self.assertEqual(check_token_cache(None), [])
@@ -1,4 +1,6 @@
 from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -32,8 +34,71 @@ class ApplicantTests(APITestCase):
         self.client.force_authenticate(self.user)
         response = self.client.get("/api/applicant/", format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertGreaterEqual(dict(response.data[0]).items(), self.data.items())
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertGreaterEqual(
+            dict(response.data["results"][0]).items(), self.data.items()
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_list_applicants_follows_next_cursor(self):
+        for i in range(5):
+            ApplicantModel.objects.create(
+                **{**self.data, "email": f"applicant{i}@bebop.com"}
+            )
+
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        ids = []
+        url = "/api/applicant/?page_size=2"
+        while url:
+            response = self.client.get(url, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            ids.extend(applicant["id"] for applicant in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(
+            ids,
+            list(ApplicantModel.objects.order_by("id").values_list("id", flat=True)),
+        )
+
+    def test_list_applicants_does_not_count_or_offset(self):
+        ApplicantModel.objects.create(**self.data)
+
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+        ApplicantModel.objects.create(**{**self.data, "email": "jet@bebop.com"})
+        first_page = self.client.get("/api/applicant/?page_size=1", format="json")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(first_page.data["next"], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["email"], "jet@bebop.com")
+        for query in queries.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"].upper())
+            self.assertNotIn("OFFSET", query["sql"].upper())
+
+    def test_list_applicants_caps_page_size(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/api/applicant/?page_size=100000", format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("LIMIT 1001", queries.captured_queries[-1]["sql"])
+
+    def test_list_applicants_with_invalid_cursor_returns_404(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get("/api/applicant/?cursor=cD1hYmM%3D", format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_create_applicant(self):
         self.user.user_permissions.set([self.create_applicant])
@@ -105,7 +170,7 @@ class ApplicantTests(APITestCase):
         response = self.client.get("/api/applicant/", format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data["results"]), 0)
 
     def test_create_returns_status_code_400_with_invalid_data(self):
         self.user.user_permissions.set([self.create_applicant])
@@ -0,0 +1,103 @@
+import json
+
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import ApplicantModel
+
+
+class ApplicantBulkCreateTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+
+        self.view_applicant = Permission.objects.get(codename="view_applicant")
+        self.create_applicant = Permission.objects.get(codename="create_applicant")
+
+        self.data = {
+            "first_name": "Spike",
+            "last_name": "Spiegel",
+            "email": "spike.spiegel@bebop.com",
+            "phone_number": "123-456-7890",
+            "address": "123 Cowboy Pl",
+            "zip_code": "10000",
+            "state": "New York",
+        }
+
+    def applicants(self, count):
+        return [{**self.data, "email": f"applicant{i}@bebop.com"} for i in range(count)]
+
+    def test_bulk_create_applicants(self):
+        self.user.user_permissions.set([self.create_applicant])
+        self.client.force_authenticate(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/applicant/bulk/", self.applicants(3), format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(ApplicantModel.objects.count(), 3)
+        self.assertEqual(
+            [result["data"]["email"] for result in response.data["results"]],
+            ["applicant0@bebop.com", "applicant1@bebop.com", "applicant2@bebop.com"],
+        )
+        sql = [query["sql"] for query in queries.captured_queries]
+        self.assertEqual(len([q for q in sql if q.startswith("INSERT")]), 1)
+        self.assertEqual(len([q for q in sql if '"email" IN' in q]), 1)
+
+    def test_bulk_create_reports_partial_failures(self):
+        ApplicantModel.objects.create(**{**self.data, "email": "applicant1@bebop.com"})
+
+        self.user.user_permissions.set([self.create_applicant])
+        self.client.force_authenticate(self.user)
+
+        applicants = self.applicants(3)
+        applicants[2]["email"] = "not-an-email"
+        applicants.append({**self.data, "email": "applicant0@bebop.com"})
+        response = self.client.post("/api/applicant/bulk/", applicants, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["failed"], 3)
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            [201, 400, 400, 400],
+        )
+        self.assertIn("email", response.data["results"][1]["errors"])
+        self.assertIn("email", response.data["results"][2]["errors"])
+        self.assertIn("email", response.data["results"][3]["errors"])
+        self.assertEqual(ApplicantModel.objects.count(), 2)
+
+    def test_bulk_create_accepts_ndjson(self):
+        self.user.user_permissions.set([self.create_applicant])
+        self.client.force_authenticate(self.user)
+
+        body = "\n".join(json.dumps(applicant) for applicant in self.applicants(2))
+        response = self.client.post(
+            "/api/applicant/bulk/", body, content_type="application/x-ndjson"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ApplicantModel.objects.count(), 2)
+
+    def test_bulk_create_returns_400_when_not_a_list(self):
+        self.user.user_permissions.set([self.create_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post("/api/applicant/bulk/", self.data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_return_status_403_for_bulk_create_with_incorrect_permission(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(
+            "/api/applicant/bulk/", self.applicants(1), format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,133 @@
+import threading
+
+from django.contrib.auth.models import Permission, User
+from django.core.cache import caches
+from django.db import connection, transaction
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from api.cache import applicant_cache
+from api.models import ApplicantModel
+
+
+class ApplicantCacheTests(APITestCase):
+    def setUp(self):
+        caches["applicants"].clear()
+
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            Permission.objects.filter(
+                codename__in=["view_applicant", "update_applicant", "delete_applicant"]
+            )
+        )
+        self.client.force_authenticate(self.user)
+
+        self.applicant = ApplicantModel.objects.create(
+            first_name="Spike",
+            last_name="Spiegel",
+            email="spike.spiegel@bebop.com",
+            phone_number="123-456-7890",
+            address="123 Cowboy Pl",
+            zip_code="10000",
+            state="New York",
+        )
+        self.url = f"/api/applicant/{self.applicant.id}/"
+
+    def test_hot_read_does_not_query_the_database(self):
+        self.client.get(self.url, format="json")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], "spike.spiegel@bebop.com")
+
+    def test_counts_hits_and_misses(self):
+        before = applicant_cache.stats()
+
+        self.client.get(self.url, format="json")
+        self.client.get(self.url, format="json")
+        self.client.get(self.url, format="json")
+
+        after = applicant_cache.stats()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 2)
+
+    def test_put_evicts_cached_applicant(self):
+        self.client.get(self.url, format="json")
+
+        self.client.put(self.url, {"status": "APPROVED"}, format="json")
+        response = self.client.get(self.url, format="json")
+
+        self.assertEqual(response.data["status"], "APPROVED")
+
+    def test_delete_evicts_cached_applicant(self):
+        self.client.get(self.url, format="json")
+
+        self.client.delete(self.url)
+        response = self.client.get(self.url, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_model_save_evicts_cached_applicant(self):
+        self.client.get(self.url, format="json")
+
+        self.applicant.state = "Mars"
+        self.applicant.save()
+        response = self.client.get(self.url, format="json")
+
+        self.assertEqual(response.data["state"], "Mars")
+
+    def test_bulk_status_update_evicts_cached_applicants(self):
+        self.client.get(self.url, format="json")
+
+        self.client.put(
+            "/api/applicant/status/",
+            {"status": "REJECTED", "filter": {"state": "New York"}},
+            format="json",
+        )
+        response = self.client.get(self.url, format="json")
+
+        self.assertEqual(response.data["status"], "REJECTED")
+
+
+class ApplicantCacheRaceTests(APITransactionTestCase):
+    def setUp(self):
+        caches["applicants"].clear()
+        self.applicant = ApplicantModel.objects.create(
+            first_name="Spike",
+            last_name="Spiegel",
+            email="spike.spiegel@bebop.com",
+            phone_number="123-456-7890",
+            address="123 Cowboy Pl",
+            zip_code="10000",
+            state="New York",
+        )
+
+    def load(self, id):
+        return {"state": ApplicantModel.objects.get(id=id).state}
+
+    def test_reader_cannot_cache_the_row_it_read_before_a_commit(self):
+        def write():
+            try:
+                with transaction.atomic():
+                    applicant = ApplicantModel.objects.get(id=self.applicant.id)
+                    applicant.state = "Mars"
+                    applicant.save()
+            finally:
+                connection.close()
+
+        def load_then_commit(id):
+            # The reader loads the pre-commit row, then the writer commits and
+            # evicts before the reader stores what it loaded
+            payload = self.load(id)
+            writer = threading.Thread(target=write)
+            writer.start()
+            writer.join()
+            return payload
+
+        stale = applicant_cache.get(self.applicant.id, load_then_commit)
+        fresh = applicant_cache.get(self.applicant.id, self.load)
+
+        self.assertEqual(stale, {"state": "New York"})
+        self.assertEqual(fresh, {"state": "Mars"})
@@ -0,0 +1,170 @@
+from io import StringIO
+
+from django.contrib.auth.models import Permission, User
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.checks import check_note_delete_receivers
+from api.counters import find_drift, get_counts, record_created
+from api.models import ApplicantModel, NoteModel
+
+
+class ApplicantDeleteTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            Permission.objects.filter(
+                codename__in=[
+                    "view_applicant",
+                    "create_applicant",
+                    "delete_applicant",
+                    "view_note",
+                    "create_note",
+                ]
+            )
+        )
+        self.client.force_authenticate(self.user)
+
+        self.applicant = ApplicantModel.objects.create(
+            first_name="Spike",
+            last_name="Spiegel",
+            email="spike.spiegel@bebop.com",
+            phone_number="123-456-7890",
+            address="123 Cowboy Pl",
+            zip_code="10000",
+            state="New York",
+        )
+        record_created([self.applicant])
+        NoteModel.objects.bulk_create(
+            NoteModel(applicant=self.applicant, title="Bounty", content=f"Note {index}")
+            for index in range(3)
+        )
+        self.url = f"/api/applicant/{self.applicant.id}/"
+
+    def test_deleted_at_is_not_serialized(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("deleted_at", response.json())
+
+    def test_delete_cascades_in_the_database(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(ApplicantModel.all_objects.filter(id=self.applicant.id))
+        self.assertFalse(NoteModel.objects.exists())
+        self.assertFalse(
+            any(
+                NoteModel._meta.db_table in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
+        self.assertEqual(get_counts()["status"]["PENDING"], 0)
+        self.assertEqual(find_drift(), {})
+
+    def test_note_delete_receivers_are_reported(self):
+        def receiver(sender, instance, **kwargs):
+            pass
+
+        self.assertEqual(check_note_delete_receivers(None), [])
+        post_delete.connect(receiver, sender=NoteModel)
+        self.addCleanup(post_delete.disconnect, receiver, sender=NoteModel)
+
+        self.assertEqual(
+            [error.id for error in check_note_delete_receivers(None)], ["api.E001"]
+        )
+
+    def test_async_delete_cascades_in_the_database(self):
+        response = self.client.delete(f"/api/async/applicant/{self.applicant.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(ApplicantModel.all_objects.exists())
+        self.assertFalse(NoteModel.objects.exists())
+
+    @override_settings(APPLICANT_SOFT_DELETE=True)
+    def test_soft_delete_hides_applicant(self):
+        response = self.client.delete(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIsNotNone(
+            ApplicantModel.all_objects.get(id=self.applicant.id).deleted_at
+        )
+        self.assertEqual(NoteModel.objects.count(), 3)
+        self.assertEqual(
+            self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(self.client.get("/api/applicant/").data["results"], [])
+        for notes_url in (f"{self.url}note/", f"/api/async{self.url[4:]}note/"):
+            self.assertEqual(self.client.get(notes_url).json()["results"], [])
+        self.assertEqual(
+            self.client.get("/api/applicant/search/", {"q": "bounty"}).data["results"],
+            [],
+        )
+        response = self.client.post(
+            f"/api/applicant/{self.applicant.id}/note/",
+            {"title": "Late", "content": "Too late"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_counts()["status"]["PENDING"], 0)
+        self.assertEqual(find_drift(), {})
+
+    @override_settings(APPLICANT_SOFT_DELETE=True)
+    def test_soft_deleted_email_stays_taken(self):
+        self.client.delete(self.url)
+
+        response = self.client.post(
+            "/api/applicant/",
+            {
+                "first_name": "Spike",
+                "last_name": "Spiegel",
+                "email": "spike.spiegel@bebop.com",
+                "phone_number": "123-456-7890",
+                "address": "123 Cowboy Pl",
+                "zip_code": "10000",
+                "state": "New York",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.data)
+
+    @override_settings(APPLICANT_SOFT_DELETE=True)
+    def test_async_soft_delete(self):
+        response = self.client.delete(f"/api/async/applicant/{self.applicant.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(ApplicantModel.objects.exists())
+        self.assertTrue(ApplicantModel.all_objects.exists())
+
+    @override_settings(APPLICANT_SOFT_DELETE=True)
+    def test_purge_removes_soft_deleted_applicants_and_notes(self):
+        kept = ApplicantModel.objects.create(
+            first_name="Jet",
+            last_name="Black",
+            email="jet.black@bebop.com",
+            phone_number="123-456-7890",
+            address="123 Cowboy Pl",
+            zip_code="10000",
+            state="New York",
+        )
+        record_created([kept])
+        NoteModel.objects.create(applicant=kept, title="Kept", content="Kept")
+        self.client.delete(self.url)
+
+        out = StringIO()
+        call_command("purgeapplicants", "--batch-size=1", stdout=out)
+
+        self.assertIn("Purged 1 applicant(s)", out.getvalue())
+        self.assertEqual(list(ApplicantModel.all_objects.all()), [kept])
+        self.assertEqual(
+            list(NoteModel.objects.values_list("title", flat=True)), ["Kept"]
+        )
+        self.assertEqual(find_drift(), {})
@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+
+from django.contrib.auth.models import Permission, User
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import ApplicantModel
+
+
+class ApplicantExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+
+        self.view_applicant = Permission.objects.get(codename="view_applicant")
+        self.create_applicant = Permission.objects.get(codename="create_applicant")
+
+        self.data = {
+            "first_name": "Spike",
+            "last_name": "Spiegel",
+            "email": "spike.spiegel@bebop.com",
+            "phone_number": "123-456-7890",
+            "address": "123 Cowboy Pl",
+            "zip_code": "10000",
+            "state": "New York",
+        }
+
+    def create_applicants(self, count):
+        return [
+            ApplicantModel.objects.create(
+                **{**self.data, "email": f"applicant{i}@bebop.com"}
+            )
+            for i in range(count)
+        ]
+
+    def test_export_ndjson(self):
+        applicants = self.create_applicants(3)
+
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get("/api/applicant/export/?format=ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response["Content-Type"].startswith("application/x-ndjson"))
+
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual([row["id"] for row in rows], [a.id for a in applicants])
+        self.assertEqual(rows[0]["uuid"], str(applicants[0].uuid))
+        self.assertEqual(rows[0]["status"], "PENDING")
+
+    def test_export_csv(self):
+        applicants = self.create_applicants(2)
+
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get("/api/applicant/export/?format=csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([int(row["id"]) for row in rows], [a.id for a in applicants])
+        self.assertEqual(rows[1]["email"], "applicant1@bebop.com")
+
+    def test_export_defaults_to_ndjson(self):
+        self.create_applicants(1)
+
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get("/api/applicant/export/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("application/x-ndjson"))
+
+    def test_export_unknown_format_returns_404(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get("/api/applicant/export/?format=xml")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_return_status_403_for_export_with_incorrect_permission(self):
+        self.user.user_permissions.set([self.create_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get("/api/applicant/export/?format=csv")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
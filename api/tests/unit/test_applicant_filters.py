@@ -0,0 +1,105 @@
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import ApplicantModel
+from api.serializers import ApplicantFilterSerializer
+
+
+class ApplicantFilterTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            [Permission.objects.get(codename="view_applicant")]
+        )
+        self.client.force_authenticate(self.user)
+
+        self.data = {
+            "first_name": "Spike",
+            "last_name": "Spiegel",
+            "phone_number": "123-456-7890",
+            "address": "123 Cowboy Pl",
+            "zip_code": "10000",
+            "state": "New York",
+        }
+        self.spike = ApplicantModel.objects.create(email="spike@bebop.com", **self.data)
+        self.jet = ApplicantModel.objects.create(
+            email="jet@bebop.com", **{**self.data, "state": "Texas"}
+        )
+        self.faye = ApplicantModel.objects.create(
+            email="faye@bebop.com",
+            status="APPROVED",
+            **{**self.data, "state": "Texas", "zip_code": "73301"},
+        )
+
+    def list_ids(self, **params):
+        response = self.client.get("/api/applicant/", params, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [applicant["id"] for applicant in response.data["results"]]
+
+    def test_filter_by_status(self):
+        self.assertEqual(self.list_ids(status="APPROVED"), [self.faye.id])
+
+    def test_filter_by_state_and_status(self):
+        self.assertEqual(self.list_ids(state="Texas", status="PENDING"), [self.jet.id])
+
+    def test_filter_by_zip_code(self):
+        self.assertEqual(self.list_ids(zip_code="73301"), [self.faye.id])
+
+    def test_filter_by_email_prefix(self):
+        self.assertEqual(self.list_ids(email="sp"), [self.spike.id])
+
+    def test_export_is_filtered(self):
+        response = self.client.get("/api/applicant/export/?state=Texas")
+
+        self.assertEqual(
+            len(b"".join(response.streaming_content).decode().splitlines()), 2
+        )
+
+    def test_invalid_status_filter_returns_400(self):
+        response = self.client.get("/api/applicant/?status=BEEF", format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ApplicantFilterIndexTests(APITestCase):
+    """
+    With sequential and bitmap scans priced out, the planner only avoids a
+    Seq Scan when an index can serve the filter and the id ordering
+    """
+
+    def plan(self, **params):
+        filters = ApplicantFilterSerializer(data=params)
+        filters.is_valid(raise_exception=True)
+        queryset = filters.filter_queryset(ApplicantModel.objects.order_by("id"))
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+        return queryset[:101].explain()
+
+    def assertIndexScan(self, plan, index):
+        self.assertNotIn("Seq Scan", plan)
+        self.assertIn(f"Index Scan using {index}", plan)
+
+    def test_status_filter_uses_index(self):
+        self.assertIndexScan(self.plan(status="APPROVED"), "applicant_status_idx")
+
+    def test_pending_state_filter_uses_partial_index(self):
+        self.assertIndexScan(
+            self.plan(state="Texas", status="PENDING"), "applicant_pending_state_idx"
+        )
+
+    def test_state_status_filter_uses_index(self):
+        self.assertIndexScan(
+            self.plan(state="Texas", status="REJECTED"), "applicant_state_status_idx"
+        )
+
+    def test_zip_code_filter_uses_index(self):
+        self.assertIndexScan(self.plan(zip_code="73301"), "applicant_zip_code_idx")
+
+    def test_email_prefix_filter_uses_index(self):
+        plan = self.plan(email="spike")
+
+        self.assertNotIn("Seq Scan", plan)
+        self.assertIn("_like", plan)
@@ -0,0 +1,166 @@
+import csv
+import io
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import Permission, User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.counters import find_drift, rebuild_counters
+from api.imports import ApplicantImporter
+from api.models import ApplicantImportModel, ApplicantModel
+
+HEADER = "first_name,last_name,email,phone_number,address,zip_code,state\n"
+
+
+class ApplicantImportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+
+        self.view_applicant = Permission.objects.get(codename="view_applicant")
+        self.create_applicant = Permission.objects.get(codename="create_applicant")
+
+        self.data = {
+            "first_name": "Spike",
+            "last_name": "Spiegel",
+            "email": "spike.spiegel@bebop.com",
+            "phone_number": "123-456-7890",
+            "address": "123 Cowboy Pl",
+            "zip_code": "10000",
+            "state": "New York",
+        }
+
+    def make_csv(self, *emails):
+        lines = [
+            f'Jet,Black,{email},123-456-7890,"1 Bebop Ave, Mars",20000,Texas\n'
+            for email in emails
+        ]
+        return HEADER + "".join(lines)
+
+    def post_csv(self, body):
+        return self.client.post(
+            "/api/applicant/import/", data=body, content_type="text/csv"
+        )
+
+    def read_report(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = b"".join(response.streaming_content).decode()
+        return list(csv.DictReader(io.StringIO(body)))
+
+    def test_import_csv(self):
+        ApplicantModel.objects.create(**self.data)
+        rebuild_counters()
+
+        self.user.user_permissions.set([self.view_applicant, self.create_applicant])
+        self.client.force_authenticate(self.user)
+        response = self.post_csv(
+            self.make_csv(
+                "jet@bebop.com",
+                "not-an-email",
+                "faye@bebop.com",
+                "jet@bebop.com",
+                self.data["email"],
+            )
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            {key: response.data[key] for key in ("rows", "imported", "rejected")},
+            {"rows": 5, "imported": 2, "rejected": 3},
+        )
+        jet = ApplicantModel.objects.get(email="jet@bebop.com")
+        self.assertEqual(jet.address, "1 Bebop Ave, Mars")
+        self.assertEqual(jet.status, "PENDING")
+        self.assertEqual(find_drift(), {})
+
+        report = self.read_report(response.data["errors"])
+        self.assertEqual([row["line"] for row in report], ["3", "5", "6"])
+        self.assertEqual(report[0]["email"], "not-an-email")
+        self.assertIn("email: Enter a valid email address.", report[0]["errors"])
+        self.assertIn("already exists", report[1]["errors"])
+        self.assertIn("already exists", report[2]["errors"])
+
+    def test_invalid_row_does_not_take_its_email(self):
+        body = self.make_csv("jet@bebop.com", "jet@bebop.com").replace(
+            "Jet,Black,jet", ",Black,jet", 1
+        )
+
+        applicant_import = ApplicantImporter().run(io.BytesIO(body.encode()))
+
+        # The invalid first line does not take the email from the second
+        self.assertEqual(
+            (
+                applicant_import.rows,
+                applicant_import.imported,
+                applicant_import.rejected,
+            ),
+            (2, 1, 1),
+        )
+        error = applicant_import.errors.get()
+        self.assertEqual(error.line, 2)
+        self.assertEqual(error.row["first_name"], None)
+        self.assertIn("first_name", error.errors)
+
+    def test_import_multipart_upload(self):
+        self.user.user_permissions.set([self.create_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(
+            "/api/applicant/import/",
+            {
+                "file": SimpleUploadedFile(
+                    "applicants.csv",
+                    ("﻿" + self.make_csv("jet@bebop.com")).encode(),
+                    content_type="text/csv",
+                )
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["imported"], 1)
+        self.assertEqual(
+            ApplicantImportModel.objects.get(uuid=response.data["id"]).created_by,
+            self.user,
+        )
+
+    def test_import_missing_columns(self):
+        self.user.user_permissions.set([self.create_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.post_csv("first_name,last_name\nJet,Black\n")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", str(response.data["file"]))
+        self.assertFalse(ApplicantImportModel.objects.exists())
+
+    def test_import_without_permission(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.post_csv(self.make_csv("jet@bebop.com"))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(ApplicantModel.objects.exists())
+
+    def test_import_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "applicants.csv")
+            errors = os.path.join(directory, "errors.csv")
+            with open(path, "w") as file:
+                file.write(self.make_csv("jet@bebop.com", "jet@bebop.com"))
+
+            call_command(
+                "importapplicants", path, f"--errors={errors}", stdout=StringIO()
+            )
+
+            with open(errors) as file:
+                report = list(csv.DictReader(file))
+
+        self.assertEqual(ApplicantModel.objects.count(), 1)
+        self.assertEqual([row["line"] for row in report], ["3"])
@@ -0,0 +1,130 @@
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import ApplicantModel, NoteModel
+
+
+class ApplicantSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+
+        self.view_applicant = Permission.objects.get(codename="view_applicant")
+        self.view_note = Permission.objects.get(codename="view_note")
+
+        self.spike = ApplicantModel.objects.create(
+            first_name="Spike",
+            last_name="Spiegel",
+            email="spike.spiegel@bebop.com",
+            phone_number="123-456-7890",
+            address="123 Cowboy Pl",
+            zip_code="10000",
+            state="New York",
+        )
+        self.faye = ApplicantModel.objects.create(
+            first_name="Faye",
+            last_name="Valentine",
+            email="faye@bebop.com",
+            phone_number="555-0000",
+            address="Hangar 2",
+            zip_code="20000",
+            state="Texas",
+        )
+        self.note = NoteModel.objects.create(
+            applicant=self.faye,
+            title="Phone screen",
+            content="Strong background in bounty hunting and gambling",
+        )
+
+    def search(self, query, **params):
+        return self.client.get(
+            "/api/applicant/search/", {"q": query, **params}, format="json"
+        )
+
+    def test_search_by_name(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.search("spiegel")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        result = response.data["results"][0]
+        self.assertEqual(result["applicant"], self.spike.id)
+        self.assertIsNone(result["note"])
+        self.assertIn("<b>Spiegel</b>", result["snippet"])
+
+    def test_search_by_email_and_state(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        by_email = self.search("faye@bebop.com")
+        by_state = self.search("texas")
+
+        self.assertEqual(
+            [r["applicant"] for r in by_email.data["results"]], [self.faye.id]
+        )
+        self.assertEqual(
+            [r["applicant"] for r in by_state.data["results"]], [self.faye.id]
+        )
+
+    def test_search_matches_note_content_with_view_note(self):
+        self.user.user_permissions.set([self.view_applicant, self.view_note])
+        self.client.force_authenticate(self.user)
+
+        response = self.search("bounty hunts")
+
+        self.assertEqual(len(response.data["results"]), 1)
+        result = response.data["results"][0]
+        self.assertEqual(result["applicant"], self.faye.id)
+        self.assertEqual(result["note"], self.note.id)
+        self.assertIn("<b>bounty</b>", result["snippet"])
+
+    def test_search_skips_notes_without_view_note(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.search("bounty")
+
+        self.assertEqual(response.data["results"], [])
+
+    def test_search_vector_follows_updates(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        self.spike.state = "Mars"
+        self.spike.save()
+
+        self.assertEqual(self.search("york").data["results"], [])
+        self.assertEqual(
+            [r["applicant"] for r in self.search("mars").data["results"]],
+            [self.spike.id],
+        )
+
+    def test_search_uses_gin_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(
+                "EXPLAIN SELECT id FROM api_notemodel "
+                "WHERE search_vector @@ websearch_to_tsquery('english', 'bounty')"
+            )
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        self.assertIn("api_notemodel_search_vector_idx", plan)
+
+    def test_search_requires_query(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get("/api/applicant/search/", format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_return_status_403_for_search_without_view_applicant(self):
+        self.user.user_permissions.set([self.view_note])
+        self.client.force_authenticate(self.user)
+
+        response = self.search("spike")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
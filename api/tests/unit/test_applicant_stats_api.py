@@ -0,0 +1,127 @@
+from io import StringIO
+
+from django.contrib.auth.models import Permission, User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.counters import find_drift
+from api.models import ApplicantCounterModel, ApplicantModel
+
+
+class ApplicantStatsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+
+        self.user.user_permissions.set(
+            Permission.objects.filter(
+                codename__in=[
+                    "view_applicant",
+                    "create_applicant",
+                    "update_applicant",
+                    "delete_applicant",
+                ]
+            )
+        )
+        self.client.force_authenticate(self.user)
+
+        self.data = {
+            "first_name": "Spike",
+            "last_name": "Spiegel",
+            "email": "spike.spiegel@bebop.com",
+            "phone_number": "123-456-7890",
+            "address": "123 Cowboy Pl",
+            "zip_code": "10000",
+            "state": "New York",
+        }
+
+    def create_applicant(self, email, **kwargs):
+        response = self.client.post(
+            "/api/applicant/", {**self.data, "email": email, **kwargs}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["id"]
+
+    def get_stats(self):
+        response = self.client.get("/api/applicant/stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_stats_follow_creates_updates_and_deletes(self):
+        spike = self.create_applicant("spike@bebop.com")
+        self.create_applicant("jet@bebop.com")
+        faye = self.create_applicant("faye@bebop.com", state="Texas")
+        self.client.post(
+            "/api/applicant/bulk/",
+            [{**self.data, "email": "ed@bebop.com", "state": "Texas"}],
+            format="json",
+        )
+
+        self.client.put(
+            f"/api/applicant/{spike}/", {"status": "APPROVED"}, format="json"
+        )
+        self.client.put(
+            "/api/applicant/status/",
+            {"status": "REJECTED", "filter": {"state": "Texas"}},
+            format="json",
+        )
+        self.client.delete(f"/api/applicant/{faye}/")
+
+        self.assertEqual(
+            self.get_stats(),
+            {
+                "status": {"PENDING": 1, "APPROVED": 1, "REJECTED": 1},
+                "state": {"New York": 2, "Texas": 1},
+            },
+        )
+        self.assertEqual(find_drift(), {})
+
+    def test_unchanged_status_does_not_move_counters(self):
+        spike = self.create_applicant("spike@bebop.com")
+
+        self.client.put(
+            f"/api/applicant/{spike}/", {"status": "PENDING"}, format="json"
+        )
+        self.client.put(f"/api/applicant/{spike}/", {"status": "BOGUS"}, format="json")
+
+        self.assertEqual(self.get_stats()["status"]["PENDING"], 1)
+        self.assertEqual(find_drift(), {})
+
+    def test_stats_do_not_read_applicants(self):
+        self.create_applicant("spike@bebop.com")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get_stats()
+
+        self.assertFalse(
+            any(
+                ApplicantModel._meta.db_table in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
+
+    def test_stats_without_permission(self):
+        self.user.user_permissions.clear()
+
+        response = self.client.get("/api/applicant/stats/")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_rebuild_counters_fixes_drift(self):
+        self.create_applicant("spike@bebop.com")
+        # Writes that bypass the views are not counted
+        ApplicantModel.objects.create(
+            **{**self.data, "email": "jet@bebop.com", "state": "Texas"}
+        )
+        ApplicantCounterModel.objects.filter(value="New York").update(count=5)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuildcounters", "--check", stdout=StringIO())
+
+        call_command("rebuildcounters", stdout=StringIO())
+
+        self.assertEqual(find_drift(), {})
+        self.assertEqual(self.get_stats()["state"], {"New York": 1, "Texas": 1})
+        call_command("rebuildcounters", "--check", stdout=StringIO())
@@ -0,0 +1,133 @@
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import ApplicantModel
+
+
+class ApplicantStatusTransitionTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+
+        self.view_applicant = Permission.objects.get(codename="view_applicant")
+        self.update_applicant = Permission.objects.get(codename="update_applicant")
+
+        self.data = {
+            "first_name": "Spike",
+            "last_name": "Spiegel",
+            "email": "spike.spiegel@bebop.com",
+            "phone_number": "123-456-7890",
+            "address": "123 Cowboy Pl",
+            "zip_code": "10000",
+            "state": "New York",
+        }
+
+    def create_applicant(self, email, **kwargs):
+        return ApplicantModel.objects.create(**{**self.data, "email": email, **kwargs})
+
+    def test_update_status_by_ids(self):
+        spike = self.create_applicant("spike@bebop.com")
+        jet = self.create_applicant("jet@bebop.com")
+        faye = self.create_applicant("faye@bebop.com")
+
+        self.user.user_permissions.set([self.update_applicant])
+        self.client.force_authenticate(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(
+                "/api/applicant/status/",
+                {"status": "APPROVED", "ids": [spike.id, jet.id]},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(
+            dict(ApplicantModel.objects.values_list("id", "status")),
+            {spike.id: "APPROVED", jet.id: "APPROVED", faye.id: "PENDING"},
+        )
+        updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn("= ANY(", updates[0])
+
+    def test_update_status_by_filter(self):
+        texan = self.create_applicant("texan@bebop.com", state="Texas")
+        approved_texan = self.create_applicant(
+            "approved@bebop.com", state="Texas", status="APPROVED"
+        )
+        new_yorker = self.create_applicant("ny@bebop.com")
+
+        self.user.user_permissions.set([self.update_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.put(
+            "/api/applicant/status/",
+            {"status": "REJECTED", "filter": {"state": "Texas", "status": "PENDING"}},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(ApplicantModel.objects.get(id=texan.id).status, "REJECTED")
+        self.assertEqual(
+            ApplicantModel.objects.get(id=approved_texan.id).status, "APPROVED"
+        )
+        self.assertEqual(ApplicantModel.objects.get(id=new_yorker.id).status, "PENDING")
+
+    def test_update_status_skips_applicants_already_in_target_status(self):
+        applicant = self.create_applicant("spike@bebop.com", status="APPROVED")
+
+        self.user.user_permissions.set([self.update_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.put(
+            "/api/applicant/status/",
+            {"status": "APPROVED", "ids": [applicant.id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 0)
+
+    def test_update_status_requires_ids_or_filter(self):
+        self.create_applicant("spike@bebop.com")
+
+        self.user.user_permissions.set([self.update_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.put(
+            "/api/applicant/status/", {"status": "APPROVED"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(ApplicantModel.objects.get().status, "PENDING")
+
+    def test_update_status_rejects_invalid_status(self):
+        applicant = self.create_applicant("spike@bebop.com")
+
+        self.user.user_permissions.set([self.update_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.put(
+            "/api/applicant/status/",
+            {"status": "BEEF", "ids": [applicant.id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_return_status_403_for_status_update_with_incorrect_permission(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.put(
+            "/api/applicant/status/", {"status": "APPROVED", "ids": [1]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,197 @@
+from django.contrib.auth.models import Permission, User
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.counters import find_drift
+from api.models import ApplicantModel, NoteModel
+
+
+class AsyncApplicantTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+
+        self.view_applicant = Permission.objects.get(codename="view_applicant")
+        self.create_applicant = Permission.objects.get(codename="create_applicant")
+        self.update_applicant = Permission.objects.get(codename="update_applicant")
+        self.delete_applicant = Permission.objects.get(codename="delete_applicant")
+
+        self.data = {
+            "first_name": "Spike",
+            "last_name": "Spiegel",
+            "email": "spike.spiegel@bebop.com",
+            "phone_number": "123-456-7890",
+            "address": "123 Cowboy Pl",
+            "zip_code": "10000",
+            "state": "New York",
+        }
+
+    def test_list_matches_sync_view(self):
+        for i in range(3):
+            ApplicantModel.objects.create(
+                **{**self.data, "email": f"applicant{i}@bebop.com"}
+            )
+
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+        response = self.client.get("/api/async/applicant/?page_size=2")
+        sync_response = self.client.get("/api/applicant/?page_size=2")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"], sync_response.json()["results"])
+        self.assertEqual(
+            response.json()["next"].replace("/async", ""), sync_response.json()["next"]
+        )
+
+    def test_list_invalid_filter(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get("/api/async/applicant/?status=BOGUS")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("status", response.json())
+
+    def test_create_applicant(self):
+        self.user.user_permissions.set([self.create_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post("/api/async/applicant/", self.data, format="json")
+        duplicate = self.client.post("/api/async/applicant/", self.data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertGreaterEqual(response.json().items(), self.data.items())
+        self.assertEqual(duplicate.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", duplicate.json())
+        self.assertEqual(find_drift(), {})
+
+    def test_get_applicant(self):
+        applicant = ApplicantModel.objects.create(**self.data)
+
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+        response = self.client.get(f"/api/async/applicant/{applicant.id}/")
+        not_modified = self.client.get(
+            f"/api/async/applicant/{applicant.id}/",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        missing = self.client.get(f"/api/async/applicant/{applicant.id + 1}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            self.client.get(f"/api/applicant/{applicant.id}/").json(),
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(missing.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_update_applicant(self):
+        applicant = ApplicantModel.objects.create(**self.data)
+
+        self.user.user_permissions.set([self.view_applicant, self.update_applicant])
+        self.client.force_authenticate(self.user)
+        self.client.get(f"/api/async/applicant/{applicant.id}/")
+        response = self.client.put(
+            f"/api/async/applicant/{applicant.id}/",
+            {"status": "APPROVED"},
+            format="json",
+        )
+        invalid = self.client.put(
+            f"/api/async/applicant/{applicant.id}/",
+            {"status": "BOGUS"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["status"], "APPROVED")
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.client.get(f"/api/async/applicant/{applicant.id}/").json()["status"],
+            "APPROVED",
+        )
+
+    def test_delete_applicant(self):
+        applicant = ApplicantModel.objects.create(**self.data)
+
+        self.user.user_permissions.set([self.delete_applicant])
+        self.client.force_authenticate(self.user)
+        response = self.client.delete(f"/api/async/applicant/{applicant.id}/")
+        missing = self.client.delete(f"/api/async/applicant/{applicant.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(missing.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ApplicantModel.objects.exists())
+
+    def test_requires_permission(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post("/api/async/applicant/", self.data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(ApplicantModel.objects.exists())
+
+    def test_requires_authentication(self):
+        response = self.client.get("/api/async/applicant/")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_session_authentication(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.client.login(username="test_user", password="password")
+
+        response = self.client.get("/api/async/applicant/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class AsyncNoteTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            Permission.objects.filter(codename__in=["view_note", "create_note"])
+        )
+        self.client.force_authenticate(self.user)
+
+        self.applicant = ApplicantModel.objects.create(
+            first_name="Spike",
+            last_name="Spiegel",
+            email="spike.spiegel@bebop.com",
+            phone_number="123-456-7890",
+            address="123 Cowboy Pl",
+            zip_code="10000",
+            state="New York",
+        )
+
+    def test_create_and_list_notes(self):
+        url = f"/api/async/applicant/{self.applicant.id}/note/"
+        for title in ("First", "Second"):
+            response = self.client.post(
+                url, {"title": title, "content": "Bang"}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.json()["applicant"], self.applicant.id)
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [note["title"] for note in response.json()["results"]],
+            ["Second", "First"],
+        )
+        self.assertEqual(
+            response.json()["results"],
+            self.client.get(f"/api/applicant/{self.applicant.id}/note/").json()[
+                "results"
+            ],
+        )
+
+    def test_create_note_for_missing_applicant(self):
+        response = self.client.post(
+            f"/api/async/applicant/{self.applicant.id + 1}/note/",
+            {"title": "Lost", "content": "Bang"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("applicant", response.json())
+        self.assertFalse(NoteModel.objects.exists())
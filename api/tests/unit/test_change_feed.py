@@ -0,0 +1,339 @@
+import asyncio
+import threading
+from datetime import timedelta
+from unittest import mock
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import AsyncClient
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from api.changes import change_feed, prune_changes
+from api.models import ApplicantChangeModel, ApplicantModel, NoteModel
+from api.tokens import issue_token
+
+URL = "/api/async/applicant/changes/"
+
+
+def parse_events(body):
+    """
+    (id, event, data) of the server-sent events in body
+    """
+    events = []
+    for message in body.decode().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in message.splitlines() if ": " in line
+        )
+        if "id" in fields:
+            events.append(
+                (int(fields["id"]), fields["event"], orjson.loads(fields["data"]))
+            )
+    return events
+
+
+class ChangeFeedTestMixin:
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            Permission.objects.filter(
+                codename__in=[
+                    "view_applicant",
+                    "create_applicant",
+                    "update_applicant",
+                    "delete_applicant",
+                    "create_note",
+                ]
+            )
+        )
+        self.data = {
+            "first_name": "Spike",
+            "last_name": "Spiegel",
+            "email": "spike.spiegel@bebop.com",
+            "phone_number": "123-456-7890",
+            "address": "123 Cowboy Pl",
+            "zip_code": "10000",
+            "state": "New York",
+        }
+        # Let the listener notice quickly that the streams are gone
+        patcher = mock.patch("api.changes.POLL_INTERVAL", 0.1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.stop_listener)
+
+    def stop_listener(self):
+        listener = change_feed.listener
+        if listener is not None:
+            listener.join(5)
+
+    def stream(self, data=None, **headers):
+        """
+        Open the change feed with a token of the user
+        """
+        token, _ = issue_token(self.user)
+        return AsyncClient().get(
+            URL, data, headers={"Authorization": f"Bearer {token}", **headers}
+        )
+
+    async def read_events(self, response, count):
+        """
+        Read the stream until `count` events arrived, then close it
+        """
+        body = b""
+        try:
+            async with asyncio.timeout(10):
+                async for chunk in response.streaming_content:
+                    body += chunk
+                    if len(parse_events(body)) >= count:
+                        break
+        finally:
+            await response.streaming_content.aclose()
+        return parse_events(body)
+
+
+class ChangeRecordTests(ChangeFeedTestMixin, APITestCase):
+    def test_changes_are_recorded(self):
+        self.client.force_authenticate(self.user)
+
+        applicant = self.client.post("/api/applicant/", self.data, format="json")
+        url = f"/api/applicant/{applicant.json()['id']}/"
+        self.client.put(url, {"status": "APPROVED"}, format="json")
+        self.client.put(url, {"state": "Mars"}, format="json")
+        note = self.client.post(
+            f"{url}note/", {"title": "Bounty", "content": "Woolong"}
+        )
+        self.client.delete(url)
+
+        changes = list(
+            ApplicantChangeModel.objects.order_by("id").values_list("kind", "data")
+        )
+        self.assertEqual(
+            changes,
+            [
+                ("created", {"status": "PENDING"}),
+                ("status", {"status": "APPROVED", "previous": "PENDING"}),
+                ("note", {"note": note.json()["id"], "title": "Bounty"}),
+                ("deleted", {}),
+            ],
+        )
+
+    @mock.patch("django.conf.settings.APPLICANT_SOFT_DELETE", True)
+    def test_purge_after_soft_delete_records_one_deletion(self):
+        applicant = ApplicantModel.objects.create(**self.data)
+        self.client.force_authenticate(self.user)
+
+        self.client.delete(f"/api/applicant/{applicant.id}/")
+        ApplicantModel.all_objects.purge_deleted(10)
+
+        self.assertEqual(
+            list(ApplicantChangeModel.objects.values_list("kind", flat=True)),
+            ["created", "deleted"],
+        )
+
+    def test_bulk_status_change_records_each_applicant(self):
+        ids = [
+            ApplicantModel.objects.create(**{**self.data, "email": f"{i}@bebop.com"}).id
+            for i in range(3)
+        ]
+        self.client.force_authenticate(self.user)
+
+        response = self.client.put(
+            "/api/applicant/status/", {"status": "REJECTED", "ids": ids}, format="json"
+        )
+
+        self.assertEqual(response.json(), {"updated": 3})
+        self.assertEqual(ApplicantChangeModel.objects.filter(kind="status").count(), 3)
+
+    def test_prune_changes(self):
+        ApplicantModel.objects.create(**self.data)
+        ApplicantChangeModel.objects.update(
+            created_at=timezone.now() - timedelta(days=8)
+        )
+        ApplicantModel.objects.create(**{**self.data, "email": "faye@bebop.com"})
+
+        pruned = prune_changes(timezone.now() - timedelta(days=7), batch_size=1)
+
+        self.assertEqual(pruned, 1)
+        self.assertEqual(ApplicantChangeModel.objects.count(), 1)
+
+    async def test_stream_rejects_unknown_events(self):
+        response = await self.stream({"events": "hired"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_stream_requires_asgi(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(URL)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_stream_requires_permission(self):
+        await sync_to_async(self.user.user_permissions.clear)()
+
+        response = await self.stream()
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ChangeFeedListenerTests(ChangeFeedTestMixin, APITransactionTestCase):
+    async def test_committed_changes_reach_every_stream(self):
+        applicant = await ApplicantModel.objects.acreate(**self.data)
+        streams = [await self.stream() for _ in range(2)]
+        # The first chunk is sent once the feed is listening
+        for response in streams:
+            await anext(aiter(response.streaming_content))
+
+        await ApplicantModel.objects.filter(id=applicant.id).aupdate(status="APPROVED")
+        results = [await self.read_events(response, 1) for response in streams]
+
+        for events in results:
+            self.assertEqual(
+                [(kind, data["status"]) for _, kind, data in events],
+                [("status", "APPROVED")],
+            )
+
+    async def test_stream_resumes_after_last_event_id(self):
+        first = await ApplicantModel.objects.acreate(**self.data)
+        second = await ApplicantModel.objects.acreate(
+            **{**self.data, "email": "faye@bebop.com"}
+        )
+        await NoteModel.objects.acreate(applicant=second, title="Bounty", content="")
+        last_event_id = (
+            await ApplicantChangeModel.objects.filter(applicant_id=first.id)
+            .values_list("id", flat=True)
+            .aget()
+        )
+
+        response = await self.stream(**{"Last-Event-ID": str(last_event_id)})
+        events = await self.read_events(response, 1)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        # Note events need the view_note permission
+        self.assertEqual(
+            [(kind, data["applicant"]) for _, kind, data in events],
+            [("created", second.id)],
+        )
+
+    async def test_stream_filters_event_kinds(self):
+        await sync_to_async(self.user.user_permissions.add)(
+            await Permission.objects.aget(codename="view_note")
+        )
+        applicant = await ApplicantModel.objects.acreate(**self.data)
+        await NoteModel.objects.acreate(applicant=applicant, title="Bounty", content="")
+
+        response = await self.stream({"events": "note", "last_event_id": 0})
+        events = await self.read_events(response, 1)
+
+        self.assertEqual([kind for _, kind, _ in events], ["note"])
+
+    def write_in_transaction(self, email, inserted, finish, commit=True):
+        """
+        Create an applicant in a transaction of another connection that is
+        held open until `finish` is set
+        """
+        try:
+            with transaction.atomic():
+                ApplicantModel.objects.create(**{**self.data, "email": email})
+                inserted.set()
+                finish.wait(5)
+                if not commit:
+                    transaction.set_rollback(True)
+        finally:
+            connection.close()
+
+    async def interleave(self, commit):
+        """
+        Take an event id in a transaction, commit a later event while it is
+        open, then end the transaction. Returns the later applicant.
+        """
+        inserted, finish = threading.Event(), threading.Event()
+        thread = threading.Thread(
+            target=self.write_in_transaction,
+            args=("faye@bebop.com", inserted, finish, commit),
+        )
+        thread.start()
+        await asyncio.to_thread(inserted.wait, 5)
+        later = await ApplicantModel.objects.acreate(**self.data)
+        # Give the listener time to see the later event and the gap
+        await asyncio.sleep(0.3)
+        finish.set()
+        await asyncio.to_thread(thread.join, 5)
+        return later
+
+    async def test_events_committed_out_of_order_are_sent_in_id_order(self):
+        live = await self.stream()
+        await anext(aiter(live.streaming_content))
+
+        await self.interleave(commit=True)
+        events = await self.read_events(live, 2)
+
+        ids = [id for id, _, _ in events]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(
+            [data["applicant"] for _, _, data in events],
+            [applicant.id async for applicant in ApplicantModel.objects.order_by("id")],
+        )
+
+    async def test_resume_does_not_skip_events_committed_late(self):
+        live = await self.stream()
+        await anext(aiter(live.streaming_content))
+
+        await self.interleave(commit=True)
+        first = (await self.read_events(live, 1))[0]
+        # Reconnecting after the first event still delivers the second,
+        # whichever transaction committed first
+        resumed = await self.stream(**{"Last-Event-ID": str(first[0])})
+        events = await self.read_events(resumed, 1)
+
+        self.assertEqual(len(events), 1)
+        self.assertGreater(events[0][0], first[0])
+
+    async def test_rolled_back_event_ids_do_not_hold_the_feed(self):
+        live = await self.stream()
+        await anext(aiter(live.streaming_content))
+
+        later = await self.interleave(commit=False)
+        events = await self.read_events(live, 1)
+
+        self.assertEqual(
+            [(kind, data["applicant"]) for _, kind, data in events],
+            [("created", later.id)],
+        )
+
+    async def test_open_gap_does_not_reread_events(self):
+        live = await self.stream()
+        await anext(aiter(live.streaming_content))
+
+        with mock.patch.object(change_feed, "fetch", wraps=change_feed.fetch) as fetch:
+            await self.interleave(commit=True)
+            events = await self.read_events(live, 2)
+
+        self.assertEqual(len(events), 2)
+        # Once for the later event, once for each way the gap can end: the
+        # commit notification and the end of the transactions it waited on
+        self.assertLessEqual(fetch.call_count, 3)
+
+    async def test_events_are_read_in_batches(self):
+        live = await self.stream()
+        await anext(aiter(live.streaming_content))
+
+        with mock.patch("api.changes.FETCH_BATCH_SIZE", 2):
+            await ApplicantModel.objects.abulk_create(
+                [
+                    ApplicantModel(**{**self.data, "email": f"{n}@bebop.com"})
+                    for n in range(5)
+                ]
+            )
+            events = await self.read_events(live, 5)
+
+        self.assertEqual(
+            [data["applicant"] for _, _, data in events],
+            [applicant.id async for applicant in ApplicantModel.objects.order_by("id")],
+        )
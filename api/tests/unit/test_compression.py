@@ -0,0 +1,126 @@
+import gzip
+
+import brotli
+import orjson
+from django.contrib.auth.models import Permission, User
+from django.test import AsyncClient, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.compression import negotiate
+from api.models import ApplicantModel
+from api.tokens import issue_token
+
+
+@override_settings(COMPRESSION_MIN_SIZE=1024)
+class CompressionTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            Permission.objects.filter(
+                codename__in=["view_applicant", "create_applicant"]
+            )
+        )
+        self.client.force_authenticate(self.user)
+
+        ApplicantModel.objects.bulk_create(
+            ApplicantModel(
+                first_name="Spike",
+                last_name="Spiegel",
+                email=f"spike{index}@bebop.com",
+                phone_number="123-456-7890",
+                address="123 Cowboy Pl",
+                zip_code="10000",
+                state="New York",
+            )
+            for index in range(20)
+        )
+
+    def get(self, url, accept_encoding):
+        return self.client.get(url, HTTP_ACCEPT_ENCODING=accept_encoding)
+
+    def test_brotli_preferred(self):
+        plain = self.client.get("/api/applicant/")
+        response = self.get("/api/applicant/", "gzip, deflate, br")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+
+    def test_gzip_by_quality(self):
+        plain = self.client.get("/api/applicant/")
+        response = self.get("/api/applicant/", "br;q=0.5, gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_no_accepted_encoding(self):
+        response = self.get("/api/applicant/", "identity, br;q=0")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_small_responses_are_not_compressed(self):
+        applicant = ApplicantModel.objects.first()
+
+        response = self.get(f"/api/applicant/{applicant.id}/", "br")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_compressed_etag_is_weak(self):
+        applicant = ApplicantModel.objects.first()
+
+        with override_settings(COMPRESSION_MIN_SIZE=0):
+            response = self.get(f"/api/applicant/{applicant.id}/", "gzip")
+            not_modified = self.client.get(
+                f"/api/applicant/{applicant.id}/",
+                HTTP_ACCEPT_ENCODING="gzip",
+                HTTP_IF_NONE_MATCH=response["ETag"],
+            )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_streaming_export_is_compressed(self):
+        plain = self.client.get("/api/applicant/export/?format=ndjson")
+        response = self.get("/api/applicant/export/?format=ndjson", "gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)),
+            b"".join(plain.streaming_content),
+        )
+
+    def test_html_is_not_compressed(self):
+        response = self.client.get(
+            "/api/applicant/", HTTP_ACCEPT="text/html", HTTP_ACCEPT_ENCODING="br"
+        )
+
+        self.assertTrue(response["Content-Type"].startswith("text/html"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    async def test_async_view_is_compressed(self):
+        token, _ = issue_token(self.user)
+
+        response = await AsyncClient().get(
+            "/api/async/applicant/",
+            headers={"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            len(orjson.loads(gzip.decompress(response.content))["results"]), 20
+        )
+
+    def test_negotiate(self):
+        self.assertEqual(negotiate("gzip, br"), "br")
+        self.assertEqual(negotiate("gzip;q=1.0, br;q=0.8"), "gzip")
+        self.assertEqual(negotiate("*"), "br")
+        self.assertEqual(negotiate("*, br;q=0"), "gzip")
+        self.assertIsNone(negotiate("identity"))
+        self.assertIsNone(negotiate(""))
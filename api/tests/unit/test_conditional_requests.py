@@ -0,0 +1,92 @@
+from django.contrib.auth.models import Permission, User
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import ApplicantModel, NoteModel
+
+
+class ConditionalRequestTests(APITestCase):
+    def setUp(self):
+        caches["applicants"].clear()
+
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            Permission.objects.filter(
+                codename__in=["view_applicant", "update_applicant", "view_note"]
+            )
+        )
+        self.client.force_authenticate(self.user)
+
+        self.applicant = ApplicantModel.objects.create(
+            first_name="Spike",
+            last_name="Spiegel",
+            email="spike.spiegel@bebop.com",
+            phone_number="123-456-7890",
+            address="123 Cowboy Pl",
+            zip_code="10000",
+            state="New York",
+        )
+        self.url = f"/api/applicant/{self.applicant.id}/"
+        self.notes_url = f"/api/applicant/{self.applicant.id}/note/"
+
+    def test_applicant_detail_sets_validators(self):
+        response = self.client.get(self.url, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+    def test_applicant_detail_returns_304_when_etag_matches(self):
+        etag = self.client.get(self.url, format="json")["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_applicant_detail_uncached_304_only_queries_version(self):
+        etag = self.client.get(self.url, format="json")["ETag"]
+        caches["applicants"].clear()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_applicant_detail_returns_200_after_update(self):
+        etag = self.client.get(self.url, format="json")["ETag"]
+
+        self.client.put(self.url, {"status": "APPROVED"}, format="json")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["status"], "APPROVED")
+
+    def test_applicant_detail_returns_200_after_bulk_status_update(self):
+        etag = self.client.get(self.url, format="json")["ETag"]
+        caches["applicants"].clear()
+
+        self.client.put(
+            "/api/applicant/status/",
+            {"status": "REJECTED", "ids": [self.applicant.id]},
+            format="json",
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_note_list_returns_304_until_a_note_is_added(self):
+        NoteModel.objects.create(applicant=self.applicant, title="a", content="b")
+        etag = self.client.get(self.notes_url, format="json")["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.notes_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        NoteModel.objects.create(applicant=self.applicant, title="c", content="d")
+        response = self.client.get(self.notes_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
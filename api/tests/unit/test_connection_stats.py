@@ -0,0 +1,55 @@
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.connections import ConnectionStats, connection_stats
+
+
+class ConnectionStatsTests(TestCase):
+    def test_counts_open_and_in_use_connections(self):
+        stats = ConnectionStats()
+        connection = connections["default"]
+        connection.ensure_connection()
+        stats.record_created(connection)
+
+        # Test cases run inside a transaction
+        self.assertEqual(
+            stats.stats(), {"created": 1, "reused": 0, "open": 1, "in_use": 1}
+        )
+
+    def test_counts_reused_connections(self):
+        stats = ConnectionStats()
+        connection = connections["default"]
+        connection.ensure_connection()
+
+        stats.record_request(connection)
+
+        self.assertEqual(stats.stats()["reused"], 1)
+
+
+class ServerStatsApiTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.admin = User.objects.create_user(
+            "admin", "admin@test.com", "password", is_staff=True
+        )
+
+    def test_requests_reuse_the_open_connection(self):
+        self.client.force_authenticate(self.admin)
+        before = connection_stats.stats()
+
+        response = self.client.get("/api/stats/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["database"]["created"], before["created"])
+        self.assertEqual(response.data["database"]["reused"], before["reused"] + 1)
+        self.assertEqual(set(response.data["applicant_cache"]), {"hits", "misses"})
+
+    def test_stats_require_staff(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get("/api/stats/")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,79 @@
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from api.models import ApplicantModel, NoteModel
+from api.renderers import ORJSONRenderer
+from api.serializers import (
+    ApplicantSerializer,
+    NoteSerializer,
+    fast_applicant_serializer,
+    fast_note_serializer,
+)
+
+
+class FastReadSerializerTests(TestCase):
+    def setUp(self):
+        self.applicants = [
+            ApplicantModel.objects.create(
+                first_name="Spike",
+                last_name="Spiegel",
+                email="spike.spiegel@bebop.com",
+                phone_number="123-456-7890",
+                address="123 Cowboy Pl",
+                zip_code="10000",
+                state="New York",
+            ),
+            ApplicantModel.objects.create(
+                first_name="Faye",
+                last_name="Valentine ✦",
+                email="faye@bebop.com",
+                phone_number="555-0000",
+                address='Bebop, Hangar "2"',
+                zip_code="00001",
+                state="Ganymede",
+                status=ApplicantModel.ApplicantStatus.REJECTED,
+            ),
+        ]
+        for applicant in self.applicants:
+            NoteModel.objects.create(
+                applicant=applicant, title="Interview", content="Line one\nline two"
+            )
+
+    def assertRendersIdentically(self, serializer_class, fast_serializer, queryset):
+        expected = JSONRenderer().render(
+            serializer_class(queryset.order_by("id"), many=True).data
+        )
+        actual = JSONRenderer().render(
+            fast_serializer.many(
+                queryset.order_by("id").values(*fast_serializer.columns)
+            )
+        )
+        self.assertEqual(actual, expected)
+
+    def test_applicant_output_is_byte_identical(self):
+        self.assertRendersIdentically(
+            ApplicantSerializer, fast_applicant_serializer, ApplicantModel.objects.all()
+        )
+
+    def test_note_output_is_byte_identical(self):
+        self.assertRendersIdentically(
+            NoteSerializer, fast_note_serializer, NoteModel.objects.all()
+        )
+
+    def test_field_names_match_serializer(self):
+        self.assertEqual(
+            fast_applicant_serializer.field_names, list(ApplicantSerializer().fields)
+        )
+        self.assertEqual(
+            fast_note_serializer.field_names, list(NoteSerializer().fields)
+        )
+
+    def test_orjson_output_matches_json_renderer(self):
+        queryset = ApplicantModel.objects.order_by("id")
+        expected = JSONRenderer().render(ApplicantSerializer(queryset, many=True).data)
+        actual = ORJSONRenderer().render(
+            fast_applicant_serializer.many(
+                queryset.values(*fast_applicant_serializer.columns)
+            )
+        )
+        self.assertEqual(actual, expected)
@@ -0,0 +1,169 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.checks import check_shared_caches
+from api.idempotency import REPLAYED_HEADER, idempotency_store
+from api.models import ApplicantModel, NoteModel
+
+
+class IdempotencyKeyTests(APITestCase):
+    def setUp(self):
+        idempotency_store.cache.clear()
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            Permission.objects.filter(codename__in=["create_applicant", "create_note"])
+        )
+        self.client.force_authenticate(self.user)
+
+        self.data = {
+            "first_name": "Spike",
+            "last_name": "Spiegel",
+            "email": "spike.spiegel@bebop.com",
+            "phone_number": "123-456-7890",
+            "address": "123 Cowboy Pl",
+            "zip_code": "10000",
+            "state": "New York",
+        }
+
+    def post(self, url, data, key="retry-1"):
+        return self.client.post(url, data, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_created_applicant(self):
+        first = self.post("/api/applicant/", self.data)
+        with CaptureQueriesContext(connection) as queries:
+            retry = self.post("/api/applicant/", self.data)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry[REPLAYED_HEADER], "true")
+        self.assertNotIn(REPLAYED_HEADER, first)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(ApplicantModel.objects.count(), 1)
+
+    def test_retry_replays_created_note(self):
+        applicant = ApplicantModel.objects.create(**self.data)
+        url = f"/api/applicant/{applicant.id}/note/"
+        note = {"title": "Bounty", "content": "Woolong"}
+
+        first = self.post(url, note)
+        retry = self.post(url, note)
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(NoteModel.objects.count(), 1)
+
+    def test_requests_without_key_are_not_stored(self):
+        self.client.post("/api/applicant/", self.data, format="json")
+        response = self.client.post("/api/applicant/", self.data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn(REPLAYED_HEADER, response)
+
+    def test_key_reused_for_different_request(self):
+        self.post("/api/applicant/", self.data)
+
+        response = self.post("/api/applicant/", {**self.data, "email": "jet@bebop.com"})
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(ApplicantModel.objects.count(), 1)
+
+    def test_key_in_flight_conflicts(self):
+        key = idempotency_store.key(self.user.pk, "retry-1")
+        idempotency_store.cache.add(f"{key}:lock", "other")
+
+        response = self.post("/api/applicant/", self.data)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(ApplicantModel.objects.exists())
+
+    def test_slow_request_keeps_its_key(self):
+        lock = f"{idempotency_store.key(self.user.pk, 'retry-1')}:lock"
+        held = []
+
+        def slow_write(applicants):
+            time.sleep(1.5)
+            held.append(idempotency_store.cache.get(lock) is not None)
+
+        with mock.patch("api.idempotency.LOCK_TIMEOUT", 1), mock.patch(
+            "api.idempotency.LOCK_REFRESH_INTERVAL", 0.2
+        ), mock.patch("api.views.queue_created", side_effect=slow_write):
+            response = self.post("/api/applicant/", self.data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(held, [True])
+        self.assertIsNone(idempotency_store.cache.get(lock))
+
+    def test_keys_are_scoped_to_the_user(self):
+        self.post("/api/applicant/", self.data)
+        other = User.objects.create_user("other_user", "other@test.com", "password")
+        other.user_permissions.set(Permission.objects.filter(codename="create_note"))
+        applicant = ApplicantModel.objects.get()
+        self.client.force_authenticate(other)
+
+        response = self.post(
+            f"/api/applicant/{applicant.id}/note/", {"title": "a", "content": "b"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_invalid_key(self):
+        response = self.post("/api/applicant/", self.data, key="x" * 256)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ApplicantModel.objects.exists())
+
+    def test_validation_errors_are_replayed(self):
+        ApplicantModel.objects.create(**self.data)
+
+        first = self.post("/api/applicant/", self.data)
+        retry = self.post("/api/applicant/", self.data)
+
+        self.assertEqual(retry.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry[REPLAYED_HEADER], "true")
+
+    def test_async_retry_replays_created_applicant(self):
+        first = self.post("/api/async/applicant/", self.data)
+        retry = self.post("/api/async/applicant/", self.data)
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry[REPLAYED_HEADER], "true")
+        self.assertEqual(ApplicantModel.objects.count(), 1)
+
+    def test_async_key_reused_for_different_request(self):
+        self.post("/api/async/applicant/", self.data)
+
+        response = self.post(
+            "/api/async/applicant/", {**self.data, "email": "jet@bebop.com"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(response.json()["res"][:15], "Idempotency-Key")
+
+    def test_process_local_caches_are_reported(self):
+        local = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        redis = {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://localhost:6379/0",
+        }
+
+        with override_settings(
+            CACHES={"default": redis, "idempotency": local, "applicants": local}
+        ):
+            warnings = check_shared_caches(None)
+        with override_settings(
+            CACHES={"default": redis, "idempotency": redis, "applicants": redis}
+        ):
+            self.assertEqual(check_shared_caches(None), [])
+
+        self.assertEqual([warning.id for warning in warnings], ["api.W001"] * 2)
+        self.assertIn("Idempotency-Key", warnings[0].msg)
@@ -0,0 +1,53 @@
+from io import BytesIO
+
+from django.contrib.auth.models import Permission, User
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APITestCase
+
+from api.models import ApplicantModel
+from api.parsers import ORJSONParser
+
+
+class ORJSONParserTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            Permission.objects.filter(codename="create_applicant")
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_parses_utf8_body(self):
+        response = self.client.post(
+            "/api/applicant/",
+            '{"first_name": "Faye", "last_name": "Valentine ✦",'
+            ' "email": "faye@bebop.com", "phone_number": "555-0000",'
+            ' "address": "Hangar 2", "zip_code": "00001", "state": "Ganymede"}',
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ApplicantModel.objects.get().last_name, "Valentine ✦")
+
+    def test_malformed_body(self):
+        for url in ("/api/applicant/", "/api/async/applicant/"):
+            response = self.client.post(
+                url, '{"first_name": ', content_type="application/json"
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertTrue(response.json()["detail"].startswith("JSON parse error"))
+
+    def test_undecodable_body(self):
+        response = self.client.post(
+            "/api/applicant/",
+            '{"first_name": "✦"}'.encode(),
+            content_type="application/json; charset=ascii",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.json()["detail"].startswith("JSON parse error"))
+
+    def test_unknown_encoding(self):
+        with self.assertRaisesMessage(ParseError, "JSON parse error"):
+            ORJSONParser().parse(BytesIO(b"{}"), parser_context={"encoding": "bogus"})
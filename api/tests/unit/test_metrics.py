@@ -0,0 +1,139 @@
+from django.contrib.auth.models import Permission, User
+from django.core.handlers.asgi import ASGIHandler
+from django.test import AsyncClient, override_settings
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import ApplicantModel
+from api.tokens import issue_token
+
+
+class MetricsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            [Permission.objects.get(codename="view_applicant")]
+        )
+        self.client.force_authenticate(self.user)
+
+        self.applicant = ApplicantModel.objects.create(
+            first_name="Spike",
+            last_name="Spiegel",
+            email="spike.spiegel@bebop.com",
+            phone_number="123-456-7890",
+            address="123 Cowboy Pl",
+            zip_code="10000",
+            state="New York",
+        )
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_records_requests_by_view(self):
+        labels = {"view": "ApplicantDetailApiView", "method": "GET"}
+        requests = self.sample("api_requests_total", status="200", **labels)
+        latencies = self.sample("api_request_duration_seconds_count", **labels)
+        sizes = self.sample("api_response_size_bytes_sum", **labels)
+        queries = self.sample("api_db_queries_total", **labels)
+        misses = self.sample("api_applicant_cache_requests_total", result="miss")
+        hits = self.sample("api_applicant_cache_requests_total", result="hit")
+
+        response = self.client.get(f"/api/applicant/{self.applicant.id}/")
+        self.client.get(f"/api/applicant/{self.applicant.id}/")
+
+        self.assertEqual(
+            self.sample("api_requests_total", status="200", **labels), requests + 2
+        )
+        self.assertEqual(
+            self.sample("api_request_duration_seconds_count", **labels), latencies + 2
+        )
+        self.assertEqual(
+            self.sample("api_response_size_bytes_sum", **labels),
+            sizes + 2 * len(response.content),
+        )
+        self.assertGreater(self.sample("api_db_queries_total", **labels), queries)
+        self.assertEqual(
+            self.sample("api_applicant_cache_requests_total", result="miss"),
+            misses + 1,
+        )
+        self.assertEqual(
+            self.sample("api_applicant_cache_requests_total", result="hit"), hits + 1
+        )
+
+    def test_records_streamed_response_size(self):
+        labels = {"view": "ApplicantExportApiView", "method": "GET"}
+        sizes = self.sample("api_response_size_bytes_sum", **labels)
+
+        response = self.client.get("/api/applicant/export/")
+        body = b"".join(response.streaming_content)
+
+        self.assertEqual(
+            self.sample("api_response_size_bytes_sum", **labels), sizes + len(body)
+        )
+
+    async def test_records_async_requests(self):
+        labels = {"view": "AsyncApplicantListView", "method": "GET"}
+        requests = self.sample("api_requests_total", status="200", **labels)
+        queries = self.sample("api_db_queries_total", **labels)
+        token, _ = issue_token(self.user)
+
+        response = await AsyncClient().get(
+            "/api/async/applicant/",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.sample("api_requests_total", status="200", **labels), requests + 1
+        )
+        self.assertGreater(self.sample("api_db_queries_total", **labels), queries)
+
+    @override_settings(DEBUG=True)
+    def test_asgi_chain_is_not_adapted_to_sync(self):
+        # Django logs every middleware it has to adapt, only with DEBUG on
+        with self.assertNoLogs("django.request", level="DEBUG"):
+            ASGIHandler()
+
+    def test_unknown_methods_share_one_label(self):
+        for method in ("X0", "X1"):
+            self.client.generic(method, "/metrics")
+
+        self.assertEqual(
+            {
+                sample.labels["method"]
+                for metric in REGISTRY.collect()
+                if metric.name == "api_requests"
+                for sample in metric.samples
+            }
+            & {"X0", "X1", "other"},
+            {"other"},
+        )
+
+    @override_settings(DEBUG=True)
+    def test_metrics_endpoint(self):
+        self.client.get("/api/applicant/")
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            'api_requests_total{method="GET",status="200",'
+            'view="ApplicantListApiView"}',
+            response.content.decode(),
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_token(self):
+        self.assertEqual(
+            self.client.get("/metrics").status_code, status.HTTP_403_FORBIDDEN
+        )
+        self.assertEqual(
+            self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_metrics_need_a_token_without_debug(self):
+        self.assertEqual(
+            self.client.get("/metrics").status_code, status.HTTP_403_FORBIDDEN
+        )
@@ -1,4 +1,8 @@
+from datetime import timedelta
+
 from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -41,8 +45,52 @@ class NoteTests(APITestCase):
             f"/api/applicant/{applicant.id}/note/", format="json"
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertGreaterEqual(dict(response.data[0]).items(), self.note_data.items())
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertGreaterEqual(
+            dict(response.data["results"][0]).items(), self.note_data.items()
+        )
+
+    def test_list_notes_newest_first_across_pages(self):
+        applicant = ApplicantModel.objects.create(**self.applicant_data)
+        now = timezone.now()
+        notes = [
+            NoteModel.objects.create(
+                applicant=applicant,
+                created_at=now - timedelta(minutes=minutes),
+                **self.note_data,
+            )
+            for minutes in (5, 1, 3, 2, 4)
+        ]
+
+        self.user.user_permissions.set([self.view_note])
+        self.client.force_authenticate(self.user)
+
+        ids = []
+        url = f"/api/applicant/{applicant.id}/note/?page_size=2"
+        while url:
+            response = self.client.get(url, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            ids.extend(note["id"] for note in response.data["results"])
+            url = response.data["next"]
+
+        newest_first = sorted(notes, key=lambda note: note.created_at, reverse=True)
+        self.assertEqual(ids, [note.id for note in newest_first])
+
+    def test_list_notes_page_uses_timeline_index(self):
+        applicant = ApplicantModel.objects.create(**self.applicant_data)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+        plan = (
+            NoteModel.objects.filter(applicant_id=applicant.id)
+            .order_by("-created_at", "-id")[:21]
+            .explain()
+        )
+
+        self.assertIn("note_applicant_timeline_idx", plan)
+        self.assertNotIn("Sort", plan)
 
     def test_create_note(self):
         applicant = ApplicantModel.objects.create(**self.applicant_data)
@@ -71,7 +119,7 @@ class NoteTests(APITestCase):
             f"/api/applicant/{applicant.id}/note/", format="json"
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data["results"]), 0)
 
     def test_create_returns_status_code_400_with_invalid_data(self):
         applicant = ApplicantModel.objects.create(**self.applicant_data)
@@ -0,0 +1,276 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import Permission, User
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from api.models import OutboxModel
+from api.outbox import OutboxDispatcher, queue_events
+
+
+class WebhookStandIn:
+    """
+    Local HTTP server recording the JSON bodies posted to it and answering
+    with `status`
+    """
+
+    def __init__(self, status=200):
+        self.status = status
+        self.bodies = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stand_in.bodies.append(json.loads(body))
+                self.send_response(stand_in.status)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def events(self):
+        return [event for body in self.bodies for event in body["events"]]
+
+
+class OutboxTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            Permission.objects.filter(
+                codename__in=[
+                    "create_applicant",
+                    "update_applicant",
+                    "delete_applicant",
+                    "create_note",
+                ]
+            )
+        )
+        self.client.force_authenticate(self.user)
+        self.data = {
+            "first_name": "Spike",
+            "last_name": "Spiegel",
+            "email": "spike.spiegel@bebop.com",
+            "phone_number": "123-456-7890",
+            "address": "123 Cowboy Pl",
+            "zip_code": "10000",
+            "state": "New York",
+        }
+        self.stand_in = WebhookStandIn()
+        self.addCleanup(self.stand_in.close)
+
+    def queue(self, count, endpoint=None):
+        with override_settings(WEBHOOK_ENDPOINTS=[endpoint or self.stand_in.url]):
+            queue_events([("test.event", {"n": n}) for n in range(count)])
+
+    def test_views_queue_events_for_every_endpoint(self):
+        with override_settings(
+            WEBHOOK_ENDPOINTS=["http://a.test/hook", "http://b.test/hook"]
+        ):
+            created = self.client.post("/api/applicant/", self.data, format="json")
+            url = f"/api/applicant/{created.json()['id']}/"
+            self.client.put(url, {"status": "APPROVED"}, format="json")
+            self.client.post(f"{url}note/", {"title": "Bounty", "content": "Woolong"})
+            self.client.delete(url)
+
+        rows = OutboxModel.objects.filter(endpoint="http://a.test/hook").order_by("id")
+        self.assertEqual(OutboxModel.objects.count(), 8)
+        self.assertEqual(
+            [row.event for row in rows],
+            [
+                "applicant.created",
+                "applicant.status_changed",
+                "note.created",
+                "applicant.deleted",
+            ],
+        )
+        self.assertEqual(rows[0].payload["email"], self.data["email"])
+        self.assertEqual(
+            rows[1].payload,
+            {
+                "applicant": created.json()["id"],
+                "status": "APPROVED",
+                "previous": "PENDING",
+            },
+        )
+
+    def test_async_views_queue_events(self):
+        with override_settings(WEBHOOK_ENDPOINTS=[self.stand_in.url]):
+            created = self.client.post(
+                "/api/async/applicant/", self.data, format="json"
+            )
+            self.client.post(
+                f"/api/async/applicant/{created.json()['id']}/note/",
+                {"title": "Bounty", "content": "Woolong"},
+                format="json",
+            )
+
+        self.assertEqual(
+            list(OutboxModel.objects.order_by("id").values_list("event", flat=True)),
+            ["applicant.created", "note.created"],
+        )
+
+    def test_failed_write_queues_nothing(self):
+        with override_settings(WEBHOOK_ENDPOINTS=[self.stand_in.url]):
+            self.client.post("/api/applicant/", {**self.data, "email": "bogus"})
+            self.client.put("/api/applicant/999/", {"status": "APPROVED"})
+
+        self.assertFalse(OutboxModel.objects.exists())
+
+    def test_nothing_is_queued_without_endpoints(self):
+        with override_settings(WEBHOOK_ENDPOINTS=[]):
+            self.client.post("/api/applicant/", self.data, format="json")
+
+        self.assertFalse(OutboxModel.objects.exists())
+
+    def test_dispatch_batches_per_endpoint(self):
+        other = WebhookStandIn()
+        self.addCleanup(other.close)
+        self.queue(5)
+        self.queue(2, endpoint=other.url)
+
+        delivered, failed = OutboxDispatcher(batch_size=2).dispatch()
+
+        self.assertEqual((delivered, failed), (7, 0))
+        self.assertEqual(
+            [len(body["events"]) for body in self.stand_in.bodies], [2, 2, 1]
+        )
+        self.assertEqual(
+            [event["data"]["n"] for event in self.stand_in.events], [0, 1, 2, 3, 4]
+        )
+        self.assertEqual(len(other.bodies), 1)
+        self.assertFalse(OutboxModel.objects.exists())
+
+    def test_failed_delivery_is_retried_later(self):
+        self.stand_in.status = 503
+        self.queue(3)
+
+        delivered, failed = OutboxDispatcher().dispatch()
+        again = OutboxDispatcher().dispatch()
+
+        self.assertEqual((delivered, failed), (0, 3))
+        self.assertEqual(again, (0, 0))
+        row = OutboxModel.objects.first()
+        self.assertEqual(row.attempts, 1)
+        self.assertIn("503", row.last_error)
+        self.assertGreater(row.next_attempt_at, timezone.now())
+        self.assertIsNone(row.failed_at)
+
+    def test_batches_after_a_failure_wait_for_the_retry(self):
+        self.queue(6)
+        dispatcher = OutboxDispatcher(batch_size=2, max_attempts=1)
+        posts = []
+
+        def send(endpoint, rows, timeout):
+            posts.append(len(rows))
+            if len(posts) == 2:
+                raise OSError("connection reset")
+
+        with mock.patch("api.outbox.post_events", side_effect=send):
+            delivered, failed = dispatcher.dispatch()
+
+        self.assertEqual(posts, [2, 2])
+        self.assertEqual((delivered, failed), (2, 4))
+        rows = list(OutboxModel.objects.order_by("id"))
+        # Only the batch that was posted used up its attempt
+        self.assertEqual([row.attempts for row in rows], [1, 1, 0, 0])
+        self.assertEqual(
+            [row.failed_at is None for row in rows], [False, False, True, True]
+        )
+        self.assertEqual(rows[2].last_error, "")
+
+    def test_newer_rows_wait_for_an_older_retry(self):
+        self.stand_in.status = 503
+        self.queue(1)
+        OutboxDispatcher().dispatch()
+        self.stand_in.status = 200
+        self.stand_in.bodies.clear()
+        self.queue(1)
+
+        held = OutboxDispatcher().dispatch()
+        OutboxModel.objects.update(next_attempt_at=timezone.now())
+        sent = OutboxDispatcher().dispatch()
+
+        self.assertEqual(held, (0, 0))
+        self.assertEqual(sent, (2, 0))
+        self.assertEqual([event["data"]["n"] for event in self.stand_in.events], [0, 0])
+        self.assertEqual(
+            [event["id"] for event in self.stand_in.events],
+            sorted(event["id"] for event in self.stand_in.events),
+        )
+
+    def test_claim_skips_rows_behind_an_unclaimed_older_row(self):
+        self.queue(3)
+        first = OutboxModel.objects.order_by("id").first()
+
+        # Past the claim limit of the round
+        rows = OutboxDispatcher(batch_size=1, concurrency=1).claim()
+        self.assertEqual([row.id for row in rows], [first.id])
+
+        # Leased by another dispatcher, so the rows after it wait
+        self.assertEqual(OutboxDispatcher().claim(), [])
+
+    def test_delivery_is_given_up_after_max_attempts(self):
+        self.queue(1, endpoint="http://127.0.0.1:1/unreachable")
+
+        OutboxDispatcher(max_attempts=1, timeout=1).dispatch()
+
+        row = OutboxModel.objects.get()
+        self.assertIsNotNone(row.failed_at)
+        self.assertEqual(row.attempts, 1)
+
+    def test_command_delivers_and_requeues_failed(self):
+        self.queue(3)
+        OutboxModel.objects.update(failed_at=timezone.now(), attempts=10)
+        out = StringIO()
+
+        call_command("dispatchoutbox", "--retry-failed", stdout=out)
+
+        self.assertIn("Delivered 3 event(s), 0 failed", out.getvalue())
+        self.assertEqual(len(self.stand_in.events), 3)
+        self.assertFalse(OutboxModel.objects.exists())
+
+
+class OutboxLeaseTests(APITransactionTestCase):
+    def test_no_transaction_is_open_while_posting(self):
+        with override_settings(WEBHOOK_ENDPOINTS=["http://a.test/hook"]):
+            queue_events([("test.event", {})])
+        seen = []
+
+        def send(endpoint, rows, timeout):
+            # Runs on a pool thread with a connection of its own
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_stat_activity WHERE datname = "
+                        "current_database() AND state = 'idle in transaction'"
+                    )
+                    seen.append(cursor.fetchone()[0])
+                # The leased row is not due for another dispatcher
+                seen.append(OutboxDispatcher().claim())
+            finally:
+                connection.close()
+
+        with mock.patch("api.outbox.post_events", side_effect=send):
+            delivered, failed = OutboxDispatcher().dispatch()
+
+        self.assertEqual(seen, [0, []])
+        self.assertEqual((delivered, failed), (1, 0))
+        self.assertFalse(OutboxModel.objects.exists())
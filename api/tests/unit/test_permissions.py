@@ -0,0 +1,101 @@
+import threading
+from types import SimpleNamespace
+
+from django.contrib.auth.models import Group, Permission, User
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+from api.permissions import ApplicantPermissions, NotePermissions
+
+
+class PermissionCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+
+        self.view_applicant = Permission.objects.get(codename="view_applicant")
+        self.view_note = Permission.objects.get(codename="view_note")
+
+    def has_permission(self, permission_class, method="GET", user=None):
+        request = SimpleNamespace(method=method, user=user or self.user)
+        return permission_class().has_permission(request, None)
+
+    def test_permission_check_costs_no_queries_once_cached(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.assertTrue(self.has_permission(ApplicantPermissions))
+
+        user = User.objects.get(id=self.user.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(self.has_permission(ApplicantPermissions, user=user))
+            self.assertFalse(
+                self.has_permission(ApplicantPermissions, method="POST", user=user)
+            )
+
+    def test_adding_user_permission_invalidates_cache(self):
+        self.assertFalse(self.has_permission(NotePermissions))
+
+        self.user.user_permissions.add(self.view_note)
+
+        self.assertTrue(self.has_permission(NotePermissions))
+
+    def test_removing_permission_from_reverse_side_invalidates_cache(self):
+        self.user.user_permissions.set([self.view_note])
+        self.assertTrue(self.has_permission(NotePermissions))
+
+        self.view_note.user_set.remove(self.user)
+
+        self.assertFalse(self.has_permission(NotePermissions))
+
+    def test_group_changes_invalidate_cache(self):
+        group = Group.objects.create(name="reviewers")
+        self.user.groups.add(group)
+        self.assertFalse(self.has_permission(ApplicantPermissions))
+
+        group.permissions.add(self.view_applicant)
+        self.assertTrue(self.has_permission(ApplicantPermissions))
+
+        self.user.groups.remove(group)
+        self.assertFalse(self.has_permission(ApplicantPermissions))
+
+    def test_deactivating_user_invalidates_cache(self):
+        self.user.user_permissions.set([self.view_applicant])
+        self.assertTrue(self.has_permission(ApplicantPermissions))
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertFalse(self.has_permission(ApplicantPermissions))
+
+    def test_superuser_has_every_permission(self):
+        superuser = User.objects.create_superuser("admin", "admin@test.com", "password")
+
+        self.assertTrue(self.has_permission(ApplicantPermissions, "DELETE", superuser))
+        self.assertTrue(self.has_permission(NotePermissions, "POST", superuser))
+
+
+class PermissionCacheCommitTests(TransactionTestCase):
+    def test_permissions_cached_before_commit_are_invalidated(self):
+        user = User.objects.create_user("test_user", "user@test.com", "password")
+        user.user_permissions.set([Permission.objects.get(codename="view_note")])
+        revoked, committed = threading.Event(), threading.Event()
+
+        def revoke():
+            try:
+                with transaction.atomic():
+                    User.objects.get(id=user.id).user_permissions.clear()
+                    revoked.set()
+                    committed.wait(5)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=revoke)
+        thread.start()
+        revoked.wait(5)
+        # A request during the revoking transaction sees the new version but
+        # still reads the permissions it has not committed yet
+        request = SimpleNamespace(method="GET", user=User.objects.get(id=user.id))
+        self.assertTrue(NotePermissions().has_permission(request, None))
+        committed.set()
+        thread.join(5)
+
+        request = SimpleNamespace(method="GET", user=User.objects.get(id=user.id))
+        self.assertFalse(NotePermissions().has_permission(request, None))
@@ -0,0 +1,64 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from api.counters import find_drift
+from api.management.commands.seedapplicants import applicant_rows, note_rows
+from api.models import ApplicantModel, NoteModel
+
+
+class SeedApplicantsTests(TestCase):
+    def test_seeds_applicants_and_notes(self):
+        existing = ApplicantModel.objects.create(
+            first_name="Spike",
+            last_name="Spiegel",
+            email="spike.spiegel@bebop.com",
+            phone_number="123-456-7890",
+            address="123 Cowboy Pl",
+            zip_code="10000",
+            state="New York",
+        )
+
+        call_command(
+            "seedapplicants",
+            "--applicants=30",
+            "--notes-per-applicant=3",
+            "--workers=1",
+            "--chunk-size=7",
+            stdout=StringIO(),
+        )
+
+        seeded = ApplicantModel.objects.exclude(id=existing.id)
+        self.assertEqual(seeded.count(), 30)
+        self.assertEqual(
+            set(
+                NoteModel.objects.values("applicant")
+                .annotate(count=Count("id"))
+                .values_list("count", flat=True)
+            ),
+            {3},
+        )
+        self.assertEqual(NoteModel.objects.count(), 90)
+        self.assertEqual(find_drift(), {})
+
+        # Applicants created afterwards do not collide with the seeded ids
+        ApplicantModel.objects.create(
+            first_name="Jet",
+            last_name="Black",
+            email="jet.black@bebop.com",
+            phone_number="123-456-7890",
+            address="123 Cowboy Pl",
+            zip_code="10000",
+            state="New York",
+        )
+
+    def test_rows_are_deterministic(self):
+        self.assertEqual(
+            list(applicant_rows(1, 100, 5)), list(applicant_rows(1, 100, 5))
+        )
+        self.assertNotEqual(
+            list(applicant_rows(1, 100, 5)), list(applicant_rows(2, 100, 5))
+        )
+        self.assertEqual(list(note_rows(1, 100, 2, 3)), list(note_rows(1, 100, 2, 3)))
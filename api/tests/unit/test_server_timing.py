@@ -0,0 +1,111 @@
+import json
+
+from django.contrib.auth.models import Permission, User
+from django.test import AsyncClient, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import ApplicantModel
+from api.tokens import issue_token
+
+
+class ServerTimingTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            Permission.objects.filter(
+                codename__in=["view_applicant", "create_applicant"]
+            )
+        )
+        self.client.force_authenticate(self.user)
+
+        self.data = {
+            "first_name": "Spike",
+            "last_name": "Spiegel",
+            "email": "spike.spiegel@bebop.com",
+            "phone_number": "123-456-7890",
+            "address": "123 Cowboy Pl",
+            "zip_code": "10000",
+            "state": "New York",
+        }
+        ApplicantModel.objects.create(**self.data)
+
+    def parse_server_timing(self, header):
+        metrics = {}
+        for metric in header.split(", "):
+            name, *params = metric.split(";")
+            metrics[name] = dict(param.split("=", 1) for param in params)
+        return metrics
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    def test_sampled_request(self):
+        with self.assertLogs("api.timing", level="INFO") as logs:
+            response = self.client.get("/api/applicant/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = self.parse_server_timing(response["Server-Timing"])
+        self.assertEqual(set(metrics), {"db", "serialize", "render", "total"})
+        for metric in metrics.values():
+            self.assertGreaterEqual(float(metric["dur"]), 0)
+        self.assertGreater(float(metrics["render"]["dur"]), 0)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["path"], "/api/applicant/")
+        self.assertEqual(record["status"], status.HTTP_200_OK)
+        self.assertGreaterEqual(record["queries"], 1)
+        self.assertEqual(metrics["db"]["desc"], f'"{record["queries"]} queries"')
+        self.assertGreaterEqual(record["total_ms"], record["db_ms"])
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    async def test_sampled_async_request(self):
+        token, _ = issue_token(self.user)
+
+        with self.assertLogs("api.timing", level="INFO") as logs:
+            response = await AsyncClient().get(
+                "/api/async/applicant/", headers={"Authorization": f"Bearer {token}"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["path"], "/api/async/applicant/")
+        self.assertGreaterEqual(record["queries"], 1)
+        self.assertGreater(record["serialize_ms"], 0)
+        self.assertGreater(record["render_ms"], 0)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    def test_sampled_create(self):
+        data = {**self.data, "email": "jet.black@bebop.com"}
+
+        with self.assertLogs("api.timing", level="INFO") as logs:
+            response = self.client.post("/api/applicant/", data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertGreater(record["serialize_ms"], 0)
+        self.assertGreater(record["render_ms"], 0)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    async def test_sampled_async_create(self):
+        token, _ = issue_token(self.user)
+        data = {**self.data, "email": "jet.black@bebop.com"}
+
+        with self.assertLogs("api.timing", level="INFO") as logs:
+            response = await AsyncClient().post(
+                "/api/async/applicant/",
+                data,
+                content_type="application/json",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertGreater(record["serialize_ms"], 0)
+        self.assertGreater(record["render_ms"], 0)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_request(self):
+        with self.assertNoLogs("api.timing", level="INFO"):
+            response = self.client.get("/api/applicant/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", response)
@@ -0,0 +1,129 @@
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import ApplicantModel, NoteModel
+
+
+class SparseFieldsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user", "user@test.com", "password")
+        self.user.user_permissions.set(
+            Permission.objects.filter(codename__in=["view_applicant", "view_note"])
+        )
+        self.client.force_authenticate(self.user)
+
+        self.applicants = [
+            ApplicantModel.objects.create(
+                first_name=first_name,
+                last_name=last_name,
+                email=f"{first_name.lower()}@bebop.com",
+                phone_number="123-456-7890",
+                address="123 Cowboy Pl",
+                zip_code="10000",
+                state="New York",
+            )
+            for first_name, last_name in (("Spike", "Spiegel"), ("Jet", "Black"))
+        ]
+        self.spike = self.applicants[0]
+        NoteModel.objects.create(
+            applicant=self.spike, title="Interview", content="Went well"
+        )
+
+    def select_sql(self, queries, table):
+        return " ".join(
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT") and f'FROM "{table}"' in query["sql"]
+        )
+
+    def test_list_selects_only_requested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/api/applicant/", {"fields": "id,uuid,full_name,status"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"][0],
+            {
+                "id": self.spike.id,
+                "uuid": str(self.spike.uuid),
+                "status": "PENDING",
+                "full_name": "Spike Spiegel",
+            },
+        )
+        sql = self.select_sql(queries, ApplicantModel._meta.db_table)
+        self.assertIn('"first_name"', sql)
+        self.assertNotIn('"address"', sql)
+        self.assertNotIn('"email"', sql)
+
+    def test_list_pages_without_id_field(self):
+        response = self.client.get(
+            "/api/applicant/", {"fields": "full_name", "page_size": 1}
+        )
+        next_page = self.client.get(response.json()["next"])
+
+        self.assertEqual(response.json()["results"], [{"full_name": "Spike Spiegel"}])
+        self.assertEqual(next_page.json()["results"], [{"full_name": "Jet Black"}])
+
+    def test_unknown_fields_are_rejected(self):
+        for fields in ("id,deleted_at", "search_vector", " , "):
+            response = self.client.get("/api/applicant/", {"fields": fields})
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("fields", response.json())
+
+    def test_detail_projects_cached_payload(self):
+        url = f"/api/applicant/{self.spike.id}/"
+        full = self.client.get(url)
+        response = self.client.get(url, {"fields": "status,full_name"})
+
+        self.assertEqual(
+            response.json(), {"status": "PENDING", "full_name": "Spike Spiegel"}
+        )
+        self.assertNotEqual(response["ETag"], full["ETag"])
+
+        not_modified = self.client.get(
+            url, {"fields": "status,full_name"}, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_notes_select_only_requested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f"/api/applicant/{self.spike.id}/note/", {"fields": "title"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"], [{"title": "Interview"}])
+        self.assertNotIn('"content"', self.select_sql(queries, "api_notemodel"))
+
+    def test_export_header_follows_fields(self):
+        response = self.client.get(
+            "/api/applicant/export/", {"format": "csv", "fields": "id,full_name"}
+        )
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,full_name")
+        self.assertEqual(lines[1], f"{self.spike.id},Spike Spiegel")
+
+    def test_async_views_accept_fields(self):
+        listing = self.client.get("/api/async/applicant/", {"fields": "full_name"})
+        detail = self.client.get(
+            f"/api/async/applicant/{self.spike.id}/", {"fields": "id,status"}
+        )
+        notes = self.client.get(
+            f"/api/async/applicant/{self.spike.id}/note/", {"fields": "content"}
+        )
+        invalid = self.client.get("/api/async/applicant/", {"fields": "password"})
+
+        self.assertEqual(
+            listing.json()["results"],
+            [{"full_name": "Spike Spiegel"}, {"full_name": "Jet Black"}],
+        )
+        self.assertEqual(detail.json(), {"id": self.spike.id, "status": "PENDING"})
+        self.assertEqual(notes.json()["results"], [{"content": "Went well"}])
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,174 @@
+import json
+import logging
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger("api.timing")
+
+# Timings of the sampled request being handled, None when not sampled
+current_timings = ContextVar("current_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Query count and seconds spent per phase of one request
+    """
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.queries = 0
+        self.durations = {"db": 0.0, "serialize": 0.0, "render": 0.0}
+
+    def add(self, name, seconds):
+        self.durations[name] += seconds
+
+    def record_query(self, execute, sql, params, many, context):
+        """
+        connection.execute_wrapper hook counting queries and their time
+        """
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add("db", perf_counter() - started)
+
+    def total(self):
+        return perf_counter() - self.started
+
+    def server_timing(self, total):
+        """
+        Value of the Server-Timing header, durations in milliseconds
+        """
+        metrics = [
+            f'db;dur={self.durations["db"] * 1000:.2f};desc="{self.queries} queries"',
+            f'serialize;dur={self.durations["serialize"] * 1000:.2f}',
+            f'render;dur={self.durations["render"] * 1000:.2f}',
+            f"total;dur={total * 1000:.2f}",
+        ]
+        return ", ".join(metrics)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    connection.execute_wrapper hook installed on every connection, see
+    api.signals. Database connections belong to a thread, so under ASGI the
+    queries of a request run on connections its middleware never sees. The
+    ContextVar follows the request into sync_to_async threads instead.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.record_query(execute, sql, params, many, context)
+
+
+@contextmanager
+def timed(name):
+    """
+    Add the time spent in the block to the `name` phase of the current
+    request, or do nothing when the request is not sampled. Queries run in
+    the block, e.g. by validators, count towards db only.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = perf_counter()
+    db = timings.durations["db"]
+    try:
+        yield
+    finally:
+        queries = timings.durations["db"] - db
+        timings.add(name, perf_counter() - started - queries)
+
+
+class ServerTimingMiddleware:
+    """
+    Measures a sample of requests, SERVER_TIMING_SAMPLE_RATE of them, and
+    reports the number of SQL queries, the time spent in the database, in
+    serializers and in rendering as a Server-Timing header and a JSON log
+    line on the api.timing logger. Requests that are not sampled only cost
+    a random number.
+
+    Must come first in MIDDLEWARE, so that its process_template_response
+    runs last, immediately before the response is rendered. Async views
+    render themselves and time it with timed("render"). Works in both sync
+    and async chains.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        with self.measure(timings):
+            response = self.get_response(request)
+        return self.report(request, response, timings)
+
+    async def __acall__(self, request):
+        if random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        timings = RequestTimings()
+        with self.measure(timings):
+            response = await self.get_response(request)
+        return self.report(request, response, timings)
+
+    @contextmanager
+    def measure(self, timings):
+        """
+        Helper method to make timings the current ones while the block runs,
+        record_query then adds the queries of the request to them
+        """
+        token = current_timings.set(timings)
+        try:
+            yield
+        finally:
+            current_timings.reset(token)
+
+    def report(self, request, response, timings):
+        """
+        Helper method to add the Server-Timing header and log the timings
+        """
+        total = timings.total()
+        response["Server-Timing"] = timings.server_timing(total)
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "queries": timings.queries,
+                    **{
+                        f"{name}_ms": round(seconds * 1000, 2)
+                        for name, seconds in timings.durations.items()
+                    },
+                    "total_ms": round(total * 1000, 2),
+                }
+            )
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        timings = current_timings.get()
+        if timings is not None:
+            started = perf_counter()
+            response.add_post_render_callback(
+                lambda response: timings.add("render", perf_counter() - started)
+            )
+        return response
@@ -0,0 +1,141 @@
+import secrets
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from rest_framework import authentication, exceptions
+
+from api.permissions import (
+    GLOBAL_PERMISSION_VERSION_KEY,
+    get_cached_permissions,
+    get_user_permission_version,
+    join_versions,
+    permission_cache_key,
+    seeded_versions,
+    user_permission_version_key,
+)
+
+KEYWORD = "Bearer"
+SALT = "api.tokens"
+
+
+def revoked_key(jti):
+    return f"api:token-revoked:{jti}"
+
+
+def issue_token(user):
+    """
+    Return a signed token for the user and the time it expires at, as a
+    Unix timestamp. The token carries the user id and the user's permission
+    version, so it stops working as soon as the user is changed, deactivated
+    or deleted.
+    """
+    expires = int(time.time()) + settings.API_TOKEN_MAX_AGE
+    payload = {
+        "uid": user.pk,
+        "pv": get_user_permission_version(user.pk),
+        "jti": secrets.token_urlsafe(16),
+        "exp": expires,
+    }
+    return signing.dumps(payload, salt=SALT, compress=True), expires
+
+
+def read_token(token):
+    """
+    Return the payload of a token, raising AuthenticationFailed when its
+    signature is invalid or it has expired
+    """
+    try:
+        payload = signing.loads(token, salt=SALT)
+    except signing.BadSignature:
+        raise exceptions.AuthenticationFailed("Invalid token")
+    if payload["exp"] <= time.time():
+        raise exceptions.AuthenticationFailed("Token has expired")
+    return payload
+
+
+def revoke_token(payload):
+    """
+    Deny the token until it would have expired anyway
+    """
+    remaining = payload["exp"] - int(time.time())
+    if remaining > 0:
+        cache.set(revoked_key(payload["jti"]), True, remaining)
+
+
+class SignedTokenAuthentication(authentication.BaseAuthentication):
+    """
+    Authenticates requests with an `Authorization: Bearer <token>` header
+    holding a token from issue_token.
+
+    The signature and expiry are checked without any lookup. One cache
+    round trip fetches the deny-list entry of the token and the global and
+    user permission versions, a second the cached permission entry of that
+    version. The user is built from the entry and carries it, so the
+    permission checks of the request reuse it and nothing is read from the
+    database. Only a cold permission cache loads the user. request.auth is
+    the token payload.
+
+    The versions must be shared by every worker, see api.checks.
+    """
+
+    def authenticate(self, request):
+        header = request.headers.get("Authorization", "").split()
+        if not header or header[0].lower() != KEYWORD.lower():
+            return None
+        if len(header) != 2:
+            raise exceptions.AuthenticationFailed("Invalid token header")
+
+        payload = read_token(header[1])
+        deny_key = revoked_key(payload["jti"])
+        version_key = user_permission_version_key(payload["uid"])
+        entries = cache.get_many([deny_key, GLOBAL_PERMISSION_VERSION_KEY, version_key])
+        if deny_key in entries:
+            raise exceptions.AuthenticationFailed("Token has been revoked")
+        # A lost version is seeded anew, which also invalidates the token
+        if entries.get(version_key) != payload["pv"]:
+            raise exceptions.AuthenticationFailed("Token is stale, obtain a new one")
+        global_version = entries.get(GLOBAL_PERMISSION_VERSION_KEY)
+        if global_version is None:
+            global_version = seeded_versions([GLOBAL_PERMISSION_VERSION_KEY])[0]
+        key = permission_cache_key(
+            payload["uid"], join_versions(global_version, payload["pv"])
+        )
+        return self.get_user(payload["uid"], key), payload
+
+    def get_user(self, user_id, key):
+        """
+        Helper method to build the user from its cached permission entry,
+        loading it from the database only on a cache miss
+        """
+        User = get_user_model()
+        entry = cache.get(key)
+        if entry is None:
+            try:
+                user = User.objects.get(pk=user_id)
+            except User.DoesNotExist:
+                raise exceptions.AuthenticationFailed("Invalid token")
+            entry = get_cached_permissions(user, key)
+        else:
+            user = User(
+                pk=user_id,
+                is_active=entry["is_active"],
+                is_staff=entry.get("is_staff", False),
+                is_superuser=entry["is_superuser"],
+            )
+            # Not a new row, so it can be assigned to foreign keys
+            user._state.adding = False
+            user._state.db = User.objects.db
+        if not entry["is_active"]:
+            raise exceptions.AuthenticationFailed("User inactive or deleted")
+        user.permission_entry = entry
+        return user
+
+    def authenticate_header(self, request):
+        # Only challenge clients that tried a token, so requests without
+        # credentials keep getting 403 like before
+        if request.headers.get("Authorization", "").lower().startswith("bearer"):
+            return f'{KEYWORD} realm="api"'
+        return None
@@ -1,8 +1,31 @@
 from django.urls import path
-from api import views
+from api import async_views, views
 
 urlpatterns = [
+    path("stats/", views.ServerStatsApiView.as_view()),
+    path("token/", views.TokenObtainApiView.as_view()),
+    path("token/revoke/", views.TokenRevokeApiView.as_view()),
     path("applicant/", views.ApplicantListApiView.as_view()),
+    path("applicant/bulk/", views.ApplicantBulkApiView.as_view()),
+    path("applicant/status/", views.ApplicantStatusApiView.as_view()),
+    path("applicant/import/", views.ApplicantImportApiView.as_view()),
+    path(
+        "applicant/import/<uuid:id>/errors/",
+        views.ApplicantImportErrorsApiView.as_view(),
+    ),
+    path("applicant/search/", views.ApplicantSearchApiView.as_view()),
+    path("applicant/export/", views.ApplicantExportApiView.as_view()),
+    path("applicant/stats/", views.ApplicantStatsApiView.as_view()),
     path("applicant/<int:id>/", views.ApplicantDetailApiView.as_view()),
     path("applicant/<int:id>/note/", views.ApplicantNoteListApiView.as_view()),
+    path("async/applicant/", async_views.AsyncApplicantListView.as_view()),
+    path(
+        "async/applicant/changes/",
+        async_views.AsyncApplicantChangeFeedView.as_view(),
+    ),
+    path("async/applicant/<int:id>/", async_views.AsyncApplicantDetailView.as_view()),
+    path(
+        "async/applicant/<int:id>/note/",
+        async_views.AsyncApplicantNoteListView.as_view(),
+    ),
 ]
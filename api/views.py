@@ -1,10 +1,61 @@
-from rest_framework import permissions, status
+from datetime import datetime, timezone
+
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from rest_framework import permissions, serializers, status
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from api.models import ApplicantModel, NoteModel
-from api.permissions import ApplicantPermissions, NotePermissions
-from api.serializers import ApplicantSerializer, NoteSerializer
+from api.cache import applicant_cache
+from api.conditional import (
+    get_not_modified_response,
+    has_preconditions,
+    make_etag,
+    set_validators,
+)
+from api.connections import connection_stats
+from api.counters import (
+    get_counts,
+    record_created,
+    record_status_changes,
+)
+from api.deletion import delete_applicant
+from api.idempotency import idempotent
+from api.imports import (
+    ERROR_REPORT_FIELDS,
+    error_report_rows,
+    import_applicants,
+    unique_email_message,
+)
+from api.models import ApplicantImportModel, ApplicantModel, NoteModel
+from api.outbox import queue_created, queue_note_created, queue_status_changes
+from api.pagination import ApplicantCursorPagination, NoteCursorPagination
+from api.parsers import CSVUploadParser, NDJSONParser, ORJSONParser
+from api.permissions import (
+    ApplicantPermissions,
+    NotePermissions,
+    bump_permission_version,
+    has_cached_perm,
+)
+from api.renderers import CSVRenderer, NDJSONRenderer
+from api.search import search_applicants
+from api.serializers import (
+    APPLICANT_CREATE_FIELDS,
+    ApplicantBulkSerializer,
+    ApplicantFilterSerializer,
+    ApplicantSearchSerializer,
+    ApplicantSerializer,
+    ApplicantStatusTransitionSerializer,
+    NoteSerializer,
+    SparseFieldsSerializer,
+    TokenObtainSerializer,
+    fast_applicant_serializer,
+    fast_note_serializer,
+)
+from api.timing import timed
+from api.tokens import issue_token, revoke_token
 
 
 class ApplicantListApiView(APIView):
@@ -12,104 +63,519 @@ class ApplicantListApiView(APIView):
 
     def get(self, request, *args, **kwargs):
         """
-        Return all ApplicantModels
+        Return a page of ApplicantModels ordered by id, optionally filtered
+        by status, state, zip_code and email prefix, with only the columns
+        of the `?fields=` requested. The `next` and `previous` links carry an
+        opaque cursor for the adjacent pages
         """
-        applicants = ApplicantModel.objects.all()
-        serializer = ApplicantSerializer(applicants, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        filters = ApplicantFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+        sparse = SparseFieldsSerializer(
+            fast_applicant_serializer, data=request.query_params
+        )
+        if not sparse.is_valid():
+            return Response(sparse.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = sparse.get_fast_serializer()
+        paginator = ApplicantCursorPagination()
+        applicants = paginator.paginate_queryset(
+            filters.filter_queryset(ApplicantModel.objects.all()).values(
+                *serializer.columns_with("id")
+            ),
+            request,
+            view=self,
+        )
+        return paginator.get_paginated_response(serializer.many(applicants))
 
+    @idempotent
     def post(self, request, *args, **kwargs):
         """
         Create an ApplicantModel
         """
-        data = {
-            "first_name": request.data.get("first_name"),
-            "last_name": request.data.get("last_name"),
-            "email": request.data.get("email"),
-            "phone_number": request.data.get("phone_number"),
-            "address": request.data.get("address"),
-            "zip_code": request.data.get("zip_code"),
-            "state": request.data.get("state"),
-        }
+        data = {field: request.data.get(field) for field in APPLICANT_CREATE_FIELDS}
         serializer = ApplicantSerializer(data=data)
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                applicant = serializer.save()
+                record_created([applicant])
+                queue_created([applicant])
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class ApplicantBulkApiView(APIView):
+    permission_classes = [permissions.IsAuthenticated, ApplicantPermissions]
+    parser_classes = [ORJSONParser, NDJSONParser]
+
+    # Largest number of applicants accepted in one request
+    max_items = 10000
+    # Rows per INSERT statement issued by bulk_create
+    batch_size = 1000
+
+    @idempotent
+    def post(self, request, *args, **kwargs):
+        """
+        Create many ApplicantModels from a JSON array or an NDJSON body.
+        Every item is validated, email uniqueness is checked for the whole
+        batch with a single query and the valid items are inserted with
+        bulk_create. The response reports the outcome of each item by index
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {"res": "Expected a list of applicants"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.max_items:
+            return Response(
+                {"res": f"Cannot create more than {self.max_items} applicants"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = [None] * len(items)
+        valid = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = self.failure(
+                    index, {"non_field_errors": ["Expected an applicant object"]}
+                )
+                continue
+            serializer = ApplicantBulkSerializer(
+                data={field: item.get(field) for field in APPLICANT_CREATE_FIELDS}
+            )
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = self.failure(index, serializer.errors)
+
+        # Soft-deleted applicants keep their email until they are purged
+        existing = set(
+            ApplicantModel.all_objects.filter(
+                email__in={data["email"] for _, data in valid}
+            ).values_list("email", flat=True)
+        )
+        pending = []
+        for index, data in valid:
+            if data["email"] in existing:
+                results[index] = self.failure(
+                    index, {"email": [unique_email_message()]}
+                )
+                continue
+            existing.add(data["email"])
+            pending.append((index, ApplicantModel(**data)))
+
+        try:
+            with transaction.atomic():
+                created = ApplicantModel.objects.bulk_create(
+                    [applicant for _, applicant in pending],
+                    batch_size=self.batch_size,
+                )
+                record_created(created)
+                queue_created(created)
+        except IntegrityError:
+            return Response(
+                {"res": "Applicants were created concurrently, retry the request"},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        serializer = ApplicantSerializer()
+        for (index, _), applicant in zip(pending, created):
+            results[index] = {
+                "index": index,
+                "status": status.HTTP_201_CREATED,
+                "data": serializer.to_representation(applicant),
+            }
+
+        if len(created) == len(items):
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {
+                "created": len(created),
+                "failed": len(items) - len(created),
+                "results": results,
+            },
+            status=response_status,
+        )
+
+    def failure(self, index, errors):
+        """
+        Helper method to build the result of an item that was not created
+        """
+        return {"index": index, "status": status.HTTP_400_BAD_REQUEST, "errors": errors}
+
+
+class ApplicantImportApiView(APIView):
+    permission_classes = [permissions.IsAuthenticated, ApplicantPermissions]
+    parser_classes = [CSVUploadParser, MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Import ApplicantModels from a CSV file, sent either as a text/csv
+        body or as the `file` field of a multipart form. Valid rows are
+        loaded with COPY and merged in a single INSERT, rejected rows can be
+        downloaded from the error report
+        """
+        if isinstance(request.data, dict):
+            stream = request.data.get("file")
+        else:
+            stream = request.data
+        if stream is None:
+            return Response(
+                {"file": ["No CSV file was submitted"]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            applicant_import = import_applicants(stream, user=request.user)
+        except serializers.ValidationError as exc:
+            return Response(exc.detail, status=status.HTTP_400_BAD_REQUEST)
+        except UnicodeDecodeError:
+            return Response(
+                {"file": ["The CSV file must be UTF-8 encoded"]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {
+                "id": applicant_import.uuid,
+                "rows": applicant_import.rows,
+                "imported": applicant_import.imported,
+                "rejected": applicant_import.rejected,
+                "errors": request.build_absolute_uri(
+                    f"/api/applicant/import/{applicant_import.uuid}/errors/"
+                ),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class ApplicantImportErrorsApiView(APIView):
+    permission_classes = [permissions.IsAuthenticated, ApplicantPermissions]
+
+    def get(self, request, id, *args, **kwargs):
+        """
+        Stream the rejected rows of an import as CSV, each with its line in
+        the uploaded file and the reasons it was rejected
+        """
+        applicant_import = ApplicantImportModel.objects.filter(uuid=id).first()
+        if not applicant_import:
+            return Response(
+                {"res": "Object with id does not exists"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        renderer = CSVRenderer()
+        response = StreamingHttpResponse(
+            renderer.stream(error_report_rows(applicant_import), ERROR_REPORT_FIELDS),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="applicant-import-{id}-errors.csv"'
+        )
+        return response
+
+
+class ApplicantStatusApiView(APIView):
+    permission_classes = [permissions.IsAuthenticated, ApplicantPermissions]
+
+    def put(self, request, *args, **kwargs):
+        """
+        Move every ApplicantModel matching the given ids and/or filter to the
+        given status with a single UPDATE and return how many changed
+        """
+        serializer = ApplicantStatusTransitionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        applicants = ApplicantModel.objects.all()
+        if "ids" in serializer.validated_data:
+            applicants = applicants.filter(id__any=serializer.validated_data["ids"])
+        applicants = applicants.filter(**serializer.validated_data.get("filter", {}))
+
+        with transaction.atomic():
+            changed = applicants.update_status(serializer.validated_data["status"])
+            record_status_changes(
+                [previous for _, previous in changed],
+                serializer.validated_data["status"],
+            )
+            queue_status_changes(changed, serializer.validated_data["status"])
+            applicant_cache.evict(*(id for id, _ in changed))
+        return Response({"updated": len(changed)}, status=status.HTTP_200_OK)
+
+
+class ApplicantExportApiView(APIView):
+    permission_classes = [permissions.IsAuthenticated, ApplicantPermissions]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    # Rows fetched per round trip from the server-side cursor
+    chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        """
+        Stream every ApplicantModel as NDJSON or CSV, selected with
+        `?format=ndjson|csv`, filtered and narrowed with `?fields=` like the
+        applicant list. Rows are read from a server-side cursor so memory use
+        does not grow with the size of the table
+        """
+        filters = ApplicantFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+        sparse = SparseFieldsSerializer(
+            fast_applicant_serializer, data=request.query_params
+        )
+        if not sparse.is_valid():
+            return Response(sparse.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = sparse.get_fast_serializer()
+        applicants = serializer.iterate(
+            filters.filter_queryset(ApplicantModel.objects.order_by("id"))
+            .values(*serializer.columns)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(applicants, serializer.field_names),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="applicants.{renderer.format}"'
+        )
+        return response
+
+
+class ApplicantSearchApiView(APIView):
+    permission_classes = [permissions.IsAuthenticated, ApplicantPermissions]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Full-text search applicants by name, email and address, and by the
+        content of their notes when the user may view notes. Returns ranked
+        applicant ids with a snippet of the best match
+        """
+        serializer = ApplicantSearchSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        results = search_applicants(
+            serializer.validated_data["q"],
+            limit=serializer.validated_data["limit"],
+            include_notes=has_cached_perm(request.user, "api.view_note"),
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+class ApplicantStatsApiView(APIView):
+    permission_classes = [permissions.IsAuthenticated, ApplicantPermissions]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Number of ApplicantModels per status and per state, read from the
+        counter table instead of counting the applicants themselves
+        """
+        return Response(get_counts(), status=status.HTTP_200_OK)
+
+
 class ApplicantDetailApiView(APIView):
     permission_classes = [permissions.IsAuthenticated, ApplicantPermissions]
 
-    def get_object(self, id):
+    def get_object(self, id, for_update=False):
         """
-        Helper method to get the object with id
+        Helper method to get the object with id, locking its row when
+        for_update is set
         """
+        applicants = ApplicantModel.objects.all()
+        if for_update:
+            applicants = applicants.select_for_update()
         try:
-            return ApplicantModel.objects.get(id=id)
+            return applicants.get(id=id)
         except ApplicantModel.DoesNotExist:
             return None
 
+    def get_payload(self, id):
+        """
+        Helper method to get the serialized object with id, bypassing the
+        database when it is cached
+        """
+        return applicant_cache.get(id, self.load_payload)
+
+    def load_payload(self, id):
+        """
+        Helper method to serialize the object with id on a cache miss
+        """
+        applicant = (
+            ApplicantModel.objects.filter(id=id)
+            .values(*fast_applicant_serializer.columns)
+            .first()
+        )
+        if not applicant:
+            return None
+        with timed("serialize"):
+            return fast_applicant_serializer.to_representation(applicant)
+
+    def get_version(self, id):
+        """
+        Helper method to get only the last modification time of the object
+        with id
+        """
+        return (
+            ApplicantModel.objects.filter(id=id)
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+
     def get(self, request, id: int, *args, **kwargs):
         """
-        Retrieves the ApplicantModel with given id
+        Retrieves the ApplicantModel with given id. Conditional requests
+        whose ETag or Last-Modified still match are answered with a 304
+        without serializing the object. `?fields=` narrows the cached payload
         """
-        applicant_instance = self.get_object(id)
-        if not applicant_instance:
+        sparse = SparseFieldsSerializer(
+            fast_applicant_serializer, data=request.query_params
+        )
+        if not sparse.is_valid():
+            return Response(sparse.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer = sparse.get_fast_serializer()
+
+        payload = applicant_cache.peek(id)
+        if payload is None and has_preconditions(request):
+            updated_at = self.get_version(id)
+            if updated_at is not None:
+                not_modified = get_not_modified_response(
+                    request,
+                    make_etag(id, updated_at, *serializer.etag_parts),
+                    updated_at,
+                )
+                if not_modified:
+                    return not_modified
+
+        if payload is None:
+            payload = self.get_payload(id)
+        if not payload:
             return Response(
                 {"res": "Object with id does not exists"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        serializer = ApplicantSerializer(applicant_instance)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        updated_at = parse_datetime(payload["updated_at"])
+        etag = make_etag(id, updated_at, *serializer.etag_parts)
+        not_modified = get_not_modified_response(request, etag, updated_at)
+        if not_modified:
+            return not_modified
+        return set_validators(
+            Response(serializer.project(payload), status=status.HTTP_200_OK),
+            etag,
+            updated_at,
+        )
 
     def put(self, request, id: int, *args, **kwargs):
         """
         Updates the ApplicantModel with given id if exists
         """
-        applicant_instance = self.get_object(id)
-        if not applicant_instance:
-            return Response(
-                {"res": "Object with id does not exists"},
-                status=status.HTTP_400_BAD_REQUEST,
+        with transaction.atomic():
+            applicant_instance = self.get_object(id, for_update=True)
+            if not applicant_instance:
+                return Response(
+                    {"res": "Object with id does not exists"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            previous_status = applicant_instance.status
+            data = {"status": request.data.get("status")}
+            serializer = ApplicantSerializer(
+                instance=applicant_instance, data=data, partial=True
             )
-        data = {"status": request.data.get("status")}
-        serializer = ApplicantSerializer(
-            instance=applicant_instance, data=data, partial=True
-        )
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            applicant = serializer.save()
+            if applicant.status != previous_status:
+                record_status_changes([previous_status], applicant.status)
+                queue_status_changes([(id, previous_status)], applicant.status)
+            applicant_cache.evict(id)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     def delete(self, request, id: int, *args, **kwargs):
         """
-        Deletes the ApplicantModel with given id if exists
+        Deletes the ApplicantModel with given id if exists. Its notes are
+        deleted by the database. With APPLICANT_SOFT_DELETE the applicant is
+        only hidden and purged later by purgeapplicants
         """
-        applicant_instance = self.get_object(id)
-        if not applicant_instance:
+        with transaction.atomic():
+            applicant_instance = self.get_object(id, for_update=True)
+            if not applicant_instance:
+                return Response(
+                    {"res": "Object with id does not exists"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            deleted = delete_applicant(applicant_instance)
+        if not deleted:
             return Response(
-                {"res": "Object with id does not exists"},
-                status=status.HTTP_400_BAD_REQUEST,
+                {"res": "Object scheduled for deletion"},
+                status=status.HTTP_202_ACCEPTED,
             )
-        applicant_instance.delete()
         return Response({"res": "Object deleted!"}, status=status.HTTP_200_OK)
 
 
 class ApplicantNoteListApiView(APIView):
     permission_classes = [permissions.IsAuthenticated, NotePermissions]
 
+    # Columns the pagination and page version read, whatever the fields
+    version_columns = ("id", "created_at", "updated_at")
+
     def get(self, request, id: int, *args, **kwargs):
         """
-        Return all NoteModels associated with the ApplicantModel of the given
-        id
+        Return a page of the NoteModels associated with the ApplicantModel of
+        the given id, newest first. Conditional requests are checked against
+        the ids and modification times of the page before any note is
+        serialized. `?fields=` narrows the columns read and returned
         """
-        applicant_notes = NoteModel.objects.filter(applicant__id=id)
-        serializer = NoteSerializer(applicant_notes, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        sparse = SparseFieldsSerializer(fast_note_serializer, data=request.query_params)
+        if not sparse.is_valid():
+            return Response(sparse.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer = sparse.get_fast_serializer()
 
+        applicant_notes = NoteModel.objects.filter(
+            applicant__id=id, applicant__deleted_at=None
+        )
+        if has_preconditions(request):
+            versions = NoteCursorPagination().paginate_queryset(
+                applicant_notes.values(*self.version_columns),
+                request,
+                view=self,
+            )
+            etag, updated_at = self.get_page_version(id, versions, serializer)
+            not_modified = get_not_modified_response(request, etag, updated_at)
+            if not_modified:
+                return not_modified
+
+        paginator = NoteCursorPagination()
+        notes = paginator.paginate_queryset(
+            applicant_notes.values(*serializer.columns_with(*self.version_columns)),
+            request,
+            view=self,
+        )
+        etag, updated_at = self.get_page_version(id, notes, serializer)
+        return set_validators(
+            paginator.get_paginated_response(serializer.many(notes)),
+            etag,
+            updated_at,
+        )
+
+    def get_page_version(self, id, notes, serializer):
+        """
+        Helper method to build the ETag and Last-Modified time of a page of
+        notes from its first and last ids and latest modification time
+        """
+        updated_at = max((note["updated_at"] for note in notes), default=None)
+        ids = [note["id"] for note in notes[:1] + notes[-1:]]
+        etag = make_etag(id, updated_at, len(notes), *ids, *serializer.etag_parts)
+        return etag, updated_at
+
+    @idempotent
     def post(self, request, id: int, *args, **kwargs):
         """
         Creates a NoteModel associated with the ApplicantModel of the given
@@ -122,7 +588,70 @@ class ApplicantNoteListApiView(APIView):
         }
         serializer = NoteSerializer(data=data)
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                queue_note_created(serializer.save())
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ServerStatsApiView(APIView):
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Database connection and applicant cache counters of the process
+        serving the request
+        """
+        return Response(
+            {
+                "database": connection_stats.stats(),
+                "applicant_cache": applicant_cache.stats(),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class TokenObtainApiView(APIView):
+    # Credentials come in the body, no session or token is needed
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Exchange a username and password for a signed API token, sent as
+        `Authorization: Bearer <token>` until `expires_at`
+        """
+        serializer = TokenObtainSerializer(
+            data=request.data, context={"request": request}
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        token, expires = issue_token(serializer.validated_data["user"])
+        return Response(
+            {
+                "token": token,
+                "expires_at": datetime.fromtimestamp(expires, timezone.utc),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class TokenRevokeApiView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Revoke the token the request is authenticated with, or with
+        `{"all": true}` every token issued to the user
+        """
+        if request.data.get("all") is True:
+            bump_permission_version(request.user.pk)
+            return Response({"res": "All tokens revoked"}, status=status.HTTP_200_OK)
+        if not isinstance(request.auth, dict) or "jti" not in request.auth:
+            return Response(
+                {"res": "Request is not authenticated with a token"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        revoke_token(request.auth)
+        return Response({"res": "Token revoked"}, status=status.HTTP_200_OK)
@@ -42,6 +42,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.timing.ServerTimingMiddleware",
+    "api.metrics.MetricsMiddleware",
+    "api.compression.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -83,10 +86,134 @@ DATABASES = {
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
         "HOST": "db",
         "PORT": 5432,
+        # Keep connections open between requests for this many seconds
+        # instead of reconnecting on every request, and check that a kept
+        # connection still works before reusing it. Set DB_CONN_MAX_AGE=0 for
+        # ASGI, where requests do not run on long-lived threads.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": os.environ.get("DB_CONN_HEALTH_CHECKS", "true").lower()
+        == "true",
+        "OPTIONS": {
+            # Seconds to wait for a new connection before giving up
+            "connect_timeout": int(os.environ.get("DB_CONNECT_TIMEOUT", 5)),
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Point REDIS_URL at a Redis server so the caches are shared between worker
+# processes. Without it each process falls back to its own local memory.
+
+REDIS_URL = os.environ.get("REDIS_URL")
+
+
+def cache_backend(location):
+    """
+    Redis when REDIS_URL is set, otherwise a process-local memory cache.
+    Local memory caches sharing a location share their storage, so every
+    alias gets its own.
+    """
+    if REDIS_URL:
+        return {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    return {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": location,
+    }
+
+
+CACHES = {
+    "default": cache_backend("default"),
+    # Serialized applicant payloads, see api.cache.ApplicantCache
+    "applicants": {
+        **cache_backend("applicants"),
+        "KEY_PREFIX": "applicants",
+        "TIMEOUT": int(os.environ.get("APPLICANT_CACHE_TIMEOUT", 300)),
+    },
+    # Responses of create requests by Idempotency-Key, see
+    # api.idempotency.IdempotencyStore
+    "idempotency": {
+        **cache_backend("idempotency"),
+        "KEY_PREFIX": "idempotency",
+        "TIMEOUT": int(os.environ.get("IDEMPOTENCY_KEY_TIMEOUT", 24 * 60 * 60)),
+    },
+}
+
+
+# Request timing
+# Fraction of requests, from 0 to 1, that api.timing.ServerTimingMiddleware
+# measures and reports through the Server-Timing header and the api.timing
+# logger
+
+SERVER_TIMING_SAMPLE_RATE = float(os.environ.get("SERVER_TIMING_SAMPLE_RATE", 0.01))
+
+
+# Response compression
+# Smallest body, in bytes, that api.compression.CompressionMiddleware
+# compresses
+
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+
+
+# Metrics
+# Bearer token /metrics requires. Without it /metrics is only served with
+# DEBUG on. Run every worker process with the same, emptied on start,
+# PROMETHEUS_MULTIPROC_DIR to aggregate their metrics.
+
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+
+# Applicant deletion
+# When true, deleting an applicant only hides it and answers 202 at once,
+# the purgeapplicants command then deletes hidden applicants and their notes
+# in batches
+
+APPLICANT_SOFT_DELETE = (
+    os.environ.get("APPLICANT_SOFT_DELETE", "false").lower() == "true"
+)
+
+# API tokens
+# Seconds a token from /api/token/ stays valid. Tokens are checked without
+# a database read, revoked ones are denied through the default cache until
+# they would have expired
+
+API_TOKEN_MAX_AGE = int(os.environ.get("API_TOKEN_MAX_AGE", 60 * 60))
+
+# Change feed
+# Seconds a change feed stream stays open before the client is made to
+# reconnect, which bounds streams left behind by clients that went away.
+# prunechanges deletes events older than CHANGE_FEED_RETENTION_DAYS.
+
+CHANGE_FEED_MAX_SECONDS = int(os.environ.get("CHANGE_FEED_MAX_SECONDS", 5 * 60))
+CHANGE_FEED_RETENTION_DAYS = int(os.environ.get("CHANGE_FEED_RETENTION_DAYS", 7))
+
+# Webhooks
+# Comma separated URLs that applicant and note events are posted to by the
+# dispatchoutbox command, see api.outbox. Without any no events are queued.
+
+WEBHOOK_ENDPOINTS = [
+    url.strip() for url in os.environ.get("WEBHOOK_URLS", "").split(",") if url.strip()
+]
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.0/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api.timing": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -133,5 +260,21 @@ REST_FRAMEWORK = {
     # or allow read-only access for unauthenticated users.
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
-    ]
+    ],
+    # Signed bearer tokens first, they need no session lookup, see api.tokens
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "api.tokens.SignedTokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
+    # orjson instead of the stdlib json module, see api.renderers
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }